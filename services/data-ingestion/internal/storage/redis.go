@@ -3,6 +3,9 @@ package storage
 import (
 	"context"
 	"encoding/json"
+	"math"
+	"strconv"
+	"strings"
 	"time"
 
 	"github.com/redis/go-redis/v9"
@@ -10,6 +13,10 @@ import (
 	"github.com/ai-trader/data-ingestion/internal/normalizer"
 )
 
+// updatesChannel carries writer notifications that market-data uses to invalidate its
+// in-process quote cache.
+const updatesChannel = "market-data:updates"
+
 type RedisStore struct {
 	client *redis.Client
 }
@@ -29,7 +36,12 @@ func (s *RedisStore) StoreAggregate(ctx context.Context, payload normalizer.Norm
 		return err
 	}
 	key := "equity:aggregate:" + payload.Symbol
-	return s.client.Set(ctx, key, bytes, 15*time.Minute).Err()
+
+	pipe := s.client.TxPipeline()
+	pipe.Set(ctx, key, bytes, 15*time.Minute)
+	pipe.Publish(ctx, updatesChannel, updateMessage("equity", payload.Symbol))
+	_, err = pipe.Exec(ctx)
+	return err
 }
 
 func (s *RedisStore) StoreQuote(ctx context.Context, payload normalizer.NormalizedOptionQuote) error {
@@ -38,5 +50,47 @@ func (s *RedisStore) StoreQuote(ctx context.Context, payload normalizer.Normaliz
 		return err
 	}
 	key := "options:quote:" + payload.Symbol
-	return s.client.Set(ctx, key, bytes, 10*time.Second).Err()
+	chainKey := "options:chain:" + underlyingOf(payload.Symbol)
+	midKey := chainKey + ":mid"
+
+	// Keep the per-underlying chain and mid rank indexes in step with the quote so
+	// market-data can read a chain (or its top-N by mid) without a keyspace SCAN.
+	pipe := s.client.TxPipeline()
+	pipe.Set(ctx, key, bytes, 10*time.Second)
+	pipe.ZAdd(ctx, chainKey, redis.Z{Score: chainScore(payload.Symbol), Member: payload.Symbol})
+	pipe.Expire(ctx, chainKey, 24*time.Hour)
+	pipe.ZAdd(ctx, midKey, redis.Z{Score: payload.Mid, Member: payload.Symbol})
+	pipe.Expire(ctx, midKey, 24*time.Hour)
+	pipe.Publish(ctx, updatesChannel, updateMessage("option", payload.Symbol))
+	_, err = pipe.Exec(ctx)
+	return err
+}
+
+func updateMessage(kind, symbol string) []byte {
+	message, _ := json.Marshal(map[string]string{"type": kind, "symbol": symbol})
+	return message
+}
+
+func underlyingOf(contract string) string {
+	underlying, _, _ := strings.Cut(contract, " ")
+	return strings.ToUpper(underlying)
+}
+
+// chainScore orders contracts by expiry then strike: YYYYMMDD*1e8 + strike in
+// thousandths. Must match contract_score in services/market-data/app/chain_index.py.
+func chainScore(contract string) float64 {
+	parts := strings.Fields(contract)
+	if len(parts) < 3 {
+		return 0
+	}
+	expiry, err := time.Parse("2006-01-02", parts[1])
+	if err != nil {
+		return 0
+	}
+	strike, err := strconv.ParseFloat(strings.TrimRight(parts[2], "CPcp"), 64)
+	if err != nil {
+		return 0
+	}
+	ymd := expiry.Year()*10000 + int(expiry.Month())*100 + expiry.Day()
+	return float64(ymd)*1e8 + math.Round(strike*1000)
 }
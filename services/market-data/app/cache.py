@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Set, Tuple
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+
+class QuoteCache:
+    """Bounded in-process LRU cache with per-entry TTL, tag invalidation and single-flight.
+
+    Entries are grouped under a tag (``"chain:SPY"``) so one writer update drops every
+    cached variant of that symbol. Concurrent misses on the same key share one load, and a
+    load that races an invalidation of its tag is returned but not cached. Generations are
+    only kept for tags with a load in flight, so nothing outlives the loads and entries.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, Tuple[float, str, Any]] = OrderedDict()
+        self._tags: Dict[str, Set[Hashable]] = defaultdict(set)
+        # tag -> [generation, loads in flight]; dropped when its last load finishes.
+        self._pending: Dict[str, List[int]] = {}
+        self._inflight: Dict[Hashable, Tuple[str, asyncio.Task]] = {}
+        self._stats = CacheStats()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    async def get_or_load(
+        self, key: Hashable, tag: str, loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        if not self.enabled:
+            return await loader()
+
+        entry = self._lookup(key)
+        if entry is not None:
+            return entry[2]
+
+        pending = self._inflight.get(key)
+        if pending is None:
+            self._stats.misses += 1
+            # The generation is taken now, not when the task first runs: an invalidation
+            # (or clear) in between must still keep this load out of the cache.
+            generation = self._begin(tag)
+            task = asyncio.ensure_future(self._load(key, tag, generation, loader))
+            self._inflight[key] = (tag, task)
+            task.add_done_callback(lambda done: self._finish(key, tag, generation, done))
+        else:
+            self._stats.coalesced += 1
+            task = pending[1]
+        # Shielded so a disconnecting caller does not cancel the load other waiters share.
+        return await asyncio.shield(task)
+
+    async def get_many(
+        self,
+        tags: Dict[Hashable, str],
+        loader: Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]],
+    ) -> Dict[Hashable, Any]:
+        """Batch lookup of ``{key: tag}``: all misses are resolved by one ``loader`` call."""
+        if not self.enabled:
+            return await loader(list(tags))
+
+        found: Dict[Hashable, Any] = {}
+        missing: List[Hashable] = []
+        for key in tags:
+            entry = self._lookup(key)
+            if entry is None:
+                missing.append(key)
+            else:
+                found[key] = entry[2]
+        if missing:
+            self._stats.misses += len(missing)
+            generations = {key: self._begin(tags[key]) for key in missing}
+            try:
+                loaded = await loader(missing)
+            finally:
+                current = {key: self._end(tags[key], g) for key, g in generations.items()}
+            for key, value in loaded.items():
+                if current.get(key):
+                    self._store(key, tags[key], value)
+            found.update(loaded)
+        return found
+
+    def invalidate(self, tag: str) -> None:
+        pending = self._pending.get(tag)
+        if pending is not None:
+            pending[0] += 1
+        # Loads started before the update must not be joined by later callers.
+        for key in [k for k, (t, _) in self._inflight.items() if t == tag]:
+            del self._inflight[key]
+        for key in self._tags.pop(tag, ()):
+            self._entries.pop(key, None)
+            self._stats.invalidations += 1
+
+    def clear(self) -> None:
+        # Tags with a load in flight may have no entries yet; their loads must not cache.
+        for tag in set(self._tags) | set(self._pending):
+            self.invalidate(tag)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            **asdict(self._stats),
+            "size": len(self._entries),
+            "inflight": len(self._inflight),
+            "pending_tags": len(self._pending),
+        }
+
+    async def _load(
+        self, key: Hashable, tag: str, generation: int, loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        value = await loader()
+        # Still registered: _finish ends the load once this coroutine is done.
+        if self._pending[tag][0] == generation:
+            self._store(key, tag, value)
+        return value
+
+    def _begin(self, tag: str) -> int:
+        pending = self._pending.setdefault(tag, [0, 0])
+        pending[1] += 1
+        return pending[0]
+
+    def _end(self, tag: str, generation: int) -> bool:
+        """Finish a load begun at ``generation``; whether its tag was not invalidated since."""
+        pending = self._pending[tag]
+        pending[1] -= 1
+        if not pending[1]:
+            del self._pending[tag]
+        return pending[0] == generation
+
+    def _lookup(self, key: Hashable) -> Tuple[float, str, Any] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= self._clock():
+            self._discard(key)
+            self._stats.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        self._stats.hits += 1
+        return entry
+
+    def _finish(self, key: Hashable, tag: str, generation: int, task: asyncio.Task) -> None:
+        # Runs even for a task cancelled before it started, so the load is always ended.
+        self._end(tag, generation)
+        pending = self._inflight.get(key)
+        if pending is not None and pending[1] is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved when every waiter went away
+
+    def _store(self, key: Hashable, tag: str, value: Any) -> None:
+        self._discard(key)
+        self._entries[key] = (self._clock() + self.ttl_seconds, tag, value)
+        self._tags[tag].add(key)
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._discard(oldest)
+            self._stats.evictions += 1
+
+    def _discard(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._tags.get(entry[1])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._tags[entry[1]]
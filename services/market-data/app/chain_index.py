@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from enum import Enum
+from typing import Any, Callable, Dict, List, Sequence
+
+from redis.asyncio import Redis
+
+from .redis_client import namespaced
+
+QUOTE_PREFIX = "options:quote:"
+CHAIN_PREFIX = "options:chain:"
+
+
+class ChainSort(str, Enum):
+    mid = "mid"
+    liquidity_score = "liquidity_score"
+    open_interest = "open_interest"
+
+
+def quote_key(contract: str) -> str:
+    return namespaced(f"{QUOTE_PREFIX}{contract}")
+
+
+def chain_key(underlying: str) -> str:
+    return namespaced(f"{CHAIN_PREFIX}{underlying.upper()}")
+
+
+def rank_key(underlying: str, field: ChainSort) -> str:
+    return namespaced(f"{CHAIN_PREFIX}{underlying.upper()}:{field.value}")
+
+
+def sort_value(field: ChainSort) -> Callable[[Dict[str, Any]], float]:
+    name = field.value
+    return lambda item: float(item.get(name) or 0)
+
+
+def underlying_of(contract: str) -> str:
+    return contract.split(" ", 1)[0].upper()
+
+
+def contract_score(contract: str, payload: Dict[str, Any] | None = None) -> float:
+    """Chain order score: YYYYMMDD * 1e8 + strike in thousandths (exact in a double).
+
+    Contract symbols follow the ingestion format ``"AAPL 2025-01-17 150C"``; explicit
+    ``expiry``/``strike`` fields in the payload win over the parsed symbol.
+    """
+    payload = payload or {}
+    parts = contract.split()
+    expiry = str(payload.get("expiry") or (parts[1] if len(parts) > 1 else ""))
+    strike = payload.get("strike")
+    if strike is None and len(parts) > 2:
+        strike = parts[2].rstrip("CPcp")
+    try:
+        ymd = int(expiry[:10].replace("-", ""))
+        strike_milli = round(float(strike or 0) * 1000)
+    except ValueError:
+        return 0.0
+    return float(ymd * 100_000_000 + strike_milli)
+
+
+def index_contract(pipe: Redis, contract: str, payload: Dict[str, Any], ttl: int) -> None:
+    """Queue the chain and sort-key index updates for ``contract`` on a pipeline.
+
+    Each :class:`ChainSort` field present in the payload gets its own sorted set scored by
+    the field value, so the top-N by that field is a single ZREVRANGE.
+    """
+    underlying = underlying_of(contract)
+    key = chain_key(underlying)
+    pipe.zadd(key, {contract: contract_score(contract, payload)})
+    pipe.expire(key, ttl)
+    for field in ChainSort:
+        value = payload.get(field.value)
+        if value is None:
+            continue
+        try:
+            score = float(value)
+        except (TypeError, ValueError):
+            continue
+        pipe.zadd(rank_key(underlying, field), {contract: score})
+        pipe.expire(rank_key(underlying, field), ttl)
+
+
+async def prune_contracts(redis: Redis, underlying: str, contracts: Sequence[str]) -> None:
+    """Drop index entries whose quote key has expired. A racing writer re-adds them."""
+    if not contracts:
+        return
+    pipe = redis.pipeline(transaction=False)
+    pipe.zrem(chain_key(underlying), *contracts)
+    for field in ChainSort:
+        pipe.zrem(rank_key(underlying, field), *contracts)
+    await pipe.execute()
+
+
+async def mget_chunked(redis: Redis, keys: Sequence[str], chunk: int) -> List[bytes | None]:
+    """MGET ``keys`` in fixed-size chunks sent over a single pipelined round trip."""
+    if not keys:
+        return []
+    if len(keys) <= chunk:
+        return await redis.mget(keys)
+    pipe = redis.pipeline(transaction=False)
+    for start in range(0, len(keys), chunk):
+        pipe.mget(keys[start : start + chunk])
+    values: List[bytes | None] = []
+    for batch in await pipe.execute():
+        values.extend(batch)
+    return values
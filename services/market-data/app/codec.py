@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import json
+import struct
+from operator import itemgetter
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+# JSON documents start with "{" (or whitespace); binary records start with MAGIC so both
+# formats can live side by side in Redis while writers migrate.
+MAGIC = 0xB1
+INT64_MIN, INT64_MAX = -(2**63), 2**63 - 1
+
+
+class RecordLayout:
+    """Fixed-size little-endian record: header, float64/int64 columns, fixed-width strings.
+
+    ``<B magic><B tag><I presence-mask><f8...><i8...><NUL-padded utf-8...>``. Every record
+    of a layout has the same size, so a batch of them is one NumPy structured array (see
+    :func:`top_records`). Payloads carrying fields outside the layout, or values that do
+    not fit it, stay JSON so the encoding is always lossless.
+    """
+
+    def __init__(
+        self,
+        tag: int,
+        floats: Tuple[str, ...],
+        ints: Tuple[str, ...],
+        strings: Tuple[Tuple[str, int], ...],
+    ) -> None:
+        self.tag = tag
+        self.ints = frozenset(ints)
+        self.widths = dict(strings)
+        self.names = floats + ints + tuple(name for name, _ in strings)
+        widths = "".join(f"{width}s" for _, width in strings)
+        self._struct = struct.Struct(f"<BBI{len(floats)}d{len(ints)}q{widths}")
+        self.size = self._struct.size
+        self.dtype = np.dtype(
+            [("magic", "u1"), ("tag", "u1"), ("mask", "<u4")]
+            + [(name, "<f8") for name in floats]
+            + [(name, "<i8") for name in ints]
+            + [(name, f"S{width}") for name, width in strings]
+        )
+        # Unpacked tuple is (magic, tag, mask, *fields): field i sits at index i + 3.
+        self._plans: Dict[int, Tuple[Tuple[str, ...], Callable[[tuple], tuple]]] = {}
+
+    def encode(self, payload: Dict[str, Any]) -> bytes | None:
+        if not set(self.names).issuperset(payload):
+            return None
+        mask = 0
+        fields: List[Any] = []
+        for bit, name in enumerate(self.names):
+            value = payload.get(name)
+            if name in self.widths:
+                text = (value or "").encode() if isinstance(value, (str, type(None))) else None
+                if text is None or len(text) > self.widths[name] or b"\0" in text:
+                    return None
+                fields.append(text)
+            elif value is None:
+                fields.append(0)
+            elif isinstance(value, bool) or not isinstance(value, (int, float)):
+                return None
+            elif name in self.ints:
+                # NaN and inf are floats that are not integers; so are 10.5 and the like.
+                if isinstance(value, float) and not value.is_integer():
+                    return None
+                if not INT64_MIN <= int(value) <= INT64_MAX:
+                    return None
+                fields.append(int(value))
+            else:
+                fields.append(float(value))
+            if value is not None:
+                mask |= 1 << bit
+        try:
+            return self._struct.pack(MAGIC, self.tag, mask, *fields)
+        except struct.error:
+            return None
+
+    def decode(self, value: bytes) -> Dict[str, Any]:
+        return self.materialize(self._struct.unpack(value))
+
+    def materialize(self, row: tuple) -> Dict[str, Any]:
+        names, pick = self._plans.get(row[2]) or self._plan(row[2])
+        record = dict(zip(names, pick(row)))
+        for name in self.widths:
+            if name in record:
+                record[name] = record[name].rstrip(b"\0").decode()
+        return record
+
+    def _plan(self, mask: int) -> Tuple[Tuple[str, ...], Callable[[tuple], tuple]]:
+        present = [bit for bit in range(len(self.names)) if mask >> bit & 1]
+        names = tuple(self.names[bit] for bit in present)
+        if len(present) == 1:
+            index = present[0] + 3
+            plan = (names, lambda row: (row[index],))
+        else:
+            plan = (names, itemgetter(*(bit + 3 for bit in present)))
+        if len(self._plans) < 64:
+            self._plans[mask] = plan
+        return plan
+
+
+OPTION_QUOTE = RecordLayout(
+    tag=1,
+    floats=(
+        "bid",
+        "ask",
+        "mid",
+        "delta",
+        "gamma",
+        "theta",
+        "vega",
+        "implied_vol",
+        "spread_pct",
+        "strike",
+    ),
+    ints=("open_interest", "volume", "liquidity_score", "bid_size", "ask_size"),
+    strings=(("symbol", 40), ("expiry", 24), ("timestamp", 32)),
+)
+EQUITY_AGGREGATE = RecordLayout(
+    tag=2,
+    floats=("open", "close", "high", "low", "vwap"),
+    ints=("volume",),
+    strings=(("symbol", 16), ("timestamp", 32)),
+)
+LAYOUTS = {layout.tag: layout for layout in (OPTION_QUOTE, EQUITY_AGGREGATE)}
+
+
+def encode_record(layout: RecordLayout, payload: Dict[str, Any], binary: bool) -> bytes:
+    """Encode ``payload`` for Redis, falling back to JSON when it does not fit ``layout``."""
+    if binary:
+        encoded = layout.encode(payload)
+        if encoded is not None:
+            return encoded
+    return json.dumps(payload).encode()
+
+
+def decode_record(value: bytes | None) -> Dict[str, Any] | None:
+    """Decode a Redis value written as JSON or as a binary record (auto-detected)."""
+    if not value:
+        return None
+    if value[0] == MAGIC:
+        layout = LAYOUTS.get(value[1]) if len(value) > 1 else None
+        if layout is None:
+            return None
+        try:
+            return layout.decode(value)
+        except (struct.error, ValueError):
+            return None
+    try:
+        return json.loads(value)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+
+
+def top_records(
+    values: Sequence[bytes | None], layout: RecordLayout, field: str, limit: int
+) -> List[Dict[str, Any]]:
+    """Decode a batch, materializing at most ``limit`` binary records by ``field``.
+
+    Binary records of ``layout`` are viewed as one structured array and narrowed with
+    ``argpartition``; JSON (and foreign) values are decoded individually and returned
+    as-is, so callers still rank the combined result.
+    """
+    packed: List[bytes] = []
+    records: List[Dict[str, Any]] = []
+    for value in values:
+        if value and value[0] == MAGIC and len(value) == layout.size and value[1] == layout.tag:
+            packed.append(value)
+            continue
+        decoded = decode_record(value)
+        if decoded:
+            records.append(decoded)
+    if not packed:
+        return records
+
+    rows = np.frombuffer(b"".join(packed), dtype=layout.dtype)
+    if len(rows) > limit:
+        keys = rows[field].astype(np.float64)
+        rows = rows[np.argpartition(-keys, limit - 1)[:limit]]
+    records.extend(layout.materialize(row.item()) for row in rows)
+    return records
@@ -9,6 +9,19 @@ class Settings:
     redis_url: str = os.getenv("REDIS_URI", "redis://localhost:6379/0")
     redis_namespace: str = os.getenv("REDIS_NAMESPACE", "")
     default_chain_contracts: int = int(os.getenv("DEFAULT_CHAIN_CONTRACTS", "5"))
+    max_chain_contracts: int = int(os.getenv("MAX_CHAIN_CONTRACTS", "500"))
+    chain_rank_slack: int = int(os.getenv("CHAIN_RANK_SLACK", "16"))
+    quote_encoding: str = os.getenv("QUOTE_ENCODING", "json")
+    option_quote_ttl_seconds: int = int(os.getenv("OPTION_QUOTE_TTL_SECONDS", "10"))
+    chain_index_ttl_seconds: int = int(os.getenv("CHAIN_INDEX_TTL_SECONDS", "86400"))
+    chain_mget_chunk: int = int(os.getenv("CHAIN_MGET_CHUNK", "500"))
+    max_quote_batch: int = int(os.getenv("MAX_QUOTE_BATCH", "10000"))
+    quote_batch_stream_threshold: int = int(os.getenv("QUOTE_BATCH_STREAM_THRESHOLD", "1000"))
+    quote_cache_ttl_seconds: float = float(os.getenv("QUOTE_CACHE_TTL_SECONDS", "1.0"))
+    quote_cache_max_entries: int = int(os.getenv("QUOTE_CACHE_MAX_ENTRIES", "10000"))
+    stream_flush_interval_seconds: float = float(os.getenv("STREAM_FLUSH_INTERVAL_SECONDS", "0.05"))
+    stream_max_batches: int = int(os.getenv("STREAM_MAX_BATCHES", "8"))
+    stream_heartbeat_seconds: float = float(os.getenv("STREAM_HEARTBEAT_SECONDS", "15"))
 
 
 def get_settings() -> Settings:
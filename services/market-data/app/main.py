@@ -1,8 +1,53 @@
-from fastapi import FastAPI
+import asyncio
+import contextlib
+import hashlib
+import json
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List
 
-from .service import fetch_equity_quote, fetch_options_chain
+from fastapi import FastAPI, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 
-app = FastAPI(title="Market Data Service", version="0.1.0")
+from .chain_index import ChainSort
+from .config import get_settings
+from .schemas import QuoteBatchRequest
+from .service import (
+    apply_update,
+    fetch_equity_quote,
+    fetch_equity_quotes,
+    fetch_options_chain,
+    quote_cache,
+    stream_equity_quotes,
+)
+from .streaming import chain_broker, chain_events
+from .updates import listen_for_updates
+
+settings = get_settings()
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    listener = asyncio.create_task(listen_for_updates(_on_update, on_subscribe=_on_resubscribe))
+    try:
+        yield
+    finally:
+        listener.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await listener
+
+
+def _on_update(kind: str, symbol: str) -> None:
+    apply_update(kind, symbol)
+    chain_broker.notify(kind, symbol)
+
+
+def _on_resubscribe() -> None:
+    # Updates published while unsubscribed are lost: drop cached reads, resend snapshots.
+    quote_cache.clear()
+    chain_broker.resync_all()
+
+
+app = FastAPI(title="Market Data Service", version="0.1.0", lifespan=lifespan)
 
 
 @app.get("/healthz")
@@ -10,11 +55,65 @@ async def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/metrics")
+async def metrics() -> dict[str, dict[str, int]]:
+    return {"quote_cache": quote_cache.stats(), "chain_streams": chain_broker.stats()}
+
+
+@app.post("/quotes:batch")
+async def get_quotes_batch(request: QuoteBatchRequest):
+    return await _quote_batch(request.symbols)
+
+
+@app.get("/quotes")
+async def get_quotes(symbols: str = Query(min_length=1, description="comma-separated tickers")):
+    tickers = [symbol for symbol in symbols.split(",") if symbol.strip()]
+    if not tickers or len(tickers) > settings.max_quote_batch:
+        detail = f"symbols must list between 1 and {settings.max_quote_batch} tickers"
+        raise HTTPException(status_code=422, detail=detail)
+    return await _quote_batch(tickers)
+
+
+async def _quote_batch(symbols: List[str]):
+    if len(symbols) <= settings.quote_batch_stream_threshold:
+        return {"quotes": await fetch_equity_quotes(symbols)}
+    return StreamingResponse(_ndjson_quotes(symbols), media_type="application/x-ndjson")
+
+
+async def _ndjson_quotes(symbols: List[str]) -> AsyncIterator[str]:
+    async for chunk in stream_equity_quotes(symbols):
+        yield "".join(json.dumps(item) + "\n" for item in chunk)
+
+
 @app.get("/quotes/{symbol}")
 async def get_quote(symbol: str):
     return await fetch_equity_quote(symbol)
 
 
 @app.get("/chains/{symbol}")
-async def get_chain(symbol: str, limit: int | None = None):
-    return {"symbol": symbol.upper(), "contracts": await fetch_options_chain(symbol, limit)}
+async def get_chain(
+    symbol: str,
+    limit: int | None = Query(default=None, ge=1),
+    sort: ChainSort = ChainSort.mid,
+    if_none_match: str | None = Header(default=None),
+):
+    contracts = await fetch_options_chain(symbol, limit, sort)
+    body = json.dumps({"symbol": symbol.upper(), "sort": sort, "contracts": contracts}).encode()
+    # Content-derived, so every replica agrees and readers can revalidate with If-None-Match.
+    headers = {"ETag": f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'}
+    if if_none_match and headers["ETag"] in {tag.strip() for tag in if_none_match.split(",")}:
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+@app.get("/chains/{symbol}/stream")
+async def stream_chain(
+    symbol: str,
+    limit: int | None = Query(default=None, ge=1),
+    sort: ChainSort = ChainSort.mid,
+):
+    return StreamingResponse(
+        chain_events(symbol.upper(), limit, sort),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,31 @@
+"""Backfill the per-underlying chain index from existing quote keys.
+
+Usage: ``python -m app.rebuild_chain_index [SYMBOL ...]``
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+
+from .redis_client import get_redis
+from .service import rebuild_chain_index
+
+
+async def _run(symbols: list[str] | None, batch: int) -> int:
+    try:
+        return await rebuild_chain_index(symbols, batch=batch)
+    finally:
+        await get_redis().aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("symbols", nargs="*", help="underlyings to index (default: all)")
+    parser.add_argument("--batch", type=int, default=1000, help="keys per SCAN/MGET batch")
+    args = parser.parse_args()
+    indexed = asyncio.run(_run([s.upper() for s in args.symbols] or None, args.batch))
+    print(f"indexed {indexed} option quotes")
+
+
+if __name__ == "__main__":
+    main()
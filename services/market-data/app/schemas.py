@@ -0,0 +1,9 @@
+from typing import List
+
+from pydantic import BaseModel, Field
+
+from .config import get_settings
+
+
+class QuoteBatchRequest(BaseModel):
+    symbols: List[str] = Field(min_length=1, max_length=get_settings().max_quote_batch)
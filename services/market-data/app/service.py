@@ -1,62 +1,234 @@
 from __future__ import annotations
 
-import json
+import heapq
+import itertools
 from datetime import datetime, timedelta
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, Iterable, List, Tuple
 
 from redis.asyncio import Redis
 
+from .cache import QuoteCache
+from .chain_index import (
+    QUOTE_PREFIX,
+    ChainSort,
+    chain_key,
+    index_contract,
+    mget_chunked,
+    prune_contracts,
+    quote_key,
+    rank_key,
+    sort_value,
+    underlying_of,
+)
+from .codec import OPTION_QUOTE, decode_record, encode_record, top_records
 from .config import get_settings
 from .redis_client import get_redis, namespaced
+from .updates import encode_update, updates_channel
 
 settings = get_settings()
+quote_cache = QuoteCache(settings.quote_cache_max_entries, settings.quote_cache_ttl_seconds)
 
 
-def _decode(value: bytes | None) -> Dict[str, Any] | None:
-    if not value:
-        return None
-    try:
-        return json.loads(value)
-    except json.JSONDecodeError:
-        return None
+async def fetch_equity_quote(symbol: str) -> Dict[str, Any]:
+    symbol = symbol.upper()
+    quote, _ = await quote_cache.get_or_load(
+        ("equity", symbol), f"equity:{symbol}", lambda: _load_equity_quote(symbol)
+    )
+    return quote
 
 
-async def fetch_equity_quote(symbol: str) -> Dict[str, Any]:
-    redis = get_redis()
-    key = namespaced(f"equity:aggregate:{symbol.upper()}")
-    payload = _decode(await redis.get(key))
+async def fetch_equity_quotes(symbols: Iterable[str]) -> List[Dict[str, Any]]:
+    """Resolve many quotes at once; uncached symbols share one pipelined MGET.
+
+    Each item carries a ``synthetic`` flag so callers can tell fallbacks from live data.
+    """
+    unique = list(dict.fromkeys(s.strip().upper() for s in symbols if s.strip()))
+    entries = await quote_cache.get_many(
+        {("equity", symbol): f"equity:{symbol}" for symbol in unique}, _load_equity_quotes
+    )
+    results = []
+    for symbol in unique:
+        quote, synthetic = entries[("equity", symbol)]
+        results.append({"symbol": symbol, "synthetic": synthetic, "quote": quote})
+    return results
+
+
+async def stream_equity_quotes(symbols: List[str]) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Yield :func:`fetch_equity_quotes` results chunk by chunk for very large batches."""
+    chunk = settings.chain_mget_chunk
+    for start in range(0, len(symbols), chunk):
+        yield await fetch_equity_quotes(symbols[start : start + chunk])
+
+
+async def fetch_options_chain(
+    symbol: str, limit: int | None = None, sort: ChainSort = ChainSort.mid
+) -> List[Dict[str, Any]]:
+    """Return the true top-``limit`` contracts by ``sort`` using bounded memory.
+
+    Served from the ``sort`` rank index when the writer maintains one; otherwise the chain
+    index is streamed in fixed windows through a bounded top-N selection.
+    """
+    symbol = symbol.upper()
+    limit = min(limit or settings.default_chain_contracts, settings.max_chain_contracts)
+    return await quote_cache.get_or_load(
+        ("chain", symbol, limit, sort),
+        f"chain:{symbol}",
+        lambda: _load_options_chain(symbol, limit, sort),
+    )
+
+
+def apply_update(kind: str, symbol: str) -> None:
+    """Invalidate cached reads affected by a writer update notification."""
+    if kind == "option":
+        quote_cache.invalidate(f"chain:{underlying_of(symbol)}")
+    elif kind == "equity":
+        quote_cache.invalidate(f"equity:{symbol.upper()}")
+
+
+async def _load_equity_quote(symbol: str) -> Tuple[Dict[str, Any], bool]:
+    return _equity_entry(symbol, await get_redis().get(_equity_key(symbol)))
+
+
+async def _load_equity_quotes(keys: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Any]:
+    symbols = [symbol for _, symbol in keys]
+    values = await mget_chunked(
+        get_redis(), [_equity_key(symbol) for symbol in symbols], settings.chain_mget_chunk
+    )
+    return {key: _equity_entry(key[1], value) for key, value in zip(keys, values)}
+
+
+def _equity_key(symbol: str) -> str:
+    return namespaced(f"equity:aggregate:{symbol}")
+
+
+def _equity_entry(symbol: str, value: bytes | None) -> Tuple[Dict[str, Any], bool]:
+    """Cached as ``(quote, synthetic)`` so batch reads can report fallbacks."""
+    payload = decode_record(value)
     if payload:
-        return payload
-    return _synthetic_equity(symbol)
+        return payload, False
+    return _synthetic_equity(symbol), True
 
 
-async def fetch_options_chain(symbol: str, limit: int | None = None) -> List[Dict[str, Any]]:
+async def _load_options_chain(symbol: str, limit: int, sort: ChainSort) -> List[Dict[str, Any]]:
     redis = get_redis()
-    limit = limit or settings.default_chain_contracts
-    pattern = namespaced(f"options:quote:{symbol.upper()}*")
+    contracts = await _top_from_rank_index(redis, symbol, sort, limit)
+    if contracts is None:
+        contracts = await _top_from_chain_index(redis, symbol, sort, limit)
+    if contracts:
+        return contracts
+
+    return sorted(_synthetic_chain(symbol, limit), key=sort_value(sort), reverse=True)
 
-    candidates: List[Dict[str, Any]] = []
-    cursor = 0
-    redis_client: Redis = redis
+
+async def _top_from_rank_index(
+    redis: Redis, symbol: str, sort: ChainSort, limit: int
+) -> List[Dict[str, Any]] | None:
+    key = rank_key(symbol, sort)
+    window = limit + settings.chain_rank_slack
+    contracts: List[Dict[str, Any]] = []
+    start = 0
+    while len(contracts) < limit:
+        members = [_text(m) for m in await redis.zrevrange(key, start, start + window - 1)]
+        if not members:
+            if start == 0:
+                return None
+            break
+        live, expired = await _load_members(redis, members)
+        contracts.extend(live[: limit - len(contracts)])
+        await prune_contracts(redis, symbol, expired)
+        if len(members) < window:
+            break
+        start += len(members) - len(expired)
+    return contracts
+
+
+async def _top_from_chain_index(
+    redis: Redis, symbol: str, sort: ChainSort, limit: int
+) -> List[Dict[str, Any]]:
+    key = chain_key(symbol)
+    window = settings.chain_mget_chunk
+    best: List[Dict[str, Any]] = []
+    start = 0
     while True:
-        cursor, keys = await redis_client.scan(cursor=cursor, match=pattern, count=limit)
-        if not keys:
-            if cursor == 0:
-                break
-            continue
-        values = await redis_client.mget(keys)
-        for value in values:
-            decoded = _decode(value)
-            if decoded:
-                candidates.append(decoded)
-        if cursor == 0 or len(candidates) >= limit:
+        members = [_text(m) for m in await redis.zrange(key, start, start + window - 1)]
+        if not members:
+            break
+        values = await redis.mget([quote_key(m) for m in members])
+        expired = [member for member, value in zip(members, values) if value is None]
+        live = top_records(values, OPTION_QUOTE, sort.value, limit)
+        best = heapq.nlargest(limit, itertools.chain(best, live), key=sort_value(sort))
+        await prune_contracts(redis, symbol, expired)
+        if len(members) < window:
             break
+        start += len(members) - len(expired)
+    return best
+
+
+async def _load_members(
+    redis: Redis, members: List[str]
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    live: List[Dict[str, Any]] = []
+    expired: List[str] = []
+    for member, value in zip(members, await redis.mget([quote_key(m) for m in members])):
+        decoded = decode_record(value)
+        if decoded:
+            live.append(decoded)
+        elif value is None:
+            expired.append(member)
+    return live, expired
+
+
+async def store_option_quote(payload: Dict[str, Any], ttl: int | None = None) -> None:
+    """Write a contract quote, its index entries and an update notification in one round trip."""
+    contract = str(payload["symbol"])
+    ttl = ttl or settings.option_quote_ttl_seconds
+    pipe = get_redis().pipeline(transaction=True)
+    encoded = encode_record(OPTION_QUOTE, payload, settings.quote_encoding == "binary")
+    pipe.set(quote_key(contract), encoded, ex=ttl)
+    index_contract(pipe, contract, payload, settings.chain_index_ttl_seconds)
+    pipe.publish(updates_channel(), encode_update("option", contract))
+    await pipe.execute()
+
+
+async def rebuild_chain_index(symbols: List[str] | None = None, batch: int = 1000) -> int:
+    """Backfill chain indexes from existing ``options:quote:*`` keys; returns keys indexed.
+
+    Re-indexing is idempotent (ZADD overwrites scores); members whose quote has since
+    expired are pruned by the next chain read.
+    """
+    redis = get_redis()
+    prefix = namespaced(QUOTE_PREFIX)
+    patterns = [f"{prefix}{s.upper()} *" for s in symbols] if symbols else [f"{prefix}*"]
+
+    indexed = 0
+    for pattern in patterns:
+        async for keys in _scan_batches(redis, pattern, batch):
+            values = await redis.mget(keys)
+            pipe = redis.pipeline(transaction=False)
+            for key, value in zip(keys, values):
+                decoded = decode_record(value)
+                if not decoded:
+                    continue
+                contract = _text(key)[len(prefix) :]
+                index_contract(pipe, contract, decoded, settings.chain_index_ttl_seconds)
+                indexed += 1
+            await pipe.execute()
+    return indexed
+
+
+async def _scan_batches(redis: Redis, pattern: str, batch: int) -> AsyncIterator[List[bytes]]:
+    keys: List[bytes] = []
+    async for key in redis.scan_iter(match=pattern, count=batch):
+        keys.append(key)
+        if len(keys) >= batch:
+            yield keys
+            keys = []
+    if keys:
+        yield keys
 
-    if candidates:
-        candidates.sort(key=lambda item: item.get("mid", 0), reverse=True)
-        return candidates[:limit]
 
-    return _synthetic_chain(symbol, limit)
+def _text(value: bytes | str) -> str:
+    return value.decode() if isinstance(value, bytes) else value
 
 
 def _synthetic_equity(symbol: str) -> Dict[str, Any]:
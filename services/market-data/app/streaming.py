@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from typing import AsyncIterator, Dict, List, Set, Tuple
+
+from .chain_index import ChainSort, mget_chunked, quote_key, underlying_of
+from .codec import decode_record
+from .config import get_settings
+from .redis_client import get_redis
+from .service import fetch_options_chain
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class ChainDelta:
+    """Changed contracts of one underlying; ``None`` marks a contract whose quote is gone.
+
+    A delta is shared by every subscriber it fans out to, so its SSE payload is encoded
+    at most once.
+    """
+
+    __slots__ = ("underlying", "contracts", "_encoded")
+
+    def __init__(self, underlying: str, contracts: Dict[str, Dict | None]) -> None:
+        self.underlying = underlying
+        self.contracts = contracts
+        self._encoded: str | None = None
+
+    @classmethod
+    def merge(cls, deltas: List["ChainDelta"]) -> "ChainDelta":
+        contracts: Dict[str, Dict | None] = {}
+        for delta in deltas:
+            contracts.update(delta.contracts)
+        return cls(deltas[0].underlying, contracts)
+
+    def encoded(self) -> str:
+        if self._encoded is None:
+            self._encoded = json.dumps(
+                {
+                    "symbol": self.underlying,
+                    "contracts": [c for c in self.contracts.values() if c is not None],
+                    "removed": [s for s, c in self.contracts.items() if c is None],
+                }
+            )
+        return self._encoded
+
+
+class ChainSubscription:
+    """Per-connection conflating mailbox.
+
+    Pending deltas are collapsed once more than ``max_batches`` queue up, so a slow
+    consumer holds at most one entry per contract and always reads the latest values.
+    """
+
+    def __init__(self, underlying: str, max_batches: int) -> None:
+        self.underlying = underlying
+        self.max_batches = max_batches
+        self._batches: List[ChainDelta] = []
+        self._resync = False
+        self._ready = asyncio.Event()
+
+    def offer(self, delta: ChainDelta) -> None:
+        self._batches.append(delta)
+        if len(self._batches) > self.max_batches:
+            self._batches = [ChainDelta.merge(self._batches)]
+        self._ready.set()
+
+    def request_resync(self) -> None:
+        self._resync = True
+        self._batches = []
+        self._ready.set()
+
+    async def wait(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def drain(self) -> Tuple[bool, ChainDelta | None]:
+        """Return ``(resync, delta)`` and reset the mailbox."""
+        resync, batches = self._resync, self._batches
+        self._resync, self._batches = False, []
+        self._ready.clear()
+        if resync or not batches:
+            return resync, None
+        return False, batches[0] if len(batches) == 1 else ChainDelta.merge(batches)
+
+
+class ChainBroker:
+    """Fans writer updates out to chain subscribers from a single worker.
+
+    Updates are coalesced per underlying for ``flush_interval`` seconds, then the changed
+    contracts are read with one MGET and the resulting delta is shared by every
+    subscriber of that underlying.
+    """
+
+    def __init__(self, flush_interval: float, max_batches: int) -> None:
+        self.flush_interval = flush_interval
+        self.max_batches = max_batches
+        self._subscribers: Dict[str, Set[ChainSubscription]] = defaultdict(set)
+        self._dirty: Dict[str, Set[str]] = defaultdict(set)
+        self._flushers: Dict[str, asyncio.Task] = {}
+
+    def subscribe(self, underlying: str) -> ChainSubscription:
+        subscription = ChainSubscription(underlying.upper(), self.max_batches)
+        self._subscribers[subscription.underlying].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: ChainSubscription) -> None:
+        subscribers = self._subscribers.get(subscription.underlying)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._subscribers[subscription.underlying]
+            self._dirty.pop(subscription.underlying, None)
+
+    def notify(self, kind: str, symbol: str) -> None:
+        if kind != "option":
+            return
+        underlying = underlying_of(symbol)
+        if underlying not in self._subscribers:
+            return
+        self._dirty[underlying].add(symbol)
+        if underlying not in self._flushers:
+            task = asyncio.ensure_future(self._flush(underlying))
+            self._flushers[underlying] = task
+
+    def resync_all(self) -> None:
+        for subscribers in self._subscribers.values():
+            for subscription in subscribers:
+                subscription.request_resync()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "underlyings": len(self._subscribers),
+            "subscribers": sum(len(s) for s in self._subscribers.values()),
+            "flushing": len(self._flushers),
+        }
+
+    async def _flush(self, underlying: str) -> None:
+        try:
+            while True:
+                await asyncio.sleep(self.flush_interval)
+                contracts = sorted(self._dirty.pop(underlying, ()))
+                if not contracts or underlying not in self._subscribers:
+                    return
+                values = await mget_chunked(
+                    get_redis(), [quote_key(c) for c in contracts], settings.chain_mget_chunk
+                )
+                delta = ChainDelta(
+                    underlying, {c: decode_record(v) for c, v in zip(contracts, values)}
+                )
+                for subscription in list(self._subscribers.get(underlying, ())):
+                    subscription.offer(delta)
+        except Exception:
+            logger.warning("chain delta flush failed for %s", underlying, exc_info=True)
+            for subscription in list(self._subscribers.get(underlying, ())):
+                subscription.request_resync()
+        finally:
+            self._flushers.pop(underlying, None)
+
+
+chain_broker = ChainBroker(settings.stream_flush_interval_seconds, settings.stream_max_batches)
+
+
+async def chain_events(symbol: str, limit: int | None, sort: ChainSort) -> AsyncIterator[str]:
+    """Server-Sent Events: a ``snapshot`` event, then ``delta`` events as contracts change.
+
+    Deltas cover every contract of the underlying, not only the snapshot's top-N; a new
+    ``snapshot`` is sent whenever the stream had to resynchronize.
+    """
+    subscription = chain_broker.subscribe(symbol)
+    try:
+        resync = True
+        while True:
+            if resync:
+                contracts = await fetch_options_chain(symbol, limit, sort)
+                payload = json.dumps({"symbol": subscription.underlying, "contracts": contracts})
+                yield f"event: snapshot\ndata: {payload}\n\n"
+            if not await subscription.wait(settings.stream_heartbeat_seconds):
+                resync = False
+                yield ": keep-alive\n\n"
+                continue
+            resync, delta = subscription.drain()
+            if delta is not None:
+                yield f"event: delta\ndata: {delta.encoded()}\n\n"
+    finally:
+        chain_broker.unsubscribe(subscription)
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from typing import Callable, Tuple
+
+from .redis_client import get_redis, namespaced
+
+logger = logging.getLogger(__name__)
+
+UPDATES_CHANNEL = "market-data:updates"
+
+
+def updates_channel() -> str:
+    return namespaced(UPDATES_CHANNEL)
+
+
+def encode_update(kind: str, symbol: str) -> str:
+    """Writer notification: ``kind`` is ``"option"`` (contract symbol) or ``"equity"``."""
+    return json.dumps({"type": kind, "symbol": symbol})
+
+
+def decode_update(data: bytes | str) -> Tuple[str, str] | None:
+    try:
+        message = json.loads(data)
+        return str(message["type"]), str(message["symbol"])
+    except (TypeError, ValueError, KeyError):
+        return None
+
+
+async def listen_for_updates(
+    handler: Callable[[str, str], None],
+    on_subscribe: Callable[[], None] | None = None,
+    reconnect_delay: float = 1.0,
+) -> None:
+    """Dispatch writer update notifications to ``handler`` until cancelled.
+
+    ``on_subscribe`` runs after every (re)subscribe, since updates published while the
+    subscription was down are lost.
+    """
+    while True:
+        pubsub = get_redis().pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(updates_channel())
+            if on_subscribe:
+                on_subscribe()
+            async for message in pubsub.listen():
+                update = decode_update(message["data"])
+                if update:
+                    handler(*update)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.warning("market-data update subscription failed; retrying", exc_info=True)
+            await asyncio.sleep(reconnect_delay)
+        finally:
+            await pubsub.aclose()
@@ -0,0 +1,125 @@
+"""Chain read latency: legacy keyspace SCAN vs the per-underlying chain index.
+
+Populates a scratch Redis database with ``N`` option quotes (one busy underlying plus
+filler underlyings), then times chain reads for the busy underlying.
+
+Usage: ``python benchmarks/chain_index.py [--sizes 10000 100000 1000000]``
+
+WARNING: flushes the target database (``BENCH_REDIS_URI``, default db 15).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import pathlib
+import statistics
+import sys
+import time
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+os.environ["REDIS_URI"] = os.getenv("BENCH_REDIS_URI", "redis://localhost:6379/15")
+os.environ.setdefault("CHAIN_INDEX_TTL_SECONDS", "3600")
+os.environ.setdefault("MAX_CHAIN_CONTRACTS", "100000")
+os.environ["QUOTE_CACHE_TTL_SECONDS"] = "0"  # time Redis reads, not the in-process cache
+
+from app.chain_index import ChainSort, index_contract, quote_key, rank_key  # noqa: E402
+from app.codec import OPTION_QUOTE, decode_record, encode_record  # noqa: E402
+from app.redis_client import get_redis  # noqa: E402
+from app.service import _synthetic_chain, fetch_options_chain  # noqa: E402
+
+BUSY = "SPY"
+
+
+async def legacy_scan_chain(symbol: str, limit: int, count: int) -> list:
+    """The pre-index read path: SCAN MATCH + MGET, stopping once ``limit`` are found."""
+    redis = get_redis()
+    candidates: list = []
+    cursor = 0
+    while True:
+        cursor, keys = await redis.scan(cursor=cursor, match=quote_key(f"{symbol}*"), count=count)
+        if keys:
+            candidates.extend(d for d in map(decode_record, await redis.mget(keys)) if d)
+        if cursor == 0 or len(candidates) >= limit:
+            break
+    candidates.sort(key=lambda item: item.get("mid", 0), reverse=True)
+    return candidates[:limit]
+
+
+async def populate(total: int, chain_size: int, binary: bool) -> None:
+    redis = get_redis()
+    await redis.flushdb()
+    template = _synthetic_chain(BUSY, 1)[0]
+    pipe = redis.pipeline(transaction=False)
+    for idx in range(total):
+        underlying = BUSY if idx < chain_size else f"F{idx // chain_size:05d}"
+        contract = f"{underlying} 2025-{1 + idx % 12:02d}-17 {100 + idx % 997}C"
+        payload = {**template, "symbol": contract, "mid": (idx * 7919) % 1000 / 100}
+        pipe.set(quote_key(contract), encode_record(OPTION_QUOTE, payload, binary))
+        index_contract(pipe, contract, payload, 3600)
+        if len(pipe) >= 20_000:
+            await pipe.execute()
+    await pipe.execute()
+
+
+async def timed(label: str, runs: int, factory) -> None:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = await factory()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    print(
+        f"  {label:<34} n={len(result):<5} p50={statistics.median(samples):9.2f}ms "
+        f"p95={p95:9.2f}ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--chain-size", type=int, default=2_000)
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--binary", action="store_true", help="store quotes as binary records")
+    args = parser.parse_args()
+
+    for total in args.sizes:
+        await populate(total, args.chain_size, args.binary)
+        print(f"keyspace={total:,} {BUSY} contracts={args.chain_size:,}")
+        await timed(
+            f"legacy SCAN (limit={args.limit})",
+            args.runs,
+            lambda: legacy_scan_chain(BUSY, args.limit, args.limit),
+        )
+        await timed(
+            "legacy SCAN (full chain)",
+            args.runs,
+            lambda: legacy_scan_chain(BUSY, args.chain_size, 1_000),
+        )
+        await timed(
+            "rank index (full chain)",
+            args.runs,
+            lambda: fetch_options_chain(BUSY, args.chain_size, ChainSort.liquidity_score),
+        )
+        await timed(
+            f"rank ZREVRANGE top-{args.limit} by mid",
+            args.runs,
+            lambda: fetch_options_chain(BUSY, args.limit, ChainSort.mid),
+        )
+        await get_redis().delete(rank_key(BUSY, ChainSort.open_interest))
+        await timed(
+            f"streamed heap top-{args.limit} by OI",
+            args.runs,
+            lambda: fetch_options_chain(BUSY, args.limit, ChainSort.open_interest),
+        )
+    await get_redis().flushdb()
+    await get_redis().aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
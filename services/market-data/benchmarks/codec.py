@@ -0,0 +1,82 @@
+"""Decode cost of JSON vs binary option quote records.
+
+Usage: ``python benchmarks/codec.py [--chain-size 2000] [--limit 5]``
+
+Compares the previous ``json.loads`` decode with ``decode_record`` on binary values, and
+a full chain decode with the columnar ``top_records`` path used by chain reads.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import pathlib
+import statistics
+import sys
+import timeit
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.codec import OPTION_QUOTE, decode_record, top_records  # noqa: E402
+from app.service import _synthetic_chain  # noqa: E402
+
+
+def legacy_decode(value: bytes | None):
+    """The pre-codec ``service._decode``."""
+    if not value:
+        return None
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        return None
+
+
+def best_of(stmt, number: int, repeat: int = 5) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=repeat)) / number
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chain-size", type=int, default=2_000)
+    parser.add_argument("--limit", type=int, default=5)
+    args = parser.parse_args()
+
+    template = {
+        **_synthetic_chain("SPY", 1)[0],
+        "implied_vol": 0.31,
+        "timestamp": "2025-01-17T15:04:05.123456789Z",
+    }
+    chain = [
+        {**template, "mid": (idx * 7919) % 1000 / 100, "open_interest": idx}
+        for idx in range(args.chain_size)
+    ]
+    as_json = [json.dumps(contract).encode() for contract in chain]
+    as_binary = [OPTION_QUOTE.encode(contract) for contract in chain]
+    assert all(decode_record(b) == legacy_decode(j) for b, j in zip(as_binary, as_json))
+
+    print(
+        f"record size: json={statistics.mean(map(len, as_json)):.0f}B "
+        f"binary={OPTION_QUOTE.size}B"
+    )
+    single_json = best_of(lambda: legacy_decode(as_json[0]), 20_000)
+    single_binary = best_of(lambda: decode_record(as_binary[0]), 20_000)
+    print(
+        f"single record: json={single_json * 1e6:.2f}us binary={single_binary * 1e6:.2f}us "
+        f"({single_json / single_binary:.1f}x)"
+    )
+
+    def json_chain():
+        decoded = [legacy_decode(value) for value in as_json]
+        return sorted(decoded, key=lambda item: item.get("mid", 0), reverse=True)[: args.limit]
+
+    chain_json = best_of(json_chain, 20)
+    chain_binary = best_of(lambda: top_records(as_binary, OPTION_QUOTE, "mid", args.limit), 20)
+    print(
+        f"top-{args.limit} of {args.chain_size} contracts: json={chain_json * 1e3:.2f}ms "
+        f"binary={chain_binary * 1e3:.2f}ms ({chain_json / chain_binary:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import asyncio
+import pathlib
+import sys
+
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.cache import QuoteCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_cache_expires_and_evicts_least_recently_used():
+    clock = Clock()
+    cache = QuoteCache(max_entries=2, ttl_seconds=1.0, clock=clock)
+    loads = []
+
+    async def loader(value):
+        loads.append(value)
+        return value
+
+    assert await cache.get_or_load("a", "equity:A", lambda: loader("a")) == "a"
+    assert await cache.get_or_load("b", "equity:B", lambda: loader("b")) == "b"
+    assert await cache.get_or_load("a", "equity:A", lambda: loader("a!")) == "a"
+    await cache.get_or_load("c", "equity:C", lambda: loader("c"))  # evicts "b"
+    await cache.get_or_load("b", "equity:B", lambda: loader("b"))
+    clock.now = 5.0
+    await cache.get_or_load("b", "equity:B", lambda: loader("b"))
+
+    assert loads == ["a", "b", "c", "b", "b"]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"]) == (1, 5, 1)
+    assert stats["evictions"] == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load_and_invalidation_wins():
+    cache = QuoteCache(max_entries=10, ttl_seconds=60.0)
+    release = asyncio.Event()
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return {"close": calls}
+
+    waiters = [
+        asyncio.ensure_future(cache.get_or_load("k", "chain:SPY", loader)) for _ in range(50)
+    ]
+    await asyncio.sleep(0)
+    cache.invalidate("chain:SPY")  # a writer update lands while the load is in flight
+    late = asyncio.ensure_future(cache.get_or_load("k", "chain:SPY", loader))
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters)
+
+    assert calls == 2  # the post-update caller did not join the stale load
+    assert (await late)["close"] == 2
+    assert all(result is results[0] for result in results)
+    assert cache.stats()["coalesced"] == 49
+    # only the post-update load was cached
+    assert (await cache.get_or_load("k", "chain:SPY", loader))["close"] == 2
+
+
+@pytest.mark.asyncio
+async def test_generations_are_only_kept_while_loads_are_in_flight():
+    cache = QuoteCache(max_entries=4, ttl_seconds=60.0)
+
+    async def loader():
+        return 1
+
+    async def batch(keys):
+        return {key: 1 for key in keys}
+
+    for i in range(100):
+        await cache.get_or_load(i, f"chain:S{i}", loader)
+        cache.invalidate(f"chain:S{i}")
+        await cache.get_many({f"q{i}": f"quote:S{i}"}, batch)
+
+    stats = cache.stats()
+    assert stats["pending_tags"] == 0 and stats["size"] == 4
+    assert stats["invalidations"] == 100
+
+
+@pytest.mark.asyncio
+async def test_clear_discards_a_first_load_still_in_flight():
+    cache = QuoteCache(max_entries=10, ttl_seconds=60.0)
+    release = asyncio.Event()
+    values = iter(["old", "new"])
+
+    async def loader():
+        value = next(values)
+        if value == "old":
+            await release.wait()
+        return value
+
+    pending = asyncio.ensure_future(cache.get_or_load("k", "chain:SPY", loader))
+    await asyncio.sleep(0)
+    cache.clear()  # a resubscribe lands before the tag has any entry
+    release.set()
+
+    assert await pending == "old"
+    assert await cache.get_or_load("k", "chain:SPY", loader) == "new"
+    assert cache.stats()["pending_tags"] == 0
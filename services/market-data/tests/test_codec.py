@@ -0,0 +1,68 @@
+import json
+import math
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.codec import (
+    EQUITY_AGGREGATE,
+    MAGIC,
+    OPTION_QUOTE,
+    decode_record,
+    encode_record,
+    top_records,
+)
+from app.service import _synthetic_chain, _synthetic_equity
+
+
+def test_binary_records_round_trip_and_coexist_with_json():
+    contract = {**_synthetic_chain("spy", 1)[0], "strike": 150.0}
+    partial = {"symbol": "SPY 2025-01-17 150C", "mid": 1.3, "bid_size": 10}
+    equity = _synthetic_equity("aapl")
+
+    cases = ((OPTION_QUOTE, contract), (OPTION_QUOTE, partial), (EQUITY_AGGREGATE, equity))
+    for layout, payload in cases:
+        binary = encode_record(layout, payload, binary=True)
+        assert binary[0] == MAGIC and len(binary) == layout.size
+        assert decode_record(binary) == payload
+        assert decode_record(encode_record(layout, payload, binary=False)) == payload
+
+
+def test_payloads_that_do_not_fit_the_layout_stay_json():
+    contract = _synthetic_chain("spy", 1)[0]
+    for payload in (
+        {**contract, "note": "extra field"},
+        {**contract, "open_interest": 10.5},
+        {**contract, "symbol": "X" * 64},
+    ):
+        assert encode_record(OPTION_QUOTE, payload, binary=True) == json.dumps(payload).encode()
+
+
+def test_non_finite_and_oversized_integers_fall_back_to_json():
+    contract = _synthetic_chain("spy", 1)[0]
+    payload = {**contract, "volume": float("nan"), "open_interest": 2**70}
+
+    encoded = encode_record(OPTION_QUOTE, payload, binary=True)
+    decoded = decode_record(encoded)
+
+    assert encoded == json.dumps(payload).encode()
+    assert math.isnan(decoded.pop("volume")) and decoded["open_interest"] == 2**70
+    for volume in (float("inf"), -(2**63) - 1):
+        assert encode_record(OPTION_QUOTE, {**contract, "volume": volume}, binary=True)[0] != MAGIC
+
+
+def test_top_records_mixes_binary_and_json_values():
+    chain = _synthetic_chain("spy", 12)
+    values = [
+        encode_record(OPTION_QUOTE, contract, binary=idx % 2 == 0)
+        for idx, contract in enumerate(chain)
+    ] + [None, b"not json"]
+
+    records = top_records(values, OPTION_QUOTE, "mid", limit=3)
+    top = sorted(records, key=lambda item: item["mid"], reverse=True)[:3]
+
+    assert len(records) == 3 + 6  # binary winners plus every JSON record
+    assert top == sorted(chain, key=lambda item: item["mid"], reverse=True)[:3]
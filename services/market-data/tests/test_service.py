@@ -1,6 +1,8 @@
 import asyncio
+import json
 import pathlib
 import sys
+from dataclasses import replace
 
 import pytest
 
@@ -8,7 +10,22 @@ ROOT = pathlib.Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from app.service import _synthetic_chain, fetch_equity_quote, fetch_options_chain
+from app.chain_index import ChainSort, contract_score
+from app.service import (
+    _synthetic_chain,
+    apply_update,
+    fetch_equity_quote,
+    fetch_equity_quotes,
+    fetch_options_chain,
+    quote_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def _empty_quote_cache():
+    quote_cache.clear()
+    yield
+    quote_cache.clear()
 
 
 @pytest.mark.asyncio
@@ -28,10 +45,13 @@ async def test_equity_quote_fallback(monkeypatch):
 @pytest.mark.asyncio
 async def test_chain_fallback(monkeypatch):
     class DummyRedis:
-        async def scan(self, *_, **__):
-            return 0, []
+        async def zrevrange(self, *_):
+            return []
+
+        async def zrange(self, *_):
+            return []
 
-        async def mget(self, keys):  # pragma: no cover - not used
+        async def mget(self, keys):
             return []
 
     from app import service
@@ -40,3 +60,163 @@ async def test_chain_fallback(monkeypatch):
     chain = await fetch_options_chain("msft", limit=3)
     assert len(chain) == 3
     assert all(contract["symbol"].startswith("MSFT") for contract in chain)
+
+
+def test_chain_route_revalidates_with_etag(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app import service
+    from app.main import app
+
+    class DummyRedis:
+        async def zrevrange(self, *_):
+            return []
+
+        async def zrange(self, *_):
+            return []
+
+    monkeypatch.setattr(service, "get_redis", lambda: DummyRedis())
+    client = TestClient(app)
+
+    first = client.get("/chains/msft", params={"limit": 3})
+    assert first.status_code == 200 and len(first.json()["contracts"]) == 3
+    etag = first.headers["etag"]
+    again = client.get("/chains/msft", params={"limit": 3}, headers={"If-None-Match": etag})
+    assert again.status_code == 304 and again.headers["etag"] == etag
+    other = client.get("/chains/msft", params={"limit": 4}, headers={"If-None-Match": etag})
+    assert other.status_code == 200 and other.headers["etag"] != etag
+
+
+class IndexRedis:
+    """Just enough of a sorted-set/MGET Redis to exercise the chain index read paths."""
+
+    def __init__(self, contracts, ranked_by=None, expired=()):
+        by_symbol = {c["symbol"]: c for c in contracts}
+        self.quotes = {s: json.dumps(c).encode() for s, c in by_symbol.items() if s not in expired}
+        self.chain = sorted(by_symbol, key=contract_score)
+        self.rank = sorted(self.chain, key=lambda m: by_symbol[m][ranked_by]) if ranked_by else []
+        self.pruned = []
+
+    async def zrevrange(self, key, start, stop):
+        members = self.rank[::-1] if key.endswith(":mid") else []
+        return [m.encode() for m in members[start : stop + 1]]
+
+    async def zrange(self, key, start, stop):
+        return [m.encode() for m in self.chain[start : stop + 1]]
+
+    async def mget(self, keys):
+        return [self.quotes.get(k.split(":", 2)[2]) for k in keys]
+
+    def pipeline(self, transaction=True):
+        redis = self
+
+        class Pipe:
+            def zrem(self, key, *members):
+                for m in members:
+                    redis.pruned.append(m)
+                    if m in redis.chain:
+                        redis.chain.remove(m)
+                    if m in redis.rank:
+                        redis.rank.remove(m)
+
+            async def execute(self):
+                return []
+
+        return Pipe()
+
+
+def _chain(size):
+    contracts = _synthetic_chain("spy", size)
+    for idx, contract in enumerate(contracts):
+        contract["mid"] = (idx * 37) % size / 10
+        contract["open_interest"] = (idx * 53) % size
+    return contracts
+
+
+@pytest.mark.asyncio
+async def test_top_n_from_rank_index_skips_expired(monkeypatch):
+    contracts = _chain(20)
+    top = sorted(contracts, key=lambda c: c["mid"], reverse=True)
+    redis = IndexRedis(contracts, ranked_by="mid", expired={top[0]["symbol"]})
+
+    from app import service
+    monkeypatch.setattr(service, "get_redis", lambda: redis)
+
+    chain = await fetch_options_chain("spy", limit=3)
+    assert [c["symbol"] for c in chain] == [c["symbol"] for c in top[1:4]]
+    assert set(redis.pruned) == {top[0]["symbol"]}
+
+
+@pytest.mark.asyncio
+async def test_top_n_streams_chain_index_when_rank_missing(monkeypatch):
+    contracts = _chain(50)
+    redis = IndexRedis(contracts, expired={contracts[7]["symbol"]})
+
+    from app import service
+    monkeypatch.setattr(service, "get_redis", lambda: redis)
+    monkeypatch.setattr(service, "settings", replace(service.settings, chain_mget_chunk=8))
+
+    chain = await fetch_options_chain("spy", limit=4, sort=ChainSort.open_interest)
+    live = [c for c in contracts if c["symbol"] != contracts[7]["symbol"]]
+    expected = sorted(live, key=lambda c: c["open_interest"], reverse=True)[:4]
+    assert [c["symbol"] for c in chain] == [c["symbol"] for c in expected]
+    assert set(redis.pruned) == {contracts[7]["symbol"]}
+
+
+def test_contract_score_orders_by_expiry_then_strike():
+    assert contract_score("SPY 2025-01-17 450C") < contract_score("SPY 2025-01-17 455C")
+    assert contract_score("SPY 2025-01-17 455C") < contract_score("SPY 2025-02-21 100P")
+    explicit = {"expiry": "2025-01-17T00:00:00", "strike": 450}
+    assert contract_score("SPY", explicit) == contract_score("SPY 2025-01-17 450C")
+
+
+@pytest.mark.asyncio
+async def test_chain_reads_are_cached_until_writer_update(monkeypatch):
+    redis = IndexRedis(_chain(10), ranked_by="mid")
+    calls = 0
+    mget = redis.mget
+
+    async def counting_mget(keys):
+        nonlocal calls
+        calls += 1
+        return await mget(keys)
+
+    redis.mget = counting_mget
+    from app import service
+    monkeypatch.setattr(service, "get_redis", lambda: redis)
+
+    first = await fetch_options_chain("spy", limit=3)
+    assert await fetch_options_chain("SPY", limit=3) is first
+    apply_update("option", "SPY 2030-01-18 100C")
+    await fetch_options_chain("spy", limit=3)
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_quotes_use_one_mget_and_flag_fallbacks(monkeypatch):
+    live = {"symbol": "AAPL", "close": 190.1, "volume": 10, "timestamp": "2025-01-17T15:00:00Z"}
+
+    class DummyRedis:
+        mgets = []
+
+        async def get(self, key):
+            return None
+
+        async def mget(self, keys):
+            self.mgets.append(keys)
+            return [json.dumps(live).encode() if key.endswith(":AAPL") else None for key in keys]
+
+    from app import service
+    redis = DummyRedis()
+    monkeypatch.setattr(service, "get_redis", lambda: redis)
+
+    await fetch_equity_quote("tsla")  # cached synthetic fallback
+    quotes = await fetch_equity_quotes(["aapl", "MSFT", "tsla", "AAPL"])
+
+    assert [(q["symbol"], q["synthetic"]) for q in quotes] == [
+        ("AAPL", False),
+        ("MSFT", True),
+        ("TSLA", True),
+    ]
+    assert quotes[0]["quote"] == live
+    assert redis.mgets == [["equity:aggregate:AAPL", "equity:aggregate:MSFT"]]
@@ -0,0 +1,56 @@
+import asyncio
+import json
+import pathlib
+import sys
+
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app import streaming
+from app.streaming import ChainBroker
+
+
+class QuoteRedis:
+    def __init__(self):
+        self.quotes = {}
+        self.mgets = 0
+
+    async def mget(self, keys):
+        self.mgets += 1
+        return [self.quotes.get(key.split(":", 2)[2]) for key in keys]
+
+    def put(self, contract, mid):
+        self.quotes[contract] = json.dumps({"symbol": contract, "mid": mid}).encode()
+
+
+@pytest.mark.asyncio
+async def test_updates_fan_out_once_and_conflate_for_slow_consumers(monkeypatch):
+    redis = QuoteRedis()
+    monkeypatch.setattr(streaming, "get_redis", lambda: redis)
+    broker = ChainBroker(flush_interval=0, max_batches=2)
+    fast, slow = broker.subscribe("spy"), broker.subscribe("SPY")
+
+    for mid in (1.0, 2.0, 3.0):
+        redis.put("SPY 2025-01-17 450C", mid)
+        broker.notify("option", "SPY 2025-01-17 450C")
+        broker.notify("option", "QQQ 2025-01-17 400C")  # no subscribers: ignored
+        await asyncio.sleep(0.01)
+        assert await fast.wait(0.1)
+        resync, delta = fast.drain()
+        assert not resync and delta.contracts["SPY 2025-01-17 450C"]["mid"] == mid
+
+    redis.quotes.clear()
+    broker.notify("option", "SPY 2025-01-17 450C")
+    await asyncio.sleep(0.01)
+
+    resync, delta = slow.drain()
+    assert redis.mgets == 4  # one read per flush, shared by both subscribers
+    assert not resync and delta.contracts == {"SPY 2025-01-17 450C": None}
+    assert json.loads(delta.encoded())["removed"] == ["SPY 2025-01-17 450C"]
+
+    broker.unsubscribe(fast)
+    broker.unsubscribe(slow)
+    assert broker.stats()["subscribers"] == 0
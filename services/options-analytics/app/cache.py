@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+
+class TTLCache:
+    """Bounded in-process LRU mapping with a per-entry TTL; disabled when either bound is 0.
+
+    Thread-safe, since chain work may run on the scoring executor's threads.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, Tuple[float, Any]] = OrderedDict()
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get(self, key: Hashable) -> Any | None:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self._clock():
+                del self._entries[key]
+                self._stats.expirations += 1
+                entry = None
+            if entry is None:
+                self._stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (self._clock() + self.ttl_seconds, value)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._stats.hits + self._stats.misses
+        return {
+            **asdict(self._stats),
+            "size": len(self._entries),
+            "hit_rate": self._stats.hits / lookups if lookups else 0.0,
+            "enabled": self.enabled,
+        }
@@ -1,34 +1,178 @@
 from __future__ import annotations
 
+import asyncio
+import importlib.util
+import logging
 import os
-from typing import Any, Dict
+import random
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Tuple
 
 import httpx
 
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS = frozenset({502, 503, 504})
+
+
+@dataclass
+class ClientStats:
+    requests: int = 0
+    retries: int = 0
+    failures: int = 0
+    connections_opened: int = 0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+
 
 class MarketDataClient:
-    def __init__(self, base_url: str | None = None, timeout: float = 1.0) -> None:
+    """Market-data reader sharing one keep-alive connection pool across requests.
+
+    The pool is opened by :meth:`start` (the app lifespan) and closed by :meth:`aclose`;
+    a client used outside a lifespan opens it lazily on first request. Idempotent GETs
+    are retried on transport errors and 502/503/504 with full-jitter exponential backoff.
+    """
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        timeout: float = 1.0,
+        *,
+        connect_timeout: float | None = None,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        retries: int = 2,
+        retry_backoff: float = 0.05,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
         self.base_url = base_url or os.getenv("MARKET_DATA_URL", "")
         self.timeout = timeout
+        self.connect_timeout = connect_timeout if connect_timeout is not None else timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2 and _http2_available()
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+        self._stats = ClientStats()
+
+    async def start(self) -> None:
+        if self._client is not None or not self.base_url:
+            return
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url.rstrip("/"),
+            timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+            limits=self.limits,
+            http2=self.http2,
+            transport=self._transport,
+        )
+
+    async def aclose(self) -> None:
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
 
     async def fetch_chain(self, symbol: str) -> Dict[str, Any] | None:
+        return await self._get_json(f"/chains/{symbol.upper()}")
+
+    async def fetch_chain_if_changed(
+        self, symbol: str, etag: str | None
+    ) -> Tuple[Dict[str, Any] | None, str | None]:
+        """Conditional chain fetch: ``(payload, etag)``, or ``(None, etag)`` when unchanged."""
         if not self.base_url:
-            return None
-        url = f"{self.base_url.rstrip('/')}/chains/{symbol.upper()}"
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(url)
-            response.raise_for_status()
-            return response.json()
+            return None, None
+        headers = {"If-None-Match": etag} if etag else {}
+        response = await self._get(f"/chains/{symbol.upper()}", headers)
+        if response.status_code == 304:
+            return None, etag
+        return response.json(), response.headers.get("etag")
 
     async def fetch_quote(self, symbol: str) -> Dict[str, Any] | None:
+        return await self._get_json(f"/quotes/{symbol.upper()}")
+
+    async def fetch_spot(self, symbol: str) -> float | None:
+        """Last price of an underlying, or ``None`` when market data only has a placeholder."""
+        payload = await self._get_json(f"/quotes?symbols={symbol.upper()}")
+        for item in (payload or {}).get("quotes", ()):
+            if item.get("synthetic"):
+                return None
+            quote = item.get("quote") or {}
+            price = quote.get("close") or quote.get("vwap")
+            return float(price) if price else None
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        stats = asdict(self._stats)
+        stats["max_connections"] = self.limits.max_connections
+        stats["utilization"] = self._stats.in_flight / (self.limits.max_connections or 1)
+        # Requests served per TCP connect; 1.0 means no keep-alive reuse at all.
+        stats["reuse_ratio"] = self._stats.requests / max(1, self._stats.connections_opened)
+        stats["http2"] = self.http2
+        stats["open"] = self._client is not None
+        return stats
+
+    async def _get_json(self, path: str) -> Dict[str, Any] | None:
         if not self.base_url:
             return None
-        url = f"{self.base_url.rstrip('/')}/quotes/{symbol.upper()}"
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(url)
-            response.raise_for_status()
-            return response.json()
+        return (await self._get(path)).json()
+
+    async def _get(self, path: str, headers: Dict[str, str] | None = None) -> httpx.Response:
+        await self.start()
+        attempt = 0
+        while True:
+            try:
+                response = await self._send(path, headers)
+                if response.status_code not in RETRYABLE_STATUS or attempt >= self.retries:
+                    if response.status_code != 304:
+                        response.raise_for_status()
+                    return response
+            except httpx.TransportError:
+                if attempt >= self.retries:
+                    self._stats.failures += 1
+                    raise
+            except httpx.HTTPStatusError:
+                self._stats.failures += 1
+                raise
+            attempt += 1
+            self._stats.retries += 1
+            await asyncio.sleep(random.uniform(0, self.retry_backoff * 2**attempt))
+
+    async def _send(self, path: str, headers: Dict[str, str] | None) -> httpx.Response:
+        stats = self._stats
+        stats.requests += 1
+        stats.in_flight += 1
+        stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+        try:
+            return await self._client.get(path, headers=headers, extensions={"trace": self._trace})
+        finally:
+            stats.in_flight -= 1
+
+    async def _trace(self, event: str, info: Dict[str, Any]) -> None:
+        if event == "connection.connect_tcp.complete":
+            self._stats.connections_opened += 1
+
+
+def _http2_available() -> bool:
+    if importlib.util.find_spec("h2") is None:
+        logger.warning("HTTP/2 requested but the h2 package is not installed; using HTTP/1.1")
+        return False
+    return True
 
 
 def build_market_data_client() -> MarketDataClient:
-    return MarketDataClient()
+    return MarketDataClient(
+        timeout=float(os.getenv("MARKET_DATA_TIMEOUT_SECONDS", "1.0")),
+        connect_timeout=float(os.getenv("MARKET_DATA_CONNECT_TIMEOUT_SECONDS", "0.5")),
+        max_connections=int(os.getenv("MARKET_DATA_MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=int(os.getenv("MARKET_DATA_MAX_KEEPALIVE", "20")),
+        keepalive_expiry=float(os.getenv("MARKET_DATA_KEEPALIVE_SECONDS", "30")),
+        http2=os.getenv("MARKET_DATA_HTTP2", "false").lower() in {"1", "true", "yes"},
+        retries=int(os.getenv("MARKET_DATA_RETRIES", "2")),
+        retry_backoff=float(os.getenv("MARKET_DATA_RETRY_BACKOFF_SECONDS", "0.05")),
+    )
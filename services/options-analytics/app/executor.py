@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, Iterable, List, Tuple, TypeVar
+
+import numpy as np
+
+from .schemas import RiskProfile
+from .screening import ChainColumns, screen_profiles
+from .surface import VolSurface
+
+EXECUTOR_KINDS = ("inline", "thread", "process")
+# Everything screen_profiles and VolSurface.richness read; expiry travels as int codes.
+SCORING_FIELDS = (
+    "delta",
+    "gamma",
+    "theta",
+    "vega",
+    "implied_vol",
+    "open_interest",
+    "spread_pct",
+    "liquidity_score",
+    "strike",
+)
+
+T = TypeVar("T")
+ScreenResults = Dict[RiskProfile, Tuple[np.ndarray, int]]
+
+
+class ExecutorBusy(RuntimeError):
+    """Raised when chain work waits longer than the admission timeout for a slot."""
+
+
+@dataclass
+class ExecutorStats:
+    inline: int = 0
+    offloaded: int = 0
+    rejected: int = 0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    admission_wait_seconds: float = 0.0
+
+
+@dataclass(frozen=True)
+class SharedChain:
+    """Handle to a chain's scoring columns in a shared-memory block; it pickles to a few
+    hundred bytes whatever the chain size."""
+
+    name: str
+    layout: Tuple[Tuple[str, str, int, int], ...]  # (column, dtype, byte offset, length)
+    expiries: Tuple[str, ...]
+
+
+class ScoringExecutor:
+    """Runs CPU-bound chain work (normalization, enrichment, surface fits, scoring) off the
+    event loop.
+
+    ``inline`` keeps everything on the loop. ``thread`` runs each step in a thread pool:
+    the NumPy kernels release the GIL, and the Python-level steps are still preempted
+    every switch interval, so the loop keeps serving. ``process`` additionally sends
+    scoring to a process pool, passing the chain's columns through shared memory rather
+    than pickling them. Chains under ``offload_min_contracts`` always run inline, as the
+    hand-off would cost more than the work.
+
+    Admission control: at most ``max_in_flight`` offloaded steps run or queue at once; a
+    step that cannot get a slot within ``admission_timeout`` raises :class:`ExecutorBusy`.
+    """
+
+    def __init__(
+        self,
+        kind: str = "inline",
+        workers: int = 2,
+        max_in_flight: int = 4,
+        admission_timeout: float = 5.0,
+        offload_min_contracts: int = 2000,
+    ) -> None:
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"unknown executor kind {kind!r}; expected one of {EXECUTOR_KINDS}")
+        self.kind = kind
+        self.workers = workers
+        self.max_in_flight = max_in_flight
+        self.admission_timeout = admission_timeout
+        self.offload_min_contracts = offload_min_contracts
+        self._threads: ThreadPoolExecutor | None = None
+        self._processes: ProcessPoolExecutor | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._stats = ExecutorStats()
+
+    async def start(self) -> None:
+        if self.kind == "inline" or self._threads is not None:
+            return
+        self._threads = ThreadPoolExecutor(self.workers, thread_name_prefix="screen")
+        if self.kind == "process":
+            self._processes = ProcessPoolExecutor(
+                self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            # Spawned workers import NumPy and the app on first use; pay that up front.
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(
+                *(loop.run_in_executor(self._processes, int) for _ in range(self.workers))
+            )
+
+    async def aclose(self) -> None:
+        threads, processes = self._threads, self._processes
+        self._threads = self._processes = None
+        for pool in (threads, processes):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, size: int, fn: Callable[..., T], *args: Any) -> T:
+        """``fn(*args)`` for a chain of ``size`` contracts, on a worker thread when offloading."""
+        if not self._offloads(size):
+            self._stats.inline += 1
+            return fn(*args)
+        await self.start()
+        return await self._admitted(self._threads, fn, *args)
+
+    async def screen(
+        self,
+        chain: ChainColumns,
+        risks: Iterable[RiskProfile],
+        now: datetime,
+        surface: VolSurface | None = None,
+        k: int = 5,
+    ) -> ScreenResults:
+        """:func:`screen_profiles`, priced against ``surface`` when there is one."""
+        risks = list(risks)
+        if self.kind != "process" or not self._offloads(len(chain)):
+            return await self.run(len(chain), _screen, chain, risks, now, surface, k)
+        await self.start()
+        block, shared = export_chain(chain)
+        try:
+            return await self._admitted(
+                self._processes, _screen_shared, shared, risks, now, surface, k
+            )
+        finally:
+            block.close()
+            block.unlink()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **asdict(self._stats),
+            "kind": self.kind,
+            "workers": self.workers,
+            "max_in_flight": self.max_in_flight,
+        }
+
+    def _offloads(self, size: int) -> bool:
+        return self.kind != "inline" and size >= self.offload_min_contracts
+
+    async def _admitted(self, pool: Executor, fn: Callable[..., T], *args: Any) -> T:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+        loop = asyncio.get_running_loop()
+        waited = loop.time()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.admission_timeout)
+        except asyncio.TimeoutError:
+            self._stats.rejected += 1
+            raise ExecutorBusy(
+                f"no scoring slot free within {self.admission_timeout:g}s"
+            ) from None
+        stats = self._stats
+        stats.admission_wait_seconds += loop.time() - waited
+        stats.offloaded += 1
+        stats.in_flight += 1
+        stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+        try:
+            return await loop.run_in_executor(pool, fn, *args)
+        finally:
+            stats.in_flight -= 1
+            self._slots.release()
+
+
+def export_chain(chain: ChainColumns) -> Tuple[SharedMemory, SharedChain]:
+    """Copy the scoring columns into one shared-memory block; the caller unlinks it."""
+    index: Dict[str, int] = {}
+    for expiry in chain["expiry"]:
+        index.setdefault(expiry, len(index))
+    codes = np.fromiter(map(index.__getitem__, chain["expiry"]), dtype=np.int32, count=len(chain))
+    arrays = [(name, chain[name]) for name in SCORING_FIELDS] + [("expiry", codes)]
+    block = SharedMemory(create=True, size=max(1, sum(a.nbytes for _, a in arrays)))
+    layout: List[Tuple[str, str, int, int]] = []
+    offset = 0
+    for name, array in arrays:
+        view = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf, offset=offset)
+        view[:] = array
+        layout.append((name, array.dtype.str, offset, len(array)))
+        offset += array.nbytes
+    del view
+    return block, SharedChain(block.name, tuple(layout), tuple(index))
+
+
+def attach_chain(shared: SharedChain, block: SharedMemory) -> ChainColumns:
+    """Zero-copy :class:`ChainColumns` over an attached block (scoring columns only)."""
+    columns = {
+        name: np.ndarray(length, dtype=np.dtype(dtype), buffer=block.buf, offset=offset)
+        for name, dtype, offset, length in shared.layout
+    }
+    columns["expiry"] = np.array(shared.expiries, dtype=object)[columns["expiry"]]
+    return ChainColumns(columns)
+
+
+def _screen(
+    chain: ChainColumns,
+    risks: List[RiskProfile],
+    now: datetime,
+    surface: VolSurface | None,
+    k: int,
+) -> ScreenResults:
+    richness = surface.richness(chain, now) if surface else None
+    return screen_profiles(chain, risks, now, k, richness)
+
+
+def _screen_shared(
+    shared: SharedChain,
+    risks: List[RiskProfile],
+    now: datetime,
+    surface: VolSurface | None,
+    k: int,
+) -> ScreenResults:
+    block = SharedMemory(name=shared.name)
+    chain = None
+    try:
+        chain = attach_chain(shared, block)
+        # Winner indices and counts are fresh arrays, so nothing returned aliases the block.
+        return _screen(chain, risks, now, surface, k)
+    finally:
+        chain = None
+        # A traceback can still hold column views; the mapping then closes when it is freed.
+        with contextlib.suppress(BufferError):
+            block.close()
@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from datetime import datetime, time
+from typing import Dict, Hashable, List, Sequence, Tuple
+
+import numpy as np
+from scipy.special import ndtr
+
+from .cache import TTLCache
+from .screening import ChainColumns
+
+GREEK_FIELDS = ("delta", "gamma", "theta", "vega")
+# US equity options stop trading at 16:00 New York time; 20:00 UTC is close enough for
+# time value and keeps year fractions independent of DST rules.
+EXPIRY_CUTOFF = time(20, 0)
+SECONDS_PER_YEAR = 365.0 * 24 * 3600
+MIN_VOL, MAX_VOL = 1e-4, 5.0
+_OCC_TYPE = re.compile(r"\d{6}([CP])\d{8}$")
+_SQRT_2PI = np.sqrt(2 * np.pi)
+
+
+def bs_price(
+    spot: np.ndarray,
+    strike: np.ndarray,
+    years: np.ndarray,
+    rate: float,
+    vol: np.ndarray,
+    is_call: np.ndarray,
+) -> np.ndarray:
+    """Black-Scholes price of European options on a non-dividend-paying underlying."""
+    d1, d2, discount = _d1_d2(spot, strike, years, rate, vol)
+    call = spot * ndtr(d1) - strike * discount * ndtr(d2)
+    put = strike * discount * ndtr(-d2) - spot * ndtr(-d1)
+    return np.where(is_call, call, put)
+
+
+def bs_greeks(
+    spot: np.ndarray,
+    strike: np.ndarray,
+    years: np.ndarray,
+    rate: float,
+    vol: np.ndarray,
+    is_call: np.ndarray,
+) -> Dict[str, np.ndarray]:
+    """Delta, gamma, theta per calendar day and vega per vol point, as quoted upstream."""
+    d1, d2, discount = _d1_d2(spot, strike, years, rate, vol)
+    root = np.sqrt(years)
+    density = np.exp(-0.5 * d1 * d1) / _SQRT_2PI
+    decay = -spot * density * vol / (2 * root)
+    carry = rate * strike * discount
+    return {
+        "delta": np.where(is_call, ndtr(d1), ndtr(d1) - 1),
+        "gamma": density / (spot * vol * root),
+        "theta": np.where(is_call, decay - carry * ndtr(d2), decay + carry * ndtr(-d2)) / 365,
+        "vega": spot * density * root / 100,
+    }
+
+
+def implied_vol(
+    price: np.ndarray,
+    spot: np.ndarray,
+    strike: np.ndarray,
+    years: np.ndarray,
+    rate: float,
+    is_call: np.ndarray,
+    tol: float = 1e-10,
+    max_iter: int = 100,
+) -> np.ndarray:
+    """Solve Black-Scholes IV for a whole chain at once; NaN where no volatility fits.
+
+    Each contract is solved on its out-of-the-money side (via put-call parity), where
+    the price carries all of the time value. Newton runs on log price, which stays
+    well-conditioned far from the money, and each contract keeps a ``[lo, hi]`` bracket
+    (price increases with vol): a step that leaves it falls back to bisection.
+    Converged contracts drop out of the working set.
+    """
+    price, spot, strike, years, is_call = np.broadcast_arrays(
+        *(np.asarray(a, dtype=np.float64) for a in (price, spot, strike, years)),
+        np.asarray(is_call, dtype=bool),
+    )
+    held = strike * np.exp(-rate * years)
+    side = np.where(spot > held, -1.0, 1.0)  # +1 prices the call, -1 the put
+    # Contracts quoted on the in-the-money side shed their intrinsic value.
+    target = price - np.where(is_call, np.maximum(spot - held, 0), np.maximum(held - spot, 0))
+    cap = np.where(side > 0, spot, held)
+    with np.errstate(invalid="ignore"):
+        solvable = (years > 0) & (spot > 0) & (strike > 0) & (target > 0) & (target < cap)
+
+    result = np.full(price.shape, np.nan)
+    active = np.flatnonzero(solvable)
+    # Everything but vol is fixed per contract, so log-moneyness and sqrt(T) are hoisted.
+    s, k, t, q, side = spot[active], held[active], years[active], target[active], side[active]
+    moneyness = np.log(s / k)
+    root = np.sqrt(t)
+    log_target = np.log(q)
+    # Brenner-Subrahmanyam at-the-money estimate as the starting point.
+    vol = np.clip(np.sqrt(2 * np.pi / t) * (q + np.abs(s - k) / 2) / s, 0.05, 2.0)
+    lo, hi = np.full(len(active), MIN_VOL), np.full(len(active), MAX_VOL)
+
+    for _ in range(max_iter):
+        spread = vol * root
+        d1 = moneyness / spread + 0.5 * spread
+        model = side * (s * ndtr(side * d1) - k * ndtr(side * (d1 - spread)))
+        high = model > q
+        np.copyto(hi, vol, where=high)
+        np.copyto(lo, vol, where=~high)
+        done = (np.abs(model - q) <= tol * q) | (hi - lo <= tol)
+        if done.all():
+            result[active] = vol
+            break
+
+        vega = s * root * np.exp(-0.5 * d1 * d1) / _SQRT_2PI
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            step = vol - (np.log(model) - log_target) * model / vega
+        np.copyto(step, 0.5 * (lo + hi), where=~((step > lo) & (step < hi)))
+        np.copyto(step, vol, where=done)
+        vol = step
+        # Shrinking the working set costs a copy per array, so only do it once it pays.
+        if done.sum() * 4 >= len(done):
+            result[active[done]] = vol[done]
+            keep = ~done
+            active, s, k, q, side, moneyness, root, log_target, vol, lo, hi, done = (
+                a[keep]
+                for a in (active, s, k, q, side, moneyness, root, log_target, vol, lo, hi, done)
+            )
+    else:
+        result[active[done]] = vol[done]
+    return result
+
+
+def years_to_expiry(expiries: Sequence[str], now: datetime) -> np.ndarray:
+    """Year fractions to each expiry's cutoff; unparseable expiries get NaN."""
+    years: Dict[str, float] = {}
+    for expiry in set(expiries):
+        try:
+            moment = datetime.fromisoformat(expiry)
+        except (TypeError, ValueError):
+            years[expiry] = np.nan
+            continue
+        if moment.time() == time(0):
+            moment = datetime.combine(moment.date(), EXPIRY_CUTOFF)
+        years[expiry] = (moment.replace(tzinfo=None) - now).total_seconds() / SECONDS_PER_YEAR
+    return np.fromiter(map(years.__getitem__, expiries), dtype=np.float64, count=len(expiries))
+
+
+def option_types(symbols: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """``(is_call, known)`` from ``"SPY 2025-01-17 450C"`` or OCC ``"O:SPY250117C00450000"``."""
+    kinds: List[str] = []
+    for symbol in symbols:
+        last = symbol[-1:]
+        if last not in ("C", "P"):
+            match = _OCC_TYPE.search(symbol)
+            last = match.group(1) if match else ""
+        kinds.append(last)
+    kinds_array = np.array(kinds)
+    return kinds_array == "C", (kinds_array == "C") | (kinds_array == "P")
+
+
+class GreeksEngine:
+    """Fills in IV and Greeks a chain arrived without.
+
+    A contract needs IV when ``implied_vol`` is 0, and Greeks when delta, gamma and vega
+    are all 0 (the normalization defaults). Results are cached per expiry slice under
+    (underlying, expiry, spot, rate, minute, slice inputs), and the contracts missing
+    from the cache are solved in one vectorized pass.
+    """
+
+    def __init__(self, rate: float, cache: TTLCache) -> None:
+        self.rate = rate
+        self.cache = cache
+
+    def needs_enrichment(self, chain: ChainColumns) -> bool:
+        return bool(self._targets(chain).any())
+
+    def enrich(
+        self, chain: ChainColumns, underlying: str, spot: float, now: datetime
+    ) -> ChainColumns:
+        """Return ``chain`` with missing IV/Greeks filled in where they can be solved."""
+        now = now.replace(second=0, microsecond=0)
+        distinct, codes = _expiry_codes(chain["expiry"])
+        years = years_to_expiry(distinct, now)[codes]
+        targets = np.flatnonzero(self._targets(chain) & (years > 0))
+        is_call, known = option_types(chain["symbol"][targets])
+        targets, is_call = targets[known], is_call[known]
+        if not len(targets):
+            return chain
+
+        given = chain["implied_vol"][targets]
+        inputs = (chain["strike"][targets], chain["mid"][targets], is_call, given)
+        solved = np.empty((5, len(targets)))
+        missing: List[Tuple[Hashable, np.ndarray]] = []
+        for code, rows in _group_by(codes[targets]):
+            digest = hashlib.blake2b(digest_size=16)
+            for column in inputs:
+                digest.update(column[rows].tobytes())
+            key = (underlying, distinct[code], spot, self.rate, now, digest.digest())
+            cached = self.cache.get(key)
+            if cached is None:
+                missing.append((key, rows))
+            else:
+                solved[:, rows] = cached
+        if missing:
+            rows = np.concatenate([group for _, group in missing])
+            solved[:, rows] = self._solve(chain, targets[rows], spot, years[targets[rows]],
+                                          is_call[rows])
+            for key, group in missing:
+                self.cache.put(key, solved[:, group])
+
+        columns = dict(chain.columns)
+        fill_vol = (given <= 0) & np.isfinite(solved[0])
+        columns["implied_vol"] = columns["implied_vol"].copy()
+        columns["implied_vol"][targets[fill_vol]] = solved[0][fill_vol]
+        fill_greeks = self._greeks_missing(chain)[targets] & np.isfinite(solved[1])
+        for offset, name in enumerate(GREEK_FIELDS, start=1):
+            columns[name] = columns[name].copy()
+            columns[name][targets[fill_greeks]] = solved[offset][fill_greeks]
+        return ChainColumns(columns, chain.rejects)
+
+    def _solve(
+        self,
+        chain: ChainColumns,
+        rows: np.ndarray,
+        spot: float,
+        years: np.ndarray,
+        is_call: np.ndarray,
+    ) -> np.ndarray:
+        strike, given = chain["strike"][rows], chain["implied_vol"][rows]
+        spots = np.full(len(rows), spot)
+        vol = np.where(
+            given > 0,
+            given,
+            implied_vol(chain["mid"][rows], spots, strike, years, self.rate, is_call),
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            greeks = bs_greeks(spots, strike, years, self.rate, vol, is_call)
+        return np.vstack([vol] + [greeks[name] for name in GREEK_FIELDS])
+
+    def _targets(self, chain: ChainColumns) -> np.ndarray:
+        return (chain["implied_vol"] <= 0) | self._greeks_missing(chain)
+
+    @staticmethod
+    def _greeks_missing(chain: ChainColumns) -> np.ndarray:
+        return (chain["delta"] == 0) & (chain["gamma"] == 0) & (chain["vega"] == 0)
+
+
+def _d1_d2(
+    spot: np.ndarray, strike: np.ndarray, years: np.ndarray, rate: float, vol: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    spread = vol * np.sqrt(years)
+    d1 = (np.log(spot / strike) + (rate + 0.5 * vol * vol) * years) / spread
+    return d1, d1 - spread, np.exp(-rate * years)
+
+
+def _expiry_codes(expiries: np.ndarray) -> Tuple[List[str], np.ndarray]:
+    """Distinct expiries and, per contract, the index of its expiry in that list."""
+    distinct = list(set(expiries))
+    index = {expiry: code for code, expiry in enumerate(distinct)}
+    codes = np.fromiter(map(index.__getitem__, expiries), dtype=np.int64, count=len(expiries))
+    return distinct, codes
+
+
+def _group_by(codes: np.ndarray) -> List[Tuple[int, np.ndarray]]:
+    """``(code, positions)`` for each code present in ``codes``."""
+    order = np.argsort(codes, kind="stable")
+    present, starts = np.unique(codes[order], return_index=True)
+    return list(zip(present.tolist(), np.split(order, starts[1:]), strict=True))
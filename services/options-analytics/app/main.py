@@ -1,17 +1,76 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
 
-from .schemas import ScreeningRequest
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from .executor import ExecutorBusy
+from .schemas import (
+    BatchScreeningRequest,
+    ScreeningError,
+    ScreeningRequest,
+    ScreeningResponse,
+    VolSurfaceResponse,
+)
 from .service import build_service
 
-app = FastAPI(title="Options Analytics Service", version="0.1.0")
 service = build_service()
 
 
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    await service.market_data.start()
+    await service.executor.start()
+    try:
+        yield
+    finally:
+        await service.executor.aclose()
+        await service.market_data.aclose()
+
+
+app = FastAPI(title="Options Analytics Service", version="0.1.0", lifespan=lifespan)
+
+
+@app.exception_handler(ExecutorBusy)
+async def executor_busy(_: Request, exc: ExecutorBusy) -> JSONResponse:
+    return JSONResponse({"detail": str(exc)}, status_code=503, headers={"Retry-After": "1"})
+
+
 @app.get("/healthz")
 async def healthcheck() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/metrics")
+async def metrics() -> dict[str, dict[str, Any]]:
+    return {
+        "market_data_client": service.market_data.stats(),
+        "screening_cache": service.result_cache.stats(),
+        "chain_cache": service.chain_cache.stats(),
+        "greeks_cache": service.greeks.cache.stats(),
+        "vol_surface": service.surfaces.stats(),
+        "executor": service.executor.stats(),
+    }
+
+
 @app.post("/screen")
-async def screen(request: ScreeningRequest):
-    return await service.screen(request)
+async def screen(request: ScreeningRequest, bypass_cache: bool = False):
+    return await service.screen(request, bypass_cache)
+
+
+@app.post("/screen:batch")
+async def screen_batch(request: BatchScreeningRequest, bypass_cache: bool = False):
+    responses = service.screen_batch(request.requests, bypass_cache)
+    return StreamingResponse(_ndjson(responses), media_type="application/x-ndjson")
+
+
+@app.get("/surfaces/{symbol}", response_model=VolSurfaceResponse)
+async def surface(symbol: str, bypass_cache: bool = False):
+    return await service.surface(symbol, bypass_cache)
+
+
+async def _ndjson(
+    responses: AsyncIterator[ScreeningResponse | ScreeningError],
+) -> AsyncIterator[str]:
+    async for response in responses:
+        yield response.model_dump_json() + "\n"
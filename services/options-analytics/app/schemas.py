@@ -3,6 +3,8 @@ from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
+MAX_BATCH_REQUESTS = 500
+
 
 class RiskProfile(str, Enum):
     conservative = "conservative"
@@ -35,8 +37,39 @@ class ScreeningRequest(BaseModel):
     constraints: Optional[dict] = None
 
 
+class BatchScreeningRequest(BaseModel):
+    requests: List[ScreeningRequest] = Field(min_length=1, max_length=MAX_BATCH_REQUESTS)
+
+
 class ScreeningResponse(BaseModel):
     symbol: str
     timestamp: str
     candidates: List[ContractCandidate]
     diagnostics: dict
+
+
+class ScreeningError(BaseModel):
+    """One ``/screen:batch`` line for a symbol that could not be screened."""
+
+    symbol: str
+    error: str
+    retry_after: Optional[int] = None  # seconds, when the failure was load shedding
+
+
+class SVISliceParams(BaseModel):
+    expiry: str
+    years: float
+    reference: float
+    a: float
+    b: float
+    rho: float
+    m: float
+    sigma: float
+    rmse: float
+    points: int
+
+
+class VolSurfaceResponse(BaseModel):
+    symbol: str
+    timestamp: str
+    slices: List[SVISliceParams]
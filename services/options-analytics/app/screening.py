@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from .schemas import ContractCandidate, RiskProfile
+
+FLOAT_FIELDS = (
+    "delta",
+    "gamma",
+    "theta",
+    "vega",
+    "implied_vol",
+    "bid",
+    "ask",
+    "mid",
+    "spread_pct",
+    "strike",
+)
+INT_FIELDS = ("open_interest", "volume", "liquidity_score")
+TEXT_FIELDS = ("symbol", "expiry")
+FIELD_NAMES = FLOAT_FIELDS + INT_FIELDS + TEXT_FIELDS
+# Alternate market-data spellings, consulted when the canonical key is absent.
+FIELD_ALIASES = {"implied_vol": "iv", "open_interest": "oi", "spread_pct": "spread_percent"}
+_MISSING = object()
+# What an absent key normalizes to; a missing mid is derived from bid and ask.
+FIELD_DEFAULTS: Dict[str, Any] = {
+    **dict.fromkeys(FLOAT_FIELDS, 0.0),
+    **dict.fromkeys(INT_FIELDS, 0),
+    **dict.fromkeys(TEXT_FIELDS),
+    "mid": _MISSING,
+}
+
+
+@dataclass(frozen=True)
+class ChainColumns:
+    """A chain held as one NumPy column per :class:`ContractCandidate` field.
+
+    ``rejects`` lists the payload rows :meth:`from_payload` dropped, with reasons.
+    """
+
+    columns: Dict[str, np.ndarray]
+    rejects: Tuple[Dict[str, Any], ...] = ()
+
+    @classmethod
+    def from_payload(cls, rows: Sequence[Any]) -> "ChainColumns":
+        """Normalize a raw market-data ``contracts`` payload column by column.
+
+        Applies the coercions of :func:`reference_normalize` (aliases, zero defaults,
+        ``float``/``int`` conversion, ``mid`` from bid/ask) with one NumPy conversion per
+        column; only columns holding odd values fall back to per-row conversion. Rows that
+        fail, or that :class:`ContractCandidate` would refuse, become ``rejects``.
+        """
+        reasons: Dict[int, str] = {}
+        raws = list(rows)
+        values = _uniform_fields(raws)
+        if values is None:
+            for index, raw in enumerate(raws):
+                if not isinstance(raw, dict):
+                    reasons[index] = f"not an object: {raw!r}"
+                    raws[index] = {}
+            values = {name: _pluck(raws, name) for name in FIELD_NAMES}
+
+        columns: Dict[str, np.ndarray] = {}
+        for name in FLOAT_FIELDS:
+            if name != "mid":
+                columns[name] = _coerce(values[name], np.float64, name, reasons)
+        for name in INT_FIELDS:
+            columns[name] = _coerce(values[name], np.int64, name, reasons)
+        mids = ((columns["bid"] + columns["ask"]) / 2).tolist()
+        mid = [m if v is _MISSING else v for v, m in zip(values["mid"], mids, strict=True)]
+        columns["mid"] = _coerce(mid, np.float64, "mid", reasons)
+        for name in TEXT_FIELDS:
+            column = np.empty(len(raws), dtype=object)
+            column[:] = list(map(str, values[name]))
+            columns[name] = column
+
+        liquidity = columns["liquidity_score"]
+        for index in np.flatnonzero((liquidity < 0) | (liquidity > 100)).tolist():
+            reasons.setdefault(index, f"liquidity_score out of range: {liquidity[index]}")
+        if not reasons:
+            return cls(columns)
+
+        keep = np.ones(len(raws), dtype=bool)
+        keep[list(reasons)] = False
+        rejects = tuple(
+            {"index": index, "symbol": columns["symbol"][index], "reason": reasons[index]}
+            for index in sorted(reasons)
+        )
+        return cls({name: column[keep] for name, column in columns.items()}, rejects)
+
+    @classmethod
+    def from_records(cls, records: Sequence[Mapping[str, Any]]) -> "ChainColumns":
+        count = len(records)
+        columns: Dict[str, np.ndarray] = {}
+        for name in FLOAT_FIELDS:
+            columns[name] = np.fromiter((r[name] for r in records), dtype=np.float64, count=count)
+        for name in INT_FIELDS:
+            columns[name] = np.fromiter((r[name] for r in records), dtype=np.int64, count=count)
+        for name in TEXT_FIELDS:
+            column = np.empty(count, dtype=object)
+            column[:] = [r[name] for r in records]
+            columns[name] = column
+        return cls(columns)
+
+    def __len__(self) -> int:
+        return len(self.columns["strike"])
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def record(self, index: int) -> Dict[str, Any]:
+        record = {name: self.columns[name][index] for name in TEXT_FIELDS}
+        for name in FLOAT_FIELDS + INT_FIELDS:
+            record[name] = self.columns[name][index].item()
+        return record
+
+    def candidate(self, index: int) -> ContractCandidate:
+        # Columns are typed and range-checked on the way in, so winners skip revalidation.
+        return ContractCandidate.model_construct(**self.record(index))
+
+
+def _uniform_fields(rows: List[Any]) -> Dict[str, Sequence[Any]] | None:
+    """Transpose rows sharing one key set in a single C-level pass; ``None`` otherwise.
+
+    With one key set, each field resolves to its canonical key or alias once for the
+    whole payload, exactly as per-row lookups would.
+    """
+    keys = rows[0].keys() if rows and type(rows[0]) is dict else None
+    if keys is None or not all(type(row) is dict and row.keys() == keys for row in rows):
+        return None
+    present: Dict[str, str] = {}
+    for name in FIELD_NAMES:
+        key = name if name in keys else FIELD_ALIASES.get(name)
+        if key in keys:
+            present[name] = key
+    if len(present) < 2:
+        return None
+    transposed = zip(*map(itemgetter(*present.values()), rows), strict=True)
+    values = {name: (FIELD_DEFAULTS[name],) * len(rows) for name in FIELD_NAMES}
+    values.update(zip(present, transposed, strict=True))
+    return values
+
+
+def _pluck(rows: Sequence[Mapping[str, Any]], name: str) -> List[Any]:
+    default, alias = FIELD_DEFAULTS[name], FIELD_ALIASES.get(name)
+    if alias is None:
+        return [row.get(name, default) for row in rows]
+    return [row.get(name, row.get(alias, default)) for row in rows]
+
+
+def _coerce(
+    values: Sequence[Any], dtype: type, name: str, reasons: Dict[int, str]
+) -> np.ndarray:
+    """Convert a column like ``float()``/``int()`` would, recording rows that fail."""
+    try:
+        column = np.fromiter(values, dtype=dtype, count=len(values))
+    except (TypeError, ValueError, OverflowError):
+        column = None
+    if column is not None:
+        # fromiter reads None as NaN for floats, where float() refuses it.
+        if dtype is not np.float64 or all(
+            values[index] is not None for index in np.flatnonzero(np.isnan(column)).tolist()
+        ):
+            return column
+
+    convert = float if dtype is np.float64 else int
+    column = np.zeros(len(values), dtype=dtype)
+    for index, value in enumerate(values):
+        try:
+            column[index] = convert(value)
+        except (TypeError, ValueError, OverflowError):
+            reasons.setdefault(index, f"invalid {name}: {value!r}")
+    return column
+
+
+def days_to_expiry(expiries: np.ndarray, now: datetime) -> np.ndarray:
+    """Whole days to expiry, floored at 0; unparseable expiries get -1 (never eligible).
+
+    Chains repeat a handful of expiries, so each distinct string is parsed once.
+    """
+    days: Dict[Any, int] = {}
+    for expiry in set(expiries):
+        try:
+            days[expiry] = max(0, (datetime.fromisoformat(expiry) - now).days)
+        except (TypeError, ValueError):
+            days[expiry] = -1
+    return np.fromiter(map(days.__getitem__, expiries), dtype=np.int64, count=len(expiries))
+
+
+def risk_mask(chain: ChainColumns, risk: RiskProfile, dte: np.ndarray) -> np.ndarray:
+    delta, open_interest, spread = chain["delta"], chain["open_interest"], chain["spread_pct"]
+    if risk is RiskProfile.conservative:
+        return (
+            (0.2 <= delta) & (delta <= 0.4) & (30 <= dte) & (dte <= 60)
+            & (open_interest >= 1000) & (spread <= 0.005)
+        )
+    if risk is RiskProfile.neutral:
+        return (0.3 <= delta) & (delta <= 0.5) & (21 <= dte) & (dte <= 45) & (open_interest >= 500)
+    return (0.45 <= delta) & (delta <= 0.65) & (7 <= dte) & (dte <= 30) & (spread <= 0.015)
+
+
+def composite_scores(
+    chain: ChainColumns, dte: np.ndarray, richness: np.ndarray | None = None
+) -> np.ndarray:
+    """Per-contract score; surface ``richness`` replaces the fixed IV penalty where known."""
+    liquidity = chain["liquidity_score"] / 100
+    iv_penalty = np.clip(1 - (chain["implied_vol"] - 0.3), 0.2, 1.0)
+    if richness is not None:
+        # Fair vol scores 0.8; each 1% cheap adds 0.01 (up to 1.0), each 1% rich takes it away.
+        relative = np.clip(0.8 - richness, 0.2, 1.0)
+        iv_penalty = np.where(np.isnan(richness), iv_penalty, relative)
+    time_factor = 1 - np.abs(dte - 30) / 100
+    greeks = np.column_stack(
+        (chain["delta"], chain["gamma"], np.abs(chain["theta"]), chain["vega"])
+    )
+    # Row-wise dot through matmul hits the same ddot kernel as np.linalg.norm on a single
+    # 4-vector, keeping scores bit-identical to the scalar path.
+    greek_score = np.sqrt(np.matmul(greeks[:, None, :], greeks[:, :, None])[:, 0, 0]) / 4
+    return liquidity * 0.4 + iv_penalty * 0.2 + time_factor * 0.2 + greek_score * 0.2
+
+
+def top_k(scores: np.ndarray, eligible: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` best eligible rows, ordered like a stable descending sort."""
+    candidates = np.flatnonzero(eligible)
+    if len(candidates) > k:
+        values = scores[candidates]
+        threshold = values[np.argpartition(-values, k - 1)[k - 1]]
+        above = candidates[values > threshold]
+        ties = candidates[values == threshold][: k - len(above)]
+        candidates = np.concatenate((above, ties))
+    return candidates[np.lexsort((candidates, -scores[candidates]))]
+
+
+def screen_columns(
+    chain: ChainColumns, risk: RiskProfile, now: datetime, k: int = 5
+) -> Tuple[np.ndarray, int]:
+    """Return ``(winner indices, filtered count)`` in single vectorized passes."""
+    return screen_profiles(chain, [risk], now, k)[risk]
+
+
+def screen_profiles(
+    chain: ChainColumns,
+    risks: Iterable[RiskProfile],
+    now: datetime,
+    k: int = 5,
+    richness: np.ndarray | None = None,
+) -> Dict[RiskProfile, Tuple[np.ndarray, int]]:
+    """:func:`screen_columns` for several risk profiles sharing one expiry and score pass."""
+    dte = days_to_expiry(chain["expiry"], now)
+    scores = composite_scores(chain, dte, richness)
+    results: Dict[RiskProfile, Tuple[np.ndarray, int]] = {}
+    for risk in dict.fromkeys(risks):
+        eligible = risk_mask(chain, risk, dte)
+        results[risk] = (top_k(scores, eligible, k), int(eligible.sum()))
+    return results
+
+
+def reference_screen(
+    contracts: List[ContractCandidate], risk: RiskProfile, now: datetime, k: int = 5
+) -> Tuple[List[ContractCandidate], int]:
+    """The original per-contract path, kept as the parity oracle for tests and benchmarks."""
+
+    def dte(contract: ContractCandidate) -> int:
+        return max(0, (datetime.fromisoformat(contract.expiry) - now).days)
+
+    def passes(contract: ContractCandidate) -> bool:
+        days = dte(contract)
+        if risk is RiskProfile.conservative:
+            return (
+                0.2 <= contract.delta <= 0.4 and 30 <= days <= 60
+                and contract.open_interest >= 1000 and contract.spread_pct <= 0.005
+            )
+        if risk is RiskProfile.neutral:
+            return (
+                0.3 <= contract.delta <= 0.5 and 21 <= days <= 45
+                and contract.open_interest >= 500
+            )
+        return 0.45 <= contract.delta <= 0.65 and 7 <= days <= 30 and contract.spread_pct <= 0.015
+
+    def score(contract: ContractCandidate) -> float:
+        liquidity = contract.liquidity_score / 100
+        iv_penalty = max(0.2, min(1.0, 1 - (contract.implied_vol - 0.3)))
+        time_factor = 1 - abs(dte(contract) - 30) / 100
+        greeks_vector = np.array(
+            [contract.delta, contract.gamma, abs(contract.theta), contract.vega]
+        )
+        greek_score = float(np.linalg.norm(greeks_vector) / 4)
+        return liquidity * 0.4 + iv_penalty * 0.2 + time_factor * 0.2 + greek_score * 0.2
+
+    filtered = [c for c in contracts if passes(c)]
+    return sorted(filtered, key=score, reverse=True)[:k], len(filtered)
+
+
+def reference_normalize(raw: Dict[str, Any]) -> Dict[str, Any] | None:
+    """The original per-row normalization, kept as the parity oracle for :meth:`from_payload`.
+
+    Rows it accepts but :class:`ContractCandidate` would refuse (liquidity outside 0-100)
+    were skipped by the caller.
+    """
+    try:
+        return {
+            "symbol": str(raw.get("symbol")),
+            "delta": float(raw.get("delta", 0.0)),
+            "gamma": float(raw.get("gamma", 0.0)),
+            "theta": float(raw.get("theta", 0.0)),
+            "vega": float(raw.get("vega", 0.0)),
+            "implied_vol": float(raw.get("implied_vol", raw.get("iv", 0.0))),
+            "open_interest": int(raw.get("open_interest", raw.get("oi", 0))),
+            "volume": int(raw.get("volume", 0)),
+            "bid": float(raw.get("bid", 0.0)),
+            "ask": float(raw.get("ask", 0.0)),
+            "mid": float(
+                raw.get("mid", (float(raw.get("bid", 0.0)) + float(raw.get("ask", 0.0))) / 2 or 0)
+            ),
+            "spread_pct": float(raw.get("spread_pct", raw.get("spread_percent", 0.0))),
+            "liquidity_score": int(raw.get("liquidity_score", 0)),
+            "expiry": str(raw.get("expiry")),
+            "strike": float(raw.get("strike", 0.0)),
+        }
+    except (TypeError, ValueError):
+        return None
@@ -1,103 +1,223 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import AsyncIterator, Dict, Hashable, List, Tuple
 
 import numpy as np
 
+from .cache import TTLCache
 from .clients.market_data import MarketDataClient, build_market_data_client
-from .schemas import ContractCandidate, RiskProfile, ScreeningRequest, ScreeningResponse
+from .executor import ExecutorBusy, ScoringExecutor
+from .greeks import GreeksEngine
+from .schemas import (
+    ContractCandidate,
+    ScreeningError,
+    ScreeningRequest,
+    ScreeningResponse,
+    SVISliceParams,
+    VolSurfaceResponse,
+)
+from .screening import ChainColumns
+from .surface import SurfaceEngine, VolSurface
+
+MAX_REPORTED_REJECTS = 20
+
+logger = logging.getLogger(__name__)
 
 
 class OptionAnalyticsService:
-    def __init__(self, market_data_client: MarketDataClient | None = None) -> None:
+    def __init__(
+        self,
+        market_data_client: MarketDataClient | None = None,
+        batch_concurrency: int = 8,
+        result_cache: TTLCache | None = None,
+        chain_cache: TTLCache | None = None,
+        greeks: GreeksEngine | None = None,
+        surfaces: SurfaceEngine | None = None,
+        executor: ScoringExecutor | None = None,
+    ) -> None:
         self.market_data = market_data_client or build_market_data_client()
+        self.batch_concurrency = batch_concurrency
+        # Results are keyed on the chain version, so the TTL only bounds staleness of
+        # time- and spot-dependent fields (days to expiry, computed Greeks), never of the
+        # chain itself.
+        self.result_cache = result_cache or TTLCache(max_entries=4096, ttl_seconds=5.0)
+        self.chain_cache = chain_cache or TTLCache(max_entries=512, ttl_seconds=300.0)
+        self.greeks = greeks or GreeksEngine(
+            rate=0.045, cache=TTLCache(max_entries=2048, ttl_seconds=60.0)
+        )
+        self.surfaces = surfaces or SurfaceEngine(
+            cache=TTLCache(max_entries=512, ttl_seconds=900.0)
+        )
+        self.executor = executor or ScoringExecutor()
+
+    async def screen(
+        self, request: ScreeningRequest, bypass_cache: bool = False
+    ) -> ScreeningResponse:
+        chain, version = await self._load_chain(request.symbol, bypass_cache)
+        return (await self._screen_chain([request], chain, version, bypass_cache))[0]
+
+    async def screen_batch(
+        self, requests: List[ScreeningRequest], bypass_cache: bool = False
+    ) -> AsyncIterator[ScreeningResponse | ScreeningError]:
+        """Yield responses symbol by symbol as each chain finishes, in completion order.
+
+        Requests are grouped by symbol so a chain is fetched, normalized and scored once
+        however many risk profiles ask for it; at most ``batch_concurrency`` chains are
+        fetched and scored at a time. A symbol that fails yields one
+        :class:`ScreeningError` in place of its responses and the others carry on: by then
+        the stream's status has been sent, so the failure cannot be an HTTP error.
+        """
+        groups: Dict[str, List[ScreeningRequest]] = defaultdict(list)
+        for request in requests:
+            groups[request.symbol.upper()].append(request)
+        gate = asyncio.Semaphore(self.batch_concurrency)
 
-    async def screen(self, request: ScreeningRequest) -> ScreeningResponse:
-        chain = await self._load_chain(request.symbol)
-        filtered = [c for c in chain if self._passes_risk_filters(c, request.risk_profile)]
-        ranked = sorted(filtered, key=self._score_contract, reverse=True)[:5]
+        async def screen_group(symbol: str, group: List[ScreeningRequest]):
+            try:
+                async with gate:
+                    chain, version = await self._load_chain(symbol, bypass_cache)
+                    return await self._screen_chain(group, chain, version, bypass_cache)
+            except ExecutorBusy as exc:
+                return [ScreeningError(symbol=symbol, error=str(exc), retry_after=1)]
+            except Exception as exc:
+                logger.exception("screening %s failed", symbol)
+                return [ScreeningError(symbol=symbol, error=f"{type(exc).__name__}: {exc}")]
 
+        tasks = [asyncio.ensure_future(screen_group(s, g)) for s, g in groups.items()]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                for response in await finished:
+                    yield response
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _screen_chain(
+        self,
+        requests: List[ScreeningRequest],
+        chain: ChainColumns,
+        version: str | None,
+        bypass_cache: bool,
+    ) -> List[ScreeningResponse]:
+        """Serve cached results for this chain version and score the rest in one pass."""
+        cacheable = version is not None and not bypass_cache
+        keys = [_result_key(r, version) if cacheable else None for r in requests]
+        responses = [self.result_cache.get(key) if key else None for key in keys]
+        pending = [r.risk_profile for r, hit in zip(requests, responses, strict=True) if not hit]
+        if not pending:
+            return responses
+
+        now = datetime.utcnow()
+        symbol = requests[0].symbol.upper()
+        surface = await self.executor.run(len(chain), self.surfaces.fit, chain, symbol, now)
+        results = await self.executor.screen(chain, pending, now, surface)
+        for position, (request, key) in enumerate(zip(requests, keys, strict=True)):
+            if responses[position] is None:
+                winners, filtered = results[request.risk_profile]
+                response = self._response(request, chain, now, winners, filtered, surface)
+                if key:
+                    self.result_cache.put(key, response)
+                responses[position] = response
+        return responses
+
+    def _response(
+        self,
+        request: ScreeningRequest,
+        chain: ChainColumns,
+        now: datetime,
+        winners: np.ndarray,
+        filtered: int,
+        surface: VolSurface | None = None,
+    ) -> ScreeningResponse:
         diagnostics = {
             "universe": len(chain),
-            "filtered": len(filtered),
+            "filtered": filtered,
             "risk_profile": request.risk_profile,
+            "rejected": len(chain.rejects),
         }
+        if surface is not None:
+            diagnostics["surface_slices"] = len(surface.slices)
+        if chain.rejects:
+            diagnostics["rejects"] = list(chain.rejects[:MAX_REPORTED_REJECTS])
 
         return ScreeningResponse(
             symbol=request.symbol,
-            timestamp=datetime.utcnow().isoformat(),
-            candidates=ranked,
+            timestamp=now.isoformat(),
+            candidates=[chain.candidate(index) for index in winners],
             diagnostics=diagnostics,
         )
 
-    async def _load_chain(self, symbol: str) -> List[ContractCandidate]:
-        snapshot = await self._fetch_live_chain(symbol)
-        if snapshot:
-            return snapshot
-        return self._mock_chain(symbol)
+    async def surface(self, symbol: str, bypass_cache: bool = False) -> VolSurfaceResponse:
+        chain, _ = await self._load_chain(symbol, bypass_cache)
+        now = datetime.utcnow()
+        surface = await self.executor.run(
+            len(chain), self.surfaces.fit, chain, symbol.upper(), now
+        )
+        return VolSurfaceResponse(
+            symbol=symbol,
+            timestamp=now.isoformat(),
+            slices=[SVISliceParams(**s.as_dict()) for s in surface.slices] if surface else [],
+        )
+
+    async def _load_chain(
+        self, symbol: str, bypass_cache: bool = False
+    ) -> Tuple[ChainColumns, str | None]:
+        """Return the chain and its version (market-data ETag).
+
+        A chain the ETag says is unchanged is reused without being transferred or
+        normalized again; synthetic chains are versioned by date.
+        """
+        cached = None if bypass_cache else self.chain_cache.get(symbol)
+        chain, version = await self._fetch_live_chain(symbol, cached and cached[0])
+        if chain is None and cached is not None and version == cached[0]:
+            return await self._with_greeks(symbol, cached[1]), version
+        if chain is not None and len(chain):
+            if version:
+                self.chain_cache.put(symbol, (version, chain))
+            return await self._with_greeks(symbol, chain), version
+        mock = ChainColumns.from_records([c.model_dump() for c in self._mock_chain(symbol)])
+        return mock, f"synthetic:{datetime.utcnow().date().isoformat()}"
 
-    async def _fetch_live_chain(self, symbol: str) -> List[ContractCandidate]:
+    async def _with_greeks(self, symbol: str, chain: ChainColumns) -> ChainColumns:
+        """Fill in IV/Greeks the chain arrived without, priced off the live spot."""
+        if not self.greeks.needs_enrichment(chain):
+            return chain
+        try:
+            spot = await self.market_data.fetch_spot(symbol)
+        except Exception:
+            return chain
+        if not spot:
+            return chain
+        return await self.executor.run(
+            len(chain), self.greeks.enrich, chain, symbol.upper(), spot, datetime.utcnow()
+        )
+
+    async def _fetch_live_chain(
+        self, symbol: str, etag: str | None = None
+    ) -> Tuple[ChainColumns | None, str | None]:
+        """``(chain, etag)``; chain is ``None`` when ``etag`` is still current or on failure."""
         if not self.market_data:
-            return []
+            return None, None
         try:
-            payload = await self.market_data.fetch_chain(symbol)
+            payload, version = await self.market_data.fetch_chain_if_changed(symbol, etag)
         except Exception:
-            return []
-        if not payload:
-            return []
+            return None, None
+        if payload is None:
+            return None, version if etag and version == etag else None
         contracts_payload = payload.get("contracts") or payload.get("candidates")
         if not contracts_payload:
-            return []
-        contracts: List[ContractCandidate] = []
-        for raw in contracts_payload:
-            normalized = self._normalize_contract(raw)
-            if normalized is None:
-                continue
-            contracts.append(ContractCandidate(**normalized))
-        return contracts
-
-    def _normalize_contract(self, raw: Dict[str, object]) -> Dict[str, object] | None:
-        try:
-            return {
-                "symbol": str(raw.get("symbol")),
-                "delta": float(raw.get("delta", 0.0)),
-                "gamma": float(raw.get("gamma", 0.0)),
-                "theta": float(raw.get("theta", 0.0)),
-                "vega": float(raw.get("vega", 0.0)),
-                "implied_vol": float(raw.get("implied_vol", raw.get("iv", 0.0))),
-                "open_interest": int(raw.get("open_interest", raw.get("oi", 0))),
-                "volume": int(raw.get("volume", 0)),
-                "bid": float(raw.get("bid", 0.0)),
-                "ask": float(raw.get("ask", 0.0)),
-                "mid": float(raw.get("mid", (float(raw.get("bid", 0.0)) + float(raw.get("ask", 0.0))) / 2 or 0)),
-                "spread_pct": float(raw.get("spread_pct", raw.get("spread_percent", 0.0))),
-                "liquidity_score": int(raw.get("liquidity_score", 0)),
-                "expiry": str(raw.get("expiry")),
-                "strike": float(raw.get("strike", 0.0)),
-            }
-        except (TypeError, ValueError):
-            return None
-
-    def _passes_risk_filters(self, contract: ContractCandidate, risk: RiskProfile) -> bool:
-        dte = self._dte(contract)
-        if risk is RiskProfile.conservative:
-            return 0.2 <= contract.delta <= 0.4 and 30 <= dte <= 60 and contract.open_interest >= 1000 and contract.spread_pct <= 0.005
-        if risk is RiskProfile.neutral:
-            return 0.3 <= contract.delta <= 0.5 and 21 <= dte <= 45 and contract.open_interest >= 500
-        return 0.45 <= contract.delta <= 0.65 and 7 <= dte <= 30 and contract.spread_pct <= 0.015
-
-    def _score_contract(self, contract: ContractCandidate) -> float:
-        liquidity = contract.liquidity_score / 100
-        iv_penalty = max(0.2, min(1.0, 1 - (contract.implied_vol - 0.3)))
-        time_factor = 1 - abs(self._dte(contract) - 30) / 100
-        greeks_vector = np.array([contract.delta, contract.gamma, abs(contract.theta), contract.vega])
-        greek_score = float(np.linalg.norm(greeks_vector) / 4)
-        return liquidity * 0.4 + iv_penalty * 0.2 + time_factor * 0.2 + greek_score * 0.2
-
-    def _dte(self, contract: ContractCandidate) -> int:
-        expiry = datetime.fromisoformat(contract.expiry)
-        return max(0, (expiry - datetime.utcnow()).days)
+            return None, None
+        chain = await self.executor.run(
+            len(contracts_payload), ChainColumns.from_payload, contracts_payload
+        )
+        return chain, version
 
     def _mock_chain(self, symbol: str) -> List[ContractCandidate]:
         base = 150
@@ -128,5 +248,42 @@ class OptionAnalyticsService:
         return contracts
 
 
+def _result_key(request: ScreeningRequest, version: str) -> Tuple[Hashable, ...]:
+    constraints = json.dumps(request.constraints, sort_keys=True, default=str)
+    digest = hashlib.blake2b(constraints.encode(), digest_size=8).hexdigest()
+    return request.symbol, request.risk_profile, digest, version
+
+
 def build_service() -> OptionAnalyticsService:
-    return OptionAnalyticsService()
+    return OptionAnalyticsService(
+        batch_concurrency=int(os.getenv("SCREEN_BATCH_CONCURRENCY", "8")),
+        result_cache=TTLCache(
+            max_entries=int(os.getenv("SCREEN_CACHE_MAX_ENTRIES", "4096")),
+            ttl_seconds=float(os.getenv("SCREEN_CACHE_TTL_SECONDS", "5")),
+        ),
+        chain_cache=TTLCache(
+            max_entries=int(os.getenv("SCREEN_CHAIN_CACHE_MAX_ENTRIES", "512")),
+            ttl_seconds=float(os.getenv("SCREEN_CHAIN_CACHE_TTL_SECONDS", "300")),
+        ),
+        greeks=GreeksEngine(
+            rate=float(os.getenv("RISK_FREE_RATE", "0.045")),
+            cache=TTLCache(
+                max_entries=int(os.getenv("GREEKS_CACHE_MAX_ENTRIES", "2048")),
+                ttl_seconds=float(os.getenv("GREEKS_CACHE_TTL_SECONDS", "60")),
+            ),
+        ),
+        surfaces=SurfaceEngine(
+            cache=TTLCache(
+                max_entries=int(os.getenv("SURFACE_CACHE_MAX_ENTRIES", "512")),
+                ttl_seconds=float(os.getenv("SURFACE_CACHE_TTL_SECONDS", "900")),
+            ),
+            refit_tolerance=float(os.getenv("SURFACE_REFIT_TOLERANCE", "0.002")),
+        ),
+        executor=ScoringExecutor(
+            kind=os.getenv("SCREEN_EXECUTOR", "thread").lower(),
+            workers=int(os.getenv("SCREEN_EXECUTOR_WORKERS", str(min(4, os.cpu_count() or 1)))),
+            max_in_flight=int(os.getenv("SCREEN_EXECUTOR_MAX_IN_FLIGHT", "8")),
+            admission_timeout=float(os.getenv("SCREEN_EXECUTOR_ADMISSION_TIMEOUT_SECONDS", "5")),
+            offload_min_contracts=int(os.getenv("SCREEN_EXECUTOR_MIN_CONTRACTS", "2000")),
+        ),
+    )
@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Dict, Tuple
+
+import numpy as np
+from scipy.optimize import minimize
+
+from .cache import TTLCache
+from .greeks import years_to_expiry
+from .screening import ChainColumns
+
+MIN_SLICE_POINTS = 5
+MIN_SIGMA, MAX_SIGMA = 1e-3, 2.0
+
+
+@dataclass(frozen=True)
+class SVISlice:
+    """One expiry's smile in raw SVI form: total variance
+    ``w(k) = a + b * (rho * (k - m) + sqrt((k - m)**2 + sigma**2))``.
+
+    ``k`` is ``log(strike / reference)``. SVI is translation-invariant in ``k`` (a shift
+    only moves ``m``), so the reference is just the slice's median strike at its first
+    fit, kept across refits so warm starts stay comparable.
+    """
+
+    expiry: str
+    years: float
+    reference: float
+    a: float
+    b: float
+    rho: float
+    m: float
+    sigma: float
+    rmse: float
+    points: int
+
+    def total_variance(self, strikes: np.ndarray) -> np.ndarray:
+        shifted = np.log(np.asarray(strikes, dtype=np.float64) / self.reference) - self.m
+        return self.a + self.b * (self.rho * shifted + np.sqrt(shifted**2 + self.sigma**2))
+
+    def implied_vol(self, strikes: np.ndarray) -> np.ndarray:
+        with np.errstate(invalid="ignore"):
+            return np.sqrt(np.maximum(self.total_variance(strikes), 0) / self.years)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class VolSurface:
+    """Fitted SVI slices for one underlying, ordered by time to expiry."""
+
+    underlying: str
+    slices: Tuple[SVISlice, ...]
+
+    def implied_vol(self, expiries: np.ndarray, strikes: np.ndarray, now: datetime) -> np.ndarray:
+        """Surface vol per contract; NaN where there is nothing to look up.
+
+        Fitted expiries read their own slice. Others interpolate total variance linearly
+        in time between the neighbouring slices at the same strike, and hold the nearest
+        slice's vol outside the fitted range.
+        """
+        strikes = np.asarray(strikes, dtype=np.float64)
+        years = years_to_expiry(expiries, now)
+        result = np.full(len(strikes), np.nan)
+        if not self.slices:
+            return result
+        by_expiry = {s.expiry: s for s in self.slices}
+        fitted_years = np.array([s.years for s in self.slices])
+        variances = np.vstack([s.total_variance(strikes) for s in self.slices])
+        for expiry in set(expiries):
+            rows = np.flatnonzero(expiries == expiry)
+            slice_ = by_expiry.get(expiry)
+            if slice_ is not None:
+                result[rows] = slice_.implied_vol(strikes[rows])
+                continue
+            t = years[rows[0]]
+            if not t > 0:
+                continue
+            upper = int(np.searchsorted(fitted_years, t))
+            if upper == 0 or upper == len(fitted_years):
+                nearest = self.slices[min(upper, len(fitted_years) - 1)]
+                result[rows] = nearest.implied_vol(strikes[rows])
+                continue
+            t0, t1 = fitted_years[upper - 1], fitted_years[upper]
+            weight = (t - t0) / (t1 - t0)
+            variance = (1 - weight) * variances[upper - 1, rows] + weight * variances[upper, rows]
+            result[rows] = np.sqrt(np.maximum(variance, 0) / t)
+        return result
+
+    def richness(self, chain: ChainColumns, now: datetime) -> np.ndarray:
+        """``(iv - surface iv) / surface iv`` per contract: >0 rich, <0 cheap, NaN unknown."""
+        fair = self.implied_vol(chain["expiry"], chain["strike"], now)
+        iv = chain["implied_vol"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where((iv > 0) & (fair > 0), (iv - fair) / fair, np.nan)
+
+
+@dataclass
+class SurfaceStats:
+    cold_fits: int = 0
+    warm_fits: int = 0
+    kept: int = 0
+    unchanged: int = 0
+    fit_seconds: float = 0.0
+
+
+class SurfaceEngine:
+    """Fits and caches an SVI surface per underlying, refitting only what moved.
+
+    Slices are cached per underlying with a digest of their quotes. On a new chain a
+    slice whose quotes are unchanged is reused as is; one whose current parameters still
+    fit the new quotes within ``refit_tolerance`` (vol units) keeps them; anything else is
+    refit, warm-started from the previous parameters when there are any.
+    """
+
+    def __init__(self, cache: TTLCache, refit_tolerance: float = 0.002) -> None:
+        self.cache = cache
+        self.refit_tolerance = refit_tolerance
+        self._stats = SurfaceStats()
+
+    def fit(self, chain: ChainColumns, underlying: str, now: datetime) -> VolSurface | None:
+        """The chain's surface, or ``None`` when no expiry has enough quotes to fit."""
+        iv, strike = chain["implied_vol"], chain["strike"]
+        quoted = np.flatnonzero((iv > 0) & (strike > 0) & np.isfinite(iv))
+        if len(quoted) < MIN_SLICE_POINTS:
+            return None
+        expiries = chain["expiry"][quoted]
+        years = years_to_expiry(expiries, now)
+        previous: Dict[str, Tuple[bytes, SVISlice]] = self.cache.get(underlying) or {}
+        current: Dict[str, Tuple[bytes, SVISlice]] = {}
+        for expiry in set(expiries):
+            rows = quoted[expiries == expiry]
+            t = years[np.searchsorted(quoted, rows[0])]
+            if len(rows) < MIN_SLICE_POINTS or not t > 0:
+                continue
+            strikes, vols = strike[rows], iv[rows]
+            digest = hashlib.blake2b(strikes.tobytes() + vols.tobytes(), digest_size=16).digest()
+            cached = previous.get(expiry)
+            current[expiry] = (digest, self._fit_slice(expiry, t, strikes, vols, digest, cached))
+        if not current:
+            return None
+        self.cache.put(underlying, current)
+        slices = sorted((s for _, s in current.values()), key=lambda s: s.years)
+        return VolSurface(underlying, tuple(slices))
+
+    def stats(self) -> Dict[str, Any]:
+        return {**asdict(self._stats), "cache": self.cache.stats()}
+
+    def _fit_slice(
+        self,
+        expiry: str,
+        years: float,
+        strikes: np.ndarray,
+        vols: np.ndarray,
+        digest: bytes,
+        cached: Tuple[bytes, SVISlice] | None,
+    ) -> SVISlice:
+        if cached is not None and cached[0] == digest:
+            self._stats.unchanged += 1
+            return cached[1]
+        start = None
+        if cached is not None:
+            previous = cached[1]
+            drift = _rmse(previous.implied_vol(strikes), vols)
+            if drift <= previous.rmse + self.refit_tolerance:
+                self._stats.kept += 1
+                return previous
+            start = (previous.m, previous.sigma)
+
+        started = time.perf_counter()
+        reference = cached[1].reference if cached is not None else float(np.median(strikes))
+        fitted = fit_svi(expiry, years, reference, strikes, vols, start)
+        self._stats.fit_seconds += time.perf_counter() - started
+        if start is None:
+            self._stats.cold_fits += 1
+        else:
+            self._stats.warm_fits += 1
+        return fitted
+
+
+def fit_svi(
+    expiry: str,
+    years: float,
+    reference: float,
+    strikes: np.ndarray,
+    vols: np.ndarray,
+    start: Tuple[float, float] | None = None,
+) -> SVISlice:
+    """Least-squares raw SVI fit of one slice's total variance.
+
+    Uses the quasi-explicit reduction: for fixed ``(m, sigma)`` the remaining parameters
+    enter linearly and come from a 3x3 solve, so the optimizer only searches two
+    dimensions. ``start`` is a previous ``(m, sigma)`` to warm-start from.
+    """
+    k = np.log(strikes / reference)
+    w = vols * vols * years
+    if start is None:
+        x0, step = np.array([k[np.argmin(w)], np.log(0.1)]), np.array([0.1, 0.5])
+    else:
+        # A warm start is already close, so a tight simplex saves most of the evaluations.
+        x0, step = np.array([start[0], np.log(start[1])]), np.array([0.01, 0.05])
+
+    def objective(x: np.ndarray) -> float:
+        return _inner_fit(k, w, x[0], _sigma(x[1]))[1]
+
+    result = minimize(
+        objective,
+        x0,
+        method="Nelder-Mead",
+        options={
+            "initial_simplex": np.vstack((x0, x0 + step * [1, 0], x0 + step * [0, 1])),
+            "xatol": 1e-4,
+            "fatol": 1e-10,
+            "maxiter": 400,
+        },
+    )
+    m, sigma = float(result.x[0]), _sigma(result.x[1])
+    (a, d, c), _ = _inner_fit(k, w, m, sigma)
+    fitted = SVISlice(
+        expiry=expiry,
+        years=years,
+        reference=reference,
+        a=a,
+        b=c / sigma,
+        rho=d / c if c > 0 else 0.0,
+        m=m,
+        sigma=sigma,
+        rmse=0.0,
+        points=len(k),
+    )
+    return SVISlice(**{**asdict(fitted), "rmse": _rmse(fitted.implied_vol(strikes), vols)})
+
+
+def _inner_fit(
+    k: np.ndarray, w: np.ndarray, m: float, sigma: float
+) -> Tuple[Tuple[float, float, float], float]:
+    """Best ``(a, d, c)`` for ``w ~ a + d*y + c*sqrt(y**2 + 1)``, ``y = (k - m) / sigma``,
+    within the no-arbitrage box ``0 <= |d| <= c`` and ``a >= -sqrt(c**2 - d**2)`` (non-negative
+    minimum variance); returns the parameters and the sum of squared errors."""
+    y = (k - m) / sigma
+    z = np.sqrt(y * y + 1)
+    n, sy, sz, syy, syz = len(y), y.sum(), z.sum(), y @ y, y @ z
+    normal = np.array([[n, sy, sz], [sy, syy, syz], [sz, syz, syy + n]])
+    try:
+        a, d, c = np.linalg.solve(normal, np.array([w.sum(), y @ w, z @ w])).tolist()
+    except np.linalg.LinAlgError:
+        a, d, c = float(w.mean()), 0.0, 0.0
+    c = max(c, 0.0)
+    d = float(np.clip(d, -c, c))
+    a = max(float(np.mean(w - d * y - c * z)), -np.sqrt(c * c - d * d))
+    residual = a + d * y + c * z - w
+    return (a, d, c), float(residual @ residual)
+
+
+def _sigma(log_sigma: float) -> float:
+    return float(np.clip(np.exp(log_sigma), MIN_SIGMA, MAX_SIGMA))
+
+
+def _rmse(fitted: np.ndarray, observed: np.ndarray) -> float:
+    return float(np.sqrt(np.mean((fitted - observed) ** 2)))
+
@@ -0,0 +1,159 @@
+"""Loop responsiveness while a large batch screen runs, per scoring executor.
+
+Usage: ``python benchmarks/executor_load.py [--symbols 100] [--contracts 5000]``
+
+Drives the FastAPI app in-process (one event loop, as in a uvicorn worker) with a stub
+market-data client serving ``--contracts``-contract chains. While ``POST /screen:batch``
+screens ``--symbols`` symbols under every risk profile, probes hit ``GET /healthz`` and
+``POST /screen`` for a small chain; their latency percentiles show how long the loop
+was blocked by chain work.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import pathlib
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import httpx  # noqa: E402
+import numpy as np  # noqa: E402
+
+from app import main as api  # noqa: E402
+from app.cache import TTLCache  # noqa: E402
+from app.executor import ScoringExecutor  # noqa: E402
+from app.greeks import GreeksEngine  # noqa: E402
+from app.service import OptionAnalyticsService  # noqa: E402
+from app.surface import SurfaceEngine  # noqa: E402
+
+SMALL = "SMALL"
+
+
+def contracts(size: int, seed: int = 3) -> List[Dict]:
+    rng = np.random.default_rng(seed)
+    now = datetime.utcnow()
+    expiries = [(now + timedelta(days=d)).date().isoformat() for d in (10, 24, 38, 52)]
+    strike = 100 * np.exp(rng.uniform(-0.3, 0.3, size))
+    iv = 0.2 + 0.5 * np.log(strike / 100) ** 2
+    return [
+        {
+            "symbol": f"X {expiries[i % 4]} {strike[i]:.1f}C",
+            "delta": float(rng.uniform(0.1, 0.7)),
+            "gamma": 0.02,
+            "theta": -0.03,
+            "vega": 0.12,
+            "implied_vol": float(iv[i]),
+            "open_interest": int(rng.integers(0, 3000)),
+            "volume": 100,
+            "bid": 1.0,
+            "ask": 1.02,
+            "spread_pct": float(rng.uniform(0, 0.02)),
+            "liquidity_score": int(rng.integers(0, 101)),
+            "expiry": expiries[i % 4],
+            "strike": float(strike[i]),
+        }
+        for i in range(size)
+    ]
+
+
+class StubMarketData:
+    """Serves the big chain for every symbol but SMALL, each under its own ETag."""
+
+    def __init__(self, size: int) -> None:
+        self.big = {"contracts": contracts(size)}
+        self.small = {"contracts": contracts(50)}
+
+    async def start(self) -> None:
+        pass
+
+    async def aclose(self) -> None:
+        pass
+
+    async def fetch_chain_if_changed(self, symbol, etag):
+        await asyncio.sleep(0.002)
+        return (self.small if symbol.upper() == SMALL else self.big), f'"{symbol}"'
+
+    async def fetch_spot(self, symbol):
+        return None
+
+    def stats(self):
+        return {}
+
+
+def percentiles(samples: List[float]) -> str:
+    if not samples:
+        return "no samples"
+    p50, p99 = np.percentile(samples, [50, 99]) * 1e3
+    return f"p50={p50:6.1f}ms p99={p99:6.1f}ms max={max(samples) * 1e3:6.1f}ms n={len(samples)}"
+
+
+async def run(kind: str, symbols: int, size: int, workers: int) -> None:
+    api.service = OptionAnalyticsService(
+        StubMarketData(size),
+        result_cache=TTLCache(max_entries=0, ttl_seconds=0),
+        greeks=GreeksEngine(0.045, TTLCache(max_entries=0, ttl_seconds=0)),
+        surfaces=SurfaceEngine(TTLCache(max_entries=4096, ttl_seconds=600)),
+        executor=ScoringExecutor(kind, workers=workers, max_in_flight=2 * workers),
+    )
+    await api.service.executor.start()
+    transport = httpx.ASGITransport(app=api.app)
+    batch = {
+        "requests": [
+            {"symbol": f"S{i:03d}", "risk_profile": risk, "capital_usd": 5000}
+            for i in range(symbols)
+            for risk in ("conservative", "neutral", "aggressive")
+        ]
+    }
+    small = {"symbol": SMALL, "risk_profile": "neutral", "capital_usd": 5000}
+    health: List[float] = []
+    screens: List[float] = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://app", timeout=120) as client:
+        await client.post("/screen", json=small)
+
+        async def probe(method: str, path: str, body, samples: List[float], every: float):
+            # Latency runs from when each probe was due, so time spent waiting for a
+            # blocked loop to even send it counts too.
+            due = time.perf_counter()
+            while True:
+                await asyncio.sleep(max(0.0, due - time.perf_counter()))
+                response = await client.request(method, path, json=body)
+                response.raise_for_status()
+                samples.append(time.perf_counter() - due)
+                due += every
+
+        probes = [
+            asyncio.ensure_future(probe("GET", "/healthz", None, health, 0.02)),
+            asyncio.ensure_future(probe("POST", "/screen", small, screens, 0.05)),
+        ]
+        start = time.perf_counter()
+        response = await client.post("/screen:batch", json=batch)
+        elapsed = time.perf_counter() - start
+        for task in probes:
+            task.cancel()
+        await asyncio.gather(*probes, return_exceptions=True)
+    await api.service.executor.aclose()
+    lines = response.text.count("\n")
+    print(f"{kind:>7}: batch {lines} responses in {elapsed:5.2f}s")
+    print(f"         /healthz      {percentiles(health)}")
+    print(f"         small /screen {percentiles(screens)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=100)
+    parser.add_argument("--contracts", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--kinds", nargs="+", default=["inline", "thread", "process"])
+    args = parser.parse_args()
+    for kind in args.kinds:
+        asyncio.run(run(kind, args.symbols, args.contracts, args.workers))
+
+
+if __name__ == "__main__":
+    main()
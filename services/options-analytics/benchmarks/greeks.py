@@ -0,0 +1,113 @@
+"""IV solve and Greeks for chains that arrive without them.
+
+Usage: ``python benchmarks/greeks.py [--sizes 5000 50000]``
+
+"iv" is the vectorized solver alone, "greeks" the batch Greeks, and "enrich cold/warm"
+the full ``GreeksEngine.enrich`` pass on a chain with every IV and Greek missing:
+without and with its per-expiry cache populated.
+"""
+from __future__ import annotations
+
+import argparse
+import pathlib
+import sys
+import time
+from datetime import datetime, timedelta
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+
+from app.cache import TTLCache  # noqa: E402
+from app.greeks import (  # noqa: E402
+    GreeksEngine,
+    bs_greeks,
+    bs_price,
+    implied_vol,
+    option_types,
+    years_to_expiry,
+)
+from app.screening import ChainColumns  # noqa: E402
+
+NOW = datetime(2025, 1, 2, 15, 30)
+SPOT, RATE = 450.0, 0.045
+
+
+def bare_chain(size: int, seed: int = 11):
+    """Chain rows with mids priced off a smile, and no IV or Greeks."""
+    rng = np.random.default_rng(seed)
+    expiries = [(NOW + timedelta(days=d)).date().isoformat() for d in (1, 3, 8, 15, 29, 45, 73,
+                                                                       108, 164, 255, 346, 710)]
+    expiry = np.array([expiries[i % len(expiries)] for i in range(size)], dtype=object)
+    strike = np.round(SPOT * rng.uniform(0.6, 1.4, size))
+    is_call = rng.random(size) < 0.5
+    years = years_to_expiry(expiry, NOW)
+    vol = 0.18 + 0.6 * np.log(strike / SPOT) ** 2 / np.sqrt(years)
+    mid = bs_price(np.full(size, SPOT), strike, years, RATE, vol, is_call)
+    rows = [
+        {
+            "symbol": f"SPY {expiry[i]} {strike[i]:g}{'C' if is_call[i] else 'P'}",
+            "strike": float(strike[i]),
+            "mid": float(mid[i]),
+            "expiry": expiry[i],
+            "liquidity_score": 50,
+        }
+        for i in range(size)
+    ]
+    return rows, vol
+
+
+def best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5_000, 50_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        rows, vol = bare_chain(size)
+        chain = ChainColumns.from_payload(rows)
+        is_call, _ = option_types(chain["symbol"])
+        years = years_to_expiry(chain["expiry"], NOW)
+        spot = np.full(size, SPOT)
+
+        def solve(chain=chain, spot=spot, years=years, is_call=is_call):
+            return implied_vol(chain["mid"], spot, chain["strike"], years, RATE, is_call)
+
+        def greeks(chain=chain, spot=spot, years=years, is_call=is_call, vol=vol):
+            return bs_greeks(spot, chain["strike"], years, RATE, vol, is_call)
+
+        def cold(chain=chain):
+            engine = GreeksEngine(RATE, TTLCache(max_entries=64, ttl_seconds=60))
+            return engine.enrich(chain, "SPY", SPOT, NOW)
+
+        warm_engine = GreeksEngine(RATE, TTLCache(max_entries=64, ttl_seconds=60))
+        warm_engine.enrich(chain, "SPY", SPOT, NOW)
+
+        def warm(chain=chain, engine=warm_engine):
+            return engine.enrich(chain, "SPY", SPOT, NOW)
+
+        solved = solve()
+        finite = np.isfinite(solved)
+        error = np.abs(solved - vol)[finite].max()
+        print(
+            f"{size:>7,} contracts: iv={best_of(solve, args.repeat) * 1e3:7.2f}ms "
+            f"greeks={best_of(greeks, args.repeat) * 1e3:6.2f}ms "
+            f"enrich cold={best_of(cold, args.repeat) * 1e3:7.2f}ms "
+            f"warm={best_of(warm, args.repeat) * 1e3:6.2f}ms  "
+            f"solved={finite.mean():.2%} max|iv err|={error:.1e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Per-call vs pooled market-data client against a local keep-alive stub server.
+
+Usage: ``python benchmarks/market_data_client.py [--requests 2000] [--concurrency 20]``
+
+"per-call" is the original behaviour: a fresh ``httpx.AsyncClient`` (and TCP connection)
+for every request. "pooled" is :class:`MarketDataClient` with its shared pool. The stub
+counts accepted TCP connections, so reuse is measured on the server side.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import pathlib
+import sys
+import time
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import httpx  # noqa: E402
+
+from app.clients.market_data import MarketDataClient  # noqa: E402
+
+
+class StubServer:
+    """Minimal HTTP/1.1 server answering every GET with the same chain payload."""
+
+    def __init__(self, contracts: int, latency: float) -> None:
+        self.latency = latency
+        self.connections = 0
+        body = json.dumps({"contracts": [{"symbol": f"SPY {i}"} for i in range(contracts)]})
+        self._response = (
+            b"HTTP/1.1 200 OK\r\ncontent-type: application/json\r\n"
+            + f"content-length: {len(body)}\r\n\r\n".encode()
+            + body.encode()
+        )
+
+    async def start(self) -> str:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def stop(self) -> None:
+        self._server.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while await reader.readuntil(b"\r\n\r\n"):
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                writer.write(self._response)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def per_call(base_url: str, symbol: str) -> None:
+    async with httpx.AsyncClient(timeout=5.0) as client:
+        response = await client.get(f"{base_url}/chains/{symbol}")
+        response.raise_for_status()
+        response.json()
+
+
+async def run(label: str, server: StubServer, fetch, requests: int, concurrency: int) -> None:
+    gate = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(idx: int) -> None:
+        async with gate:
+            start = time.perf_counter()
+            await fetch(f"SYM{idx % 20}")
+            latencies.append(time.perf_counter() - start)
+
+    opened = server.connections
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    print(
+        f"{label:>9}: {requests / elapsed:8.0f} req/s  "
+        f"p50={latencies[len(latencies) // 2] * 1e3:6.2f}ms  "
+        f"p99={latencies[int(len(latencies) * 0.99)] * 1e3:6.2f}ms  "
+        f"connections={server.connections - opened}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--contracts", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    server = StubServer(args.contracts, args.latency_ms / 1000)
+    base_url = await server.start()
+    try:
+        await run(
+            "per-call",
+            server,
+            lambda symbol: per_call(base_url, symbol),
+            args.requests,
+            args.concurrency,
+        )
+        client = MarketDataClient(base_url, timeout=5.0, max_connections=args.concurrency)
+        await client.start()
+        try:
+            await run("pooled", server, client.fetch_chain, args.requests, args.concurrency)
+            print(f"   client: {client.stats()}")
+        finally:
+            await client.aclose()
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,124 @@
+"""Time per contract to turn a raw market-data chain payload into screenable columns.
+
+Usage: ``python benchmarks/normalization.py [--sizes 500 5000 50000] [--profile]``
+
+"validated" is the original path: per-row normalization, then a validated
+``ContractCandidate`` per contract. "per-row" normalizes row by row into NumPy columns.
+"bulk" is ``ChainColumns.from_payload``. Each path ends by materializing the five
+winners of a neutral screen. ``--profile`` prints a cProfile summary of the bulk path.
+"""
+from __future__ import annotations
+
+import argparse
+import cProfile
+import pathlib
+import pstats
+import sys
+import time
+from datetime import datetime, timedelta
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+
+from app.schemas import ContractCandidate, RiskProfile  # noqa: E402
+from app.screening import (  # noqa: E402
+    ChainColumns,
+    reference_normalize,
+    screen_columns,
+)
+
+NOW = datetime(2025, 1, 2, 15, 30)
+RISK = RiskProfile.neutral
+
+
+def raw_payload(size: int, seed: int = 7):
+    """Market-data shaped rows: aliased keys, missing mids and ~1% bad rows."""
+    rng = np.random.default_rng(seed)
+    expiries = [(NOW + timedelta(days=d)).date().isoformat() for d in (3, 9, 23, 31, 44, 58)]
+    rows = []
+    for idx in range(size):
+        row = {
+            "symbol": f"SPY {idx}",
+            "delta": float(rng.uniform(0.1, 0.7)),
+            "gamma": float(rng.uniform(0.0, 0.1)),
+            "theta": float(rng.uniform(-0.1, 0.0)),
+            "vega": float(rng.uniform(0.0, 0.3)),
+            "iv": float(rng.uniform(0.1, 0.9)),
+            "oi": int(rng.integers(0, 3000)),
+            "volume": int(rng.integers(0, 1000)),
+            "bid": 1.0,
+            "ask": 1.1,
+            "spread_pct": float(rng.uniform(0.0, 0.02)),
+            "liquidity_score": int(rng.integers(0, 101)),
+            "expiry": expiries[idx % len(expiries)],
+            "strike": float(400 + idx % 50),
+        }
+        if idx % 100 == 99:
+            row["liquidity_score"] = 250
+        rows.append(row)
+    return rows
+
+
+def validated(rows):
+    normalized = (reference_normalize(raw) for raw in rows)
+    contracts = [
+        ContractCandidate(**row)
+        for row in normalized
+        if row is not None and 0 <= row["liquidity_score"] <= 100
+    ]
+    chain = ChainColumns.from_records([c.model_dump() for c in contracts])
+    winners, _ = screen_columns(chain, RISK, NOW)
+    return [contracts[i] for i in winners]
+
+
+def per_row(rows):
+    normalized = (reference_normalize(raw) for raw in rows)
+    chain = ChainColumns.from_records(
+        [row for row in normalized if row is not None and 0 <= row["liquidity_score"] <= 100]
+    )
+    winners, _ = screen_columns(chain, RISK, NOW)
+    return [chain.candidate(i) for i in winners]
+
+
+def bulk(rows):
+    chain = ChainColumns.from_payload(rows)
+    winners, _ = screen_columns(chain, RISK, NOW)
+    return [chain.candidate(i) for i in winners]
+
+
+def best_of(fn, rows, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(rows)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 5_000, 50_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--profile", action="store_true")
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        rows = raw_payload(size)
+        assert validated(rows) == per_row(rows) == bulk(rows)
+        timings = {fn.__name__: best_of(fn, rows, args.repeat) for fn in (validated, per_row, bulk)}
+        per_contract = "  ".join(f"{name}={t / size * 1e6:6.2f}us" for name, t in timings.items())
+        speedup = timings["validated"] / timings["bulk"]
+        print(f"{size:>7,} contracts: {per_contract}  ({speedup:4.1f}x vs validated)")
+
+    if args.profile:
+        rows = raw_payload(args.sizes[-1])
+        profiler = cProfile.Profile()
+        profiler.runcall(bulk, rows)
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(12)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Scalar vs columnar chain screening.
+
+Usage: ``python benchmarks/screening.py [--sizes 100 10000 100000]``
+
+"scalar" is the original path: a ``ContractCandidate`` per contract, then per-contract
+filters and scores. "columnar" builds NumPy columns from the same normalized dicts,
+screens in vectorized passes and materializes only the winners; "screen-only" excludes
+the column build.
+"""
+from __future__ import annotations
+
+import argparse
+import pathlib
+import sys
+import time
+from datetime import datetime, timedelta
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+
+from app.schemas import ContractCandidate, RiskProfile  # noqa: E402
+from app.screening import ChainColumns, reference_screen, screen_columns  # noqa: E402
+
+
+def random_chain(size: int, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    now = datetime(2025, 1, 2, 15, 30)
+    expiries = [(now + timedelta(days=d)).date().isoformat() for d in (3, 9, 23, 31, 44, 58)]
+    records = [
+        {
+            "symbol": f"SPY {idx}",
+            "delta": float(rng.uniform(0.1, 0.7)),
+            "gamma": float(rng.uniform(0.0, 0.1)),
+            "theta": float(rng.uniform(-0.1, 0.0)),
+            "vega": float(rng.uniform(0.0, 0.3)),
+            "implied_vol": float(rng.uniform(0.1, 0.9)),
+            "open_interest": int(rng.integers(0, 3000)),
+            "volume": int(rng.integers(0, 1000)),
+            "bid": 1.0,
+            "ask": 1.1,
+            "mid": 1.05,
+            "spread_pct": float(rng.uniform(0.0, 0.02)),
+            "liquidity_score": int(rng.integers(0, 101)),
+            "expiry": expiries[idx % len(expiries)],
+            "strike": float(400 + idx % 50),
+        }
+        for idx in range(size)
+    ]
+    return now, records
+
+
+def best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    risk = RiskProfile.neutral
+    for size in args.sizes:
+        now, records = random_chain(size)
+
+        def scalar(records=records, now=now):
+            return reference_screen([ContractCandidate(**r) for r in records], risk, now)
+
+        def columnar(records=records, now=now):
+            chain = ChainColumns.from_records(records)
+            winners, filtered = screen_columns(chain, risk, now)
+            return [chain.candidate(i) for i in winners], filtered
+
+        prebuilt = ChainColumns.from_records(records)
+
+        def screen_only(chain=prebuilt, now=now):
+            return screen_columns(chain, risk, now)
+
+        assert scalar() == columnar()
+        scalar_s = best_of(scalar, args.repeat)
+        columnar_s = best_of(columnar, args.repeat)
+        screen_s = best_of(screen_only, args.repeat)
+        print(
+            f"{size:>7,} contracts: scalar={scalar_s * 1e3:9.2f}ms "
+            f"columnar={columnar_s * 1e3:8.2f}ms ({scalar_s / columnar_s:5.1f}x) "
+            f"screen-only={screen_s * 1e3:7.2f}ms"
+        )
+
+if __name__ == "__main__":
+    main()
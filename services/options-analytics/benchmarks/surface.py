@@ -0,0 +1,107 @@
+"""SVI surface fitting and refits under streaming quote updates.
+
+Usage: ``python benchmarks/surface.py [--sizes 2000 20000]``
+
+"cold" fits every slice from scratch, "unchanged" re-fits an identical chain (digest
+hits), "tick" moves every quote by noise inside the refit tolerance (parameters kept),
+"shift" moves the whole smile (every slice refit, warm-started from the last fit) and
+"cold shift" fits that same moved chain with an empty cache. "richness" is the per-
+contract surface lookup used by scoring.
+"""
+from __future__ import annotations
+
+import argparse
+import pathlib
+import sys
+import time
+from datetime import datetime, timedelta
+from functools import partial
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+
+from app.cache import TTLCache  # noqa: E402
+from app.greeks import years_to_expiry  # noqa: E402
+from app.screening import ChainColumns  # noqa: E402
+from app.surface import SurfaceEngine, SVISlice  # noqa: E402
+
+NOW = datetime(2025, 1, 2, 15, 30)
+SPOT = 450.0
+DAYS = (1, 3, 8, 15, 29, 45, 73, 108, 164, 255, 346, 710)
+
+
+def smile_chain(size: int, level: float = 0.0, noise: float = 0.0, seed: int = 7):
+    """A chain whose IVs sit on per-expiry SVI smiles, optionally shifted and noised."""
+    rng = np.random.default_rng(seed)
+    expiries = [(NOW + timedelta(days=d)).date().isoformat() for d in DAYS]
+    expiry = np.array([expiries[i % len(expiries)] for i in range(size)], dtype=object)
+    strike = np.round(SPOT * np.exp(rng.uniform(-0.4, 0.3, size)))
+    years = years_to_expiry(expiry, NOW)
+    vol = np.empty(size)
+    for name in expiries:
+        rows = expiry == name
+        t = years[rows][0]
+        smile = SVISlice(name, t, SPOT, a=0.03 * t + level * t, b=0.08, rho=-0.6, m=0.01,
+                         sigma=0.1 + 0.1 * t, rmse=0.0, points=0)
+        vol[rows] = smile.implied_vol(strike[rows])
+    vol += np.random.default_rng(seed + 1).normal(0, noise, size)
+    columns = {name: np.zeros(size) for name in ("delta", "gamma", "theta", "vega", "bid",
+                                                 "ask", "mid", "spread_pct")}
+    columns.update(
+        implied_vol=vol,
+        strike=strike,
+        expiry=expiry,
+        symbol=expiry,
+        open_interest=np.zeros(size, dtype=np.int64),
+        volume=np.zeros(size, dtype=np.int64),
+        liquidity_score=np.zeros(size, dtype=np.int64),
+    )
+    return ChainColumns(columns)
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2_000, 20_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        base = smile_chain(size, noise=0.002)
+        tick = smile_chain(size, noise=0.002, seed=8)
+        shift = smile_chain(size, level=0.01, noise=0.002, seed=9)
+        timings = {name: [] for name in ("cold", "unchanged", "tick", "shift", "cold shift",
+                                         "richness")}
+        for _ in range(args.repeat):
+            engine = SurfaceEngine(TTLCache(max_entries=8, ttl_seconds=600))
+            fresh = SurfaceEngine(TTLCache(max_entries=8, ttl_seconds=600))
+            for name, fitter, chain in (
+                ("cold", engine, base),
+                ("unchanged", engine, base),
+                ("tick", engine, tick),
+                ("shift", engine, shift),
+                ("cold shift", fresh, shift),
+            ):
+                timings[name].append(timed(partial(fitter.fit, chain, "SPY", NOW)))
+            surface = engine.fit(shift, "SPY", NOW)
+            timings["richness"].append(timed(partial(surface.richness, shift, NOW)))
+        worst = max(s.rmse for s in surface.slices)
+        stats = engine.stats()
+        print(
+            f"{size:>7,} contracts / {len(surface.slices)} slices: "
+            + " ".join(f"{name}={min(v) * 1e3:6.2f}ms" for name, v in timings.items())
+            + f"  max rmse={worst:.4f} (noise 0.0020)"
+            + f"  kept={stats['kept']} warm={stats['warm_fits']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import asyncio
+import pathlib
+import sys
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.cache import TTLCache
+from app.executor import ExecutorBusy, ScoringExecutor, attach_chain, export_chain
+from app.schemas import RiskProfile
+from app.screening import ChainColumns, screen_profiles
+from app.surface import SurfaceEngine
+
+NOW = datetime(2025, 1, 2, 15, 30)
+
+
+def random_chain(size=400, seed=2):
+    rng = np.random.default_rng(seed)
+    expiries = [(NOW + timedelta(days=d)).date().isoformat() for d in (9, 24, 38, 52)]
+    return ChainColumns.from_records(
+        [
+            {
+                "symbol": f"XYZ {i}", "delta": rng.uniform(0.1, 0.7),
+                "gamma": rng.uniform(0, 0.05), "theta": -rng.uniform(0, 0.1),
+                "vega": rng.uniform(0, 0.3), "implied_vol": rng.uniform(0.15, 0.6),
+                "open_interest": int(rng.integers(0, 3000)), "volume": 10,
+                "bid": 1.0, "ask": 1.02, "mid": 1.01, "spread_pct": rng.uniform(0, 0.02),
+                "liquidity_score": int(rng.integers(0, 101)),
+                "expiry": expiries[i % len(expiries)], "strike": float(rng.uniform(80, 120)),
+            }
+            for i in range(size)
+        ]
+    )
+
+
+def test_shared_memory_round_trip_preserves_scoring_columns():
+    chain = random_chain()
+    block, shared = export_chain(chain)
+    try:
+        attached = attach_chain(shared, block)
+        assert len(attached) == len(chain)
+        for name, column in attached.columns.items():
+            assert np.array_equal(column, chain[name])
+        del attached, column
+    finally:
+        block.close()
+        block.unlink()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("kind", ["thread", "process"])
+async def test_offloaded_screen_matches_inline(kind):
+    chain = random_chain()
+    surface = SurfaceEngine(TTLCache(max_entries=8, ttl_seconds=60)).fit(chain, "XYZ", NOW)
+    executor = ScoringExecutor(kind, workers=1, offload_min_contracts=0)
+    try:
+        results = await executor.screen(chain, list(RiskProfile), NOW, surface)
+    finally:
+        await executor.aclose()
+
+    expected = screen_profiles(chain, list(RiskProfile), NOW, 5, surface.richness(chain, NOW))
+    for risk, (winners, filtered) in expected.items():
+        assert np.array_equal(results[risk][0], winners)
+        assert results[risk][1] == filtered
+    assert executor.stats()["offloaded"] == 1
+
+
+@pytest.mark.asyncio
+async def test_admission_rejects_work_beyond_in_flight_limit():
+    executor = ScoringExecutor(
+        "thread", workers=1, max_in_flight=1, admission_timeout=0.05, offload_min_contracts=0
+    )
+    release = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    busy = asyncio.ensure_future(
+        executor.run(1, lambda: asyncio.run_coroutine_threadsafe(release.wait(), loop).result())
+    )
+    await asyncio.sleep(0.01)
+    try:
+        with pytest.raises(ExecutorBusy):
+            await executor.run(1, int)
+        assert executor.stats()["rejected"] == 1
+        # Small chains never wait for a slot.
+        executor.offload_min_contracts = 10
+        assert await executor.run(1, int) == 0
+    finally:
+        release.set()
+        await busy
+        await executor.aclose()
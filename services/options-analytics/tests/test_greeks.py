@@ -0,0 +1,107 @@
+import pathlib
+import sys
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.cache import TTLCache
+from app.greeks import GreeksEngine, bs_greeks, bs_price, implied_vol, option_types
+from app.screening import ChainColumns
+
+RATE = 0.04
+
+
+def random_contracts(size, seed=3):
+    rng = np.random.default_rng(seed)
+    spot = np.full(size, 100.0)
+    strike = rng.uniform(50, 150, size)
+    years = rng.uniform(2 / 365, 2.0, size)
+    vol = rng.uniform(0.05, 1.5, size)
+    is_call = rng.random(size) < 0.5
+    return spot, strike, years, vol, is_call
+
+
+def test_price_matches_textbook_value_and_put_call_parity():
+    one = np.ones(1)
+    call = bs_price(100 * one, 100 * one, one, 0.05, 0.2 * one, np.array([True]))
+    put = bs_price(100 * one, 100 * one, one, 0.05, 0.2 * one, np.array([False]))
+    assert call[0] == pytest.approx(10.450584, abs=1e-6)
+    assert call[0] - put[0] == pytest.approx(100 - 100 * np.exp(-0.05), abs=1e-12)
+
+
+def test_implied_vol_recovers_generating_vol():
+    spot, strike, years, vol, is_call = random_contracts(20_000)
+    price = bs_price(spot, strike, years, RATE, vol, is_call)
+
+    solved = implied_vol(price, spot, strike, years, RATE, is_call)
+
+    # Deep in/out of the money the price barely depends on vol (or rounds onto its
+    # arbitrage bound), so accuracy is judged where vega is meaningful.
+    vega = bs_greeks(spot, strike, years, RATE, vol, is_call)["vega"]
+    sensitive = vega > 1e-3
+    assert np.isfinite(solved[sensitive]).all()
+    assert np.abs(solved - vol)[sensitive].max() < 1e-6
+    repriced = bs_price(spot, strike, years, RATE, solved, is_call)
+    finite = np.isfinite(solved)
+    assert finite.mean() > 0.99
+    assert np.abs(repriced - price)[finite].max() < 1e-7
+
+
+def test_implied_vol_rejects_prices_outside_arbitrage_bounds():
+    spot, strike, years = np.full(3, 100.0), np.array([90.0, 110.0, 100.0]), np.full(3, 0.5)
+    is_call = np.array([True, False, True])
+    price = np.array([5.0, 5.0, 150.0])  # below intrinsic, below intrinsic, above spot
+
+    assert np.isnan(implied_vol(price, spot, strike, years, RATE, is_call)).all()
+
+
+def test_greeks_match_finite_differences():
+    spot, strike, years, vol, is_call = random_contracts(500)
+    greeks = bs_greeks(spot, strike, years, RATE, vol, is_call)
+
+    def price(s=spot, v=vol, t=years):
+        return bs_price(s, strike, t, RATE, v, is_call)
+
+    h = 1e-4
+    delta = (price(s=spot + h) - price(s=spot - h)) / (2 * h)
+    gamma = (price(s=spot + h) - 2 * price() + price(s=spot - h)) / (h * h)
+    vega = (price(v=vol + h) - price(v=vol - h)) / (2 * h) / 100
+    theta = -(price(t=years + h) - price(t=years - h)) / (2 * h) / 365
+    for name, estimate in (("delta", delta), ("gamma", gamma), ("vega", vega), ("theta", theta)):
+        np.testing.assert_allclose(greeks[name], estimate, rtol=1e-4, atol=1e-5, err_msg=name)
+
+
+def test_option_types_parse_both_symbol_styles():
+    is_call, known = option_types(["SPY 2025-01-17 450C", "O:SPY250117P00450000", "SPY"])
+    assert is_call.tolist() == [True, False, False]
+    assert known.tolist() == [True, True, False]
+
+
+def test_engine_fills_only_missing_fields_and_caches_per_expiry():
+    now = datetime(2025, 1, 2, 15, 30)
+    expiry = (now + timedelta(days=30)).date().isoformat()
+    years = (datetime.fromisoformat(expiry + "T20:00") - now).total_seconds() / (365 * 86400)
+    strikes = np.array([95.0, 100.0, 105.0])
+    mids = bs_price(np.full(3, 100.0), strikes, np.full(3, years), RATE, np.full(3, 0.3), True)
+    rows = [
+        {"symbol": f"SPY {expiry} {k:g}C", "strike": k, "mid": m, "expiry": expiry}
+        for k, m in zip(strikes.tolist(), mids.tolist(), strict=True)
+    ]
+    rows[0].update(implied_vol=0.25, delta=0.61, gamma=0.05, vega=0.1, theta=-0.02)
+    chain = ChainColumns.from_payload(rows)
+    engine = GreeksEngine(RATE, TTLCache(max_entries=16, ttl_seconds=60))
+
+    enriched = engine.enrich(chain, "SPY", 100.0, now)
+
+    assert enriched["delta"][0] == 0.61 and enriched["implied_vol"][0] == 0.25
+    np.testing.assert_allclose(enriched["implied_vol"][1:], 0.3, atol=1e-8)
+    expected = bs_greeks(100.0, strikes[1:], years, RATE, 0.3, True)
+    np.testing.assert_allclose(enriched["delta"][1:], expected["delta"], atol=1e-8)
+    again = engine.enrich(chain, "SPY", 100.0, now + timedelta(seconds=20))
+    assert np.array_equal(again["vega"], enriched["vega"])
+    assert engine.cache.stats()["hits"] == 1
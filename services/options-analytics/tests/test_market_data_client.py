@@ -0,0 +1,72 @@
+import pathlib
+import sys
+
+import httpx
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.clients.market_data import MarketDataClient
+
+
+def _client(handler, **kwargs) -> MarketDataClient:
+    return MarketDataClient(
+        "http://market-data", transport=httpx.MockTransport(handler), retry_backoff=0, **kwargs
+    )
+
+
+@pytest.mark.asyncio
+async def test_client_reuses_pool_and_retries_transient_errors():
+    statuses = iter([503, 200, 200])
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.path)
+        return httpx.Response(next(statuses), json={"contracts": []})
+
+    client = _client(handler)
+    await client.start()
+    pool = client._client
+    assert await client.fetch_chain("spy") == {"contracts": []}
+    assert await client.fetch_quote("spy") == {"contracts": []}
+    assert client._client is pool
+    assert seen == ["/chains/SPY", "/chains/SPY", "/quotes/SPY"]
+    assert client.stats()["retries"] == 1
+    await client.aclose()
+    assert client.stats()["open"] is False
+
+
+@pytest.mark.asyncio
+async def test_client_gives_up_after_configured_retries():
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("refused", request=request)
+
+    client = _client(handler, retries=2)
+    with pytest.raises(httpx.ConnectError):
+        await client.fetch_chain("SPY")
+    stats = client.stats()
+    assert (stats["requests"], stats["retries"], stats["failures"]) == (3, 2, 1)
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_client_without_base_url_is_disabled(monkeypatch):
+    monkeypatch.delenv("MARKET_DATA_URL", raising=False)
+    client = MarketDataClient()
+    assert await client.fetch_chain("SPY") is None
+    assert client.stats()["open"] is False
+
+
+@pytest.mark.asyncio
+async def test_conditional_chain_fetch_reports_unchanged_chain():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return httpx.Response(200, json={"contracts": []}, headers={"ETag": '"v1"'})
+
+    client = _client(handler)
+    assert await client.fetch_chain_if_changed("spy", None) == ({"contracts": []}, '"v1"')
+    assert await client.fetch_chain_if_changed("spy", '"v1"') == (None, '"v1"')
+    await client.aclose()
@@ -0,0 +1,120 @@
+import pathlib
+import sys
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.schemas import ContractCandidate, RiskProfile
+from app.screening import (
+    ChainColumns,
+    reference_normalize,
+    reference_screen,
+    screen_columns,
+)
+
+
+def random_chain(size, seed=7):
+    rng = np.random.default_rng(seed)
+    now = datetime(2025, 1, 2, 15, 30)
+    expiries = [(now + timedelta(days=int(d))).date().isoformat() for d in (3, 9, 23, 31, 44, 58)]
+    return now, [
+        ContractCandidate(
+            symbol=f"SPY {idx}",
+            delta=round(float(rng.uniform(0.1, 0.7)), 2),
+            gamma=round(float(rng.uniform(0.0, 0.1)), 3),
+            theta=round(float(rng.uniform(-0.1, 0.0)), 3),
+            vega=round(float(rng.uniform(0.0, 0.3)), 2),
+            implied_vol=round(float(rng.uniform(0.1, 0.9)), 2),
+            open_interest=int(rng.integers(0, 3000)),
+            volume=int(rng.integers(0, 1000)),
+            bid=1.0,
+            ask=1.1,
+            mid=1.05,
+            spread_pct=round(float(rng.uniform(0.0, 0.02)), 3),
+            liquidity_score=int(rng.integers(0, 101)),
+            expiry=expiries[idx % len(expiries)],
+            strike=400 + idx % 50,
+        )
+        for idx in range(size)
+    ]
+
+
+@pytest.mark.parametrize("risk", list(RiskProfile))
+def test_columnar_screen_matches_scalar_reference(risk):
+    now, contracts = random_chain(3000)
+    chain = ChainColumns.from_records([c.model_dump() for c in contracts])
+
+    expected, expected_filtered = reference_screen(contracts, risk, now)
+    winners, filtered = screen_columns(chain, risk, now)
+
+    assert filtered == expected_filtered
+    assert [chain.candidate(i) for i in winners] == expected
+
+
+def test_bulk_normalization_matches_per_row_reference():
+    _, contracts = random_chain(500)
+    rows = [c.model_dump() for c in contracts]
+    for idx, row in enumerate(rows[:40]):
+        variant = idx % 8
+        if variant == 0:
+            row["iv"] = row.pop("implied_vol")
+            row["oi"] = str(row.pop("open_interest"))
+        elif variant == 1:
+            del row["mid"]
+        elif variant == 2:
+            row["delta"] = None
+        elif variant == 3:
+            row["volume"] = "12.5"
+        elif variant == 4:
+            row["liquidity_score"] = 140
+        elif variant == 5:
+            row["open_interest"] = float("nan")
+        elif variant == 6:
+            row["strike"] = "415.5"
+        else:
+            row.pop("symbol")
+    rows.append("garbage")
+
+    chain = ChainColumns.from_payload(rows)
+
+    normalized = [reference_normalize(r) for r in rows[:-1]]
+    kept = [r for r in normalized if r is not None and 0 <= r["liquidity_score"] <= 100]
+    expected = ChainColumns.from_records(kept)
+    assert len(chain) == len(expected)
+    for name, column in expected.columns.items():
+        assert chain[name].dtype == column.dtype
+        assert np.array_equal(chain[name], column), name
+    assert len(chain.rejects) == len(rows) - len(kept)
+    assert {r["reason"].split(":")[0] for r in chain.rejects} == {
+        "invalid delta",
+        "invalid volume",
+        "invalid open_interest",
+        "liquidity_score out of range",
+        "not an object",
+    }
+
+
+def test_bulk_normalization_of_uniform_rows_matches_reference():
+    _, contracts = random_chain(300)
+    rows = []
+    for contract in contracts:
+        row = contract.model_dump()
+        row["iv"] = row.pop("implied_vol")
+        del row["mid"], row["gamma"]
+        rows.append(row)
+    rows[7]["delta"] = None
+    rows[9]["theta"] = float("nan")
+
+    chain = ChainColumns.from_payload(rows)
+
+    expected = ChainColumns.from_records(
+        [r for r in map(reference_normalize, rows) if r is not None]
+    )
+    for name, column in expected.columns.items():
+        assert np.array_equal(chain[name], column, equal_nan=column.dtype != object), name
+    assert [r["index"] for r in chain.rejects] == [7]
@@ -1,5 +1,6 @@
 import pathlib
 import sys
+from datetime import datetime, timedelta
 
 import pytest
 
@@ -7,7 +8,8 @@ ROOT = pathlib.Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from app.schemas import RiskProfile, ScreeningRequest
+from app.executor import ExecutorBusy
+from app.schemas import RiskProfile, ScreeningError, ScreeningRequest
 from app.service import OptionAnalyticsService
 
 
@@ -22,3 +24,105 @@ async def test_screen_returns_ranked_candidates():
     assert response.candidates
     assert response.diagnostics["filtered"] <= response.diagnostics["universe"]
     assert response.candidates[0].liquidity_score >= response.candidates[-1].liquidity_score
+
+
+class CountingMarketData:
+    def __init__(self) -> None:
+        self.fetched = []
+
+    async def fetch_chain_if_changed(self, symbol, etag):
+        self.fetched.append(symbol)
+        return None, None
+
+
+@pytest.mark.asyncio
+async def test_screen_batch_fetches_each_symbol_once():
+    market_data = CountingMarketData()
+    service = OptionAnalyticsService(market_data, batch_concurrency=2)
+    requests = [
+        ScreeningRequest(symbol=symbol, risk_profile=risk, capital_usd=5000)
+        for symbol in ("AAPL", "msft", "SPY")
+        for risk in RiskProfile
+    ]
+
+    responses = [response async for response in service.screen_batch(requests)]
+
+    assert sorted(market_data.fetched) == ["AAPL", "MSFT", "SPY"]
+    assert len(responses) == len(requests)
+    for response in responses:
+        single = await service.screen(
+            ScreeningRequest(
+                symbol=response.symbol.upper(),
+                risk_profile=response.diagnostics["risk_profile"],
+                capital_usd=5000,
+            )
+        )
+        assert response.candidates == single.candidates
+        assert response.diagnostics == single.diagnostics
+
+
+@pytest.mark.asyncio
+async def test_screen_batch_reports_a_busy_symbol_and_streams_the_rest():
+    service = OptionAnalyticsService(CountingMarketData(), batch_concurrency=2)
+    run = service.executor.run
+
+    async def busy_for_msft(size, fn, *args):
+        if "MSFT" in args:
+            raise ExecutorBusy("no scoring slot within 5.0s")
+        return await run(size, fn, *args)
+
+    service.executor.run = busy_for_msft
+    requests = [
+        ScreeningRequest(symbol=symbol, risk_profile=risk, capital_usd=5000)
+        for symbol in ("AAPL", "MSFT", "SPY")
+        for risk in (RiskProfile.neutral, RiskProfile.aggressive)
+    ]
+
+    lines = [line async for line in service.screen_batch(requests)]
+
+    errors = [line for line in lines if isinstance(line, ScreeningError)]
+    assert [(e.symbol, e.retry_after) for e in errors] == [("MSFT", 1)]
+    assert sorted(line.symbol for line in lines if line not in errors) == [
+        "AAPL", "AAPL", "SPY", "SPY"
+    ]
+
+
+class VersionedMarketData:
+    """Serves one live contract under an ETag that changes when the chain does."""
+
+    def __init__(self) -> None:
+        self.version = 1
+        self.sent = 0
+
+    async def fetch_chain_if_changed(self, symbol, etag):
+        current = f'"v{self.version}"'
+        if etag == current:
+            return None, current
+        self.sent += 1
+        expiry = (datetime.utcnow() + timedelta(days=30 + self.version)).date().isoformat()
+        contract = {
+            "symbol": f"{symbol} v{self.version}",
+            "delta": 0.4,
+            "open_interest": 800,
+            "expiry": expiry,
+            "liquidity_score": 90,
+        }
+        return {"contracts": [contract]}, current
+
+
+@pytest.mark.asyncio
+async def test_screen_results_are_cached_per_chain_version():
+    market_data = VersionedMarketData()
+    service = OptionAnalyticsService(market_data)
+    request = ScreeningRequest(symbol="SPY", risk_profile=RiskProfile.neutral, capital_usd=5000)
+
+    first = await service.screen(request)
+    assert await service.screen(request) is first
+    assert market_data.sent == 1
+    assert service.result_cache.stats()["hits"] == 1
+
+    market_data.version = 2
+    changed = await service.screen(request)
+    assert changed.candidates[0].symbol == "SPY v2"
+    assert await service.screen(request, bypass_cache=True) is not changed
+    assert market_data.sent == 3
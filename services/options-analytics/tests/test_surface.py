@@ -0,0 +1,88 @@
+import pathlib
+import sys
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.cache import TTLCache
+from app.greeks import years_to_expiry
+from app.schemas import RiskProfile
+from app.screening import ChainColumns, screen_profiles
+from app.surface import SurfaceEngine, SVISlice, fit_svi
+
+NOW = datetime(2025, 1, 2, 15, 30)
+TRUE = dict(a=0.01, b=0.1, rho=-0.5, m=0.02, sigma=0.15)
+
+
+def smile_chain(days=(14, 35, 63), per_expiry=40, bump=0.0, seed=5):
+    rng = np.random.default_rng(seed)
+    records = []
+    for day in days:
+        expiry = (NOW + timedelta(days=day)).date().isoformat()
+        years = float(years_to_expiry([expiry], NOW)[0])
+        smile = SVISlice(expiry, years, 100.0, **TRUE, rmse=0.0, points=0)
+        strikes = np.round(100 * np.exp(rng.uniform(-0.3, 0.3, per_expiry)), 1)
+        for strike, vol in zip(strikes, smile.implied_vol(strikes) + bump, strict=True):
+            records.append(
+                {
+                    "symbol": f"XYZ {expiry} {strike:g}C",
+                    "delta": 0.4, "gamma": 0.02, "theta": -0.02, "vega": 0.1,
+                    "implied_vol": float(vol), "open_interest": 1000, "volume": 100,
+                    "bid": 1.0, "ask": 1.01, "mid": 1.005, "spread_pct": 0.001,
+                    "liquidity_score": 80, "expiry": expiry, "strike": float(strike),
+                }
+            )
+    return ChainColumns.from_records(records)
+
+
+def test_fit_recovers_generating_smile():
+    strikes = 100 * np.exp(np.linspace(-0.4, 0.3, 60))
+    smile = SVISlice("2025-03-21", 0.25, 100.0, **TRUE, rmse=0.0, points=0)
+
+    fitted = fit_svi("2025-03-21", 0.25, 100.0, strikes, smile.implied_vol(strikes))
+
+    assert fitted.rmse < 1e-5
+    for name, value in TRUE.items():
+        assert getattr(fitted, name) == pytest.approx(value, abs=2e-3)
+
+
+def test_engine_refits_only_slices_that_moved():
+    engine = SurfaceEngine(TTLCache(max_entries=8, ttl_seconds=60), refit_tolerance=0.002)
+    chain = smile_chain()
+
+    surface = engine.fit(chain, "XYZ", NOW)
+    assert len(surface.slices) == 3 and engine.stats()["cold_fits"] == 3
+    assert np.nanmax(np.abs(surface.richness(chain, NOW))) < 1e-4
+
+    engine.fit(chain, "XYZ", NOW)
+    assert engine.stats()["unchanged"] == 3
+
+    engine.fit(smile_chain(bump=0.0005), "XYZ", NOW)
+    assert engine.stats()["kept"] == 3
+
+    engine.fit(smile_chain(bump=0.03), "XYZ", NOW)
+    stats = engine.stats()
+    assert (stats["cold_fits"], stats["warm_fits"]) == (3, 3)
+
+
+def test_richness_reorders_screen_towards_cheap_contracts():
+    chain = smile_chain(days=(35,), per_expiry=12)
+    surface = SurfaceEngine(TTLCache(max_entries=8, ttl_seconds=60)).fit(chain, "XYZ", NOW)
+    cheap, rich = 3, 7
+    iv = chain["implied_vol"].copy()
+    iv[cheap] *= 0.9
+    iv[rich] *= 1.1
+    quoted = ChainColumns({**chain.columns, "implied_vol": iv})
+
+    richness = surface.richness(quoted, NOW)
+    assert richness[cheap] == pytest.approx(-0.1, abs=1e-3)
+    assert richness[rich] == pytest.approx(0.1, abs=1e-3)
+
+    scores = screen_profiles(quoted, [RiskProfile.neutral], NOW, len(chain), richness)
+    winners, _ = scores[RiskProfile.neutral]
+    assert winners[0] == cheap and winners[-1] == rich
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Set, Tuple
+
+import numpy as np
+
+
+@dataclass
+class BatchStats:
+    requests: int = 0
+    rows: int = 0
+    model_calls: int = 0
+    largest_batch: int = 0
+
+
+class MicroBatcher:
+    """Coalesces concurrent ``predict`` calls into shared model calls.
+
+    The first request of a batch opens a window of ``max_wait`` seconds; requests arriving
+    inside it join the batch, which is flushed early once it holds ``max_batch_size`` rows.
+    The model never sees more than ``max_batch_size`` rows per call; a single oversized
+    request is split across calls. Requests keep collecting while a batch is being scored.
+    """
+
+    def __init__(
+        self,
+        predict_batch: Callable[[np.ndarray], Awaitable[np.ndarray]],
+        max_batch_size: int = 256,
+        max_wait: float = 0.002,
+    ) -> None:
+        self.predict_batch = predict_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._pending: List[Tuple[np.ndarray, asyncio.Future]] = []
+        self._pending_rows = 0
+        self._timer: asyncio.TimerHandle | None = None
+        self._running: Set[asyncio.Task] = set()
+        self._stats = BatchStats()
+
+    async def predict(self, rows: np.ndarray) -> np.ndarray:
+        """Model scores for ``rows`` (one feature vector per row), batched with other callers."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        self._pending.append((rows, future))
+        self._pending_rows += len(rows)
+        self._stats.requests += 1
+        if self._pending_rows >= self.max_batch_size or self.max_wait <= 0:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def stats(self) -> Dict[str, Any]:
+        stats = asdict(self._stats)
+        stats["avg_batch_rows"] = self._stats.rows / max(1, self._stats.model_calls)
+        return stats
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending, self._pending_rows = self._pending, [], 0
+        if batch:
+            task = asyncio.ensure_future(self._score(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _score(self, batch: List[Tuple[np.ndarray, asyncio.Future]]) -> None:
+        try:
+            matrix = np.vstack([rows for rows, _ in batch])
+            chunks = []
+            for start in range(0, len(matrix), self.max_batch_size):
+                chunk = await self.predict_batch(matrix[start : start + self.max_batch_size])
+                chunks.append(np.asarray(chunk).reshape(-1))
+            scores = np.concatenate(chunks)
+            if len(scores) != len(matrix):
+                raise ValueError(f"model returned {len(scores)} scores for {len(matrix)} rows")
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        self._stats.rows += len(matrix)
+        self._stats.model_calls += len(chunks)
+        self._stats.largest_batch = max(self._stats.largest_batch, len(matrix))
+        offset = 0
+        for rows, future in batch:
+            if not future.done():
+                future.set_result(scores[offset : offset + len(rows)])
+            offset += len(rows)
@@ -0,0 +1,218 @@
+"""Lean NumPy inference artifacts for models behind the MLflow pyfunc wrapper.
+
+``python -m app.fast_path <model dir>`` compiles the scikit-learn estimator inside a saved
+pyfunc model into ``fast_path.npz`` next to its ``MLmodel`` file, after checking that it
+reproduces the pyfunc's outputs. :class:`~app.model_registry.ModelRegistry` serves from
+that artifact when a model directory has one, skipping the pyfunc input conversion.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+from dataclasses import dataclass
+from typing import Any, Dict
+
+import numpy as np
+
+FAST_PATH_FILE = "fast_path.npz"
+PARITY_ROWS = 1024
+# Rows per descent pass: keeps the (rows, trees) node arrays cache-sized.
+TREE_BLOCK_ROWS = 256
+
+
+class UnsupportedModel(ValueError):
+    """Raised for estimators that have no fast-path compilation."""
+
+
+@dataclass(frozen=True)
+class LinearFastPath:
+    """``features @ coef + intercept``: linear regressors (OLS, ridge, lasso, SGD...)."""
+
+    coef: np.ndarray
+    intercept: float
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        return features @ self.coef + self.intercept
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {"coef": self.coef, "intercept": np.array(self.intercept)}
+
+
+@dataclass(frozen=True)
+class TreeFastPath:
+    """A regression tree ensemble as flat node arrays, evaluated for every tree at once.
+
+    ``children[2 * node]`` is the left child and ``children[2 * node + 1]`` the right
+    one; leaves point to themselves, so ``depth`` descent steps settle every row in its
+    leaf whatever the depth of the individual tree. The result is
+    ``base + scale * sum(leaf values)``. Features are compared as float32, like
+    scikit-learn does.
+    """
+
+    feature: np.ndarray
+    threshold: np.ndarray
+    children: np.ndarray
+    value: np.ndarray
+    roots: np.ndarray
+    depth: int
+    base: float
+    scale: float
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        features = np.asarray(features, dtype=np.float32)
+        if len(features) <= TREE_BLOCK_ROWS:
+            return self._predict_block(features)
+        return np.concatenate(
+            [
+                self._predict_block(features[start : start + TREE_BLOCK_ROWS])
+                for start in range(0, len(features), TREE_BLOCK_ROWS)
+            ]
+        )
+
+    def _predict_block(self, features: np.ndarray) -> np.ndarray:
+        rows = len(features)
+        # Feature-major, so feature f of row r sits at f * rows + r.
+        columns = np.ascontiguousarray(features.T).reshape(-1)
+        row_index = np.arange(rows)[:, None]
+        nodes = np.broadcast_to(self.roots, (rows, len(self.roots)))
+        for _ in range(self.depth):
+            values = columns[self.feature[nodes] * rows + row_index]
+            nodes = self.children[2 * nodes + (values > self.threshold[nodes])]
+        return self.base + self.scale * self.value[nodes].sum(axis=1)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {
+            "feature": self.feature,
+            "threshold": self.threshold,
+            "children": self.children,
+            "value": self.value,
+            "roots": self.roots,
+            "depth": np.array(self.depth),
+            "base": np.array(self.base),
+            "scale": np.array(self.scale),
+        }
+
+
+FastPath = LinearFastPath | TreeFastPath
+KINDS = {"linear": LinearFastPath, "trees": TreeFastPath}
+
+
+def compile_estimator(estimator: Any) -> FastPath:
+    """Fast path for a fitted single-output scikit-learn regressor.
+
+    Supported: linear models, decision trees, random/extra-trees forests and gradient
+    boosting with squared-error loss. Anything else raises :class:`UnsupportedModel`.
+    """
+    from sklearn.base import is_regressor
+
+    name = type(estimator).__name__
+    if not is_regressor(estimator):
+        raise UnsupportedModel(f"{name} is not a regressor")
+    if hasattr(estimator, "tree_"):
+        return _trees([estimator.tree_], base=0.0, scale=1.0)
+    if name in ("RandomForestRegressor", "ExtraTreesRegressor"):
+        trees = [tree.tree_ for tree in estimator.estimators_]
+        return _trees(trees, base=0.0, scale=1.0 / len(trees))
+    if name == "GradientBoostingRegressor":
+        if estimator.loss != "squared_error":
+            raise UnsupportedModel(f"{name} with {estimator.loss!r} loss")
+        if estimator.init_ == "zero":
+            base = 0.0
+        elif type(estimator.init_).__name__ == "DummyRegressor":
+            base = float(np.ravel(estimator.init_.constant_)[0])
+        else:
+            raise UnsupportedModel(f"{name} with a {type(estimator.init_).__name__} init")
+        trees = [stage[0].tree_ for stage in estimator.estimators_]
+        return _trees(trees, base=base, scale=float(estimator.learning_rate))
+    coef = getattr(estimator, "coef_", None)
+    if coef is not None and np.ndim(coef) == 1:
+        return LinearFastPath(np.asarray(coef, dtype=np.float64), float(estimator.intercept_))
+    raise UnsupportedModel(f"no fast path for {name}")
+
+
+def _trees(trees, base: float, scale: float) -> TreeFastPath:
+    features, thresholds, children, values, roots = [], [], [], [], []
+    offset = depth = 0
+    for tree in trees:
+        if tree.n_outputs != 1:
+            raise UnsupportedModel("multi-output trees")
+        nodes = np.arange(tree.node_count)
+        leaf = tree.children_left < 0
+        features.append(np.where(leaf, 0, tree.feature))
+        thresholds.append(np.where(leaf, np.inf, tree.threshold))
+        pairs = np.column_stack((tree.children_left, tree.children_right))
+        children.append(np.where(leaf[:, None], nodes[:, None], pairs).reshape(-1) + offset)
+        values.append(tree.value[:, 0, 0])
+        roots.append(offset)
+        offset += tree.node_count
+        depth = max(depth, tree.max_depth)
+    return TreeFastPath(
+        feature=np.concatenate(features).astype(np.intp),
+        threshold=np.concatenate(thresholds),
+        children=np.concatenate(children).astype(np.intp),
+        value=np.concatenate(values).astype(np.float64),
+        roots=np.array(roots, dtype=np.intp),
+        depth=depth,
+        base=base,
+        scale=scale,
+    )
+
+
+def save_fast_path(fast_path: FastPath, path: str) -> None:
+    kind = next(kind for kind, cls in KINDS.items() if isinstance(fast_path, cls))
+    with open(path, "wb") as handle:
+        np.savez(handle, kind=np.array(kind), **fast_path.arrays())
+
+
+def load_fast_path(path: str) -> FastPath:
+    with np.load(path, allow_pickle=False) as data:
+        arrays = {key: data[key] for key in data.files}
+    cls = KINDS[str(arrays.pop("kind"))]
+    for key in ("intercept", "depth", "base", "scale"):
+        if key in arrays:
+            arrays[key] = arrays[key].item()
+    return cls(**arrays)
+
+
+def find_estimator(model: Any, model_dir: str) -> Any:
+    """The scikit-learn estimator behind the pyfunc ``model`` saved in ``model_dir``
+    (sklearn flavor, or a custom ``PythonModel`` holding it as ``.model``)."""
+    import mlflow.sklearn
+
+    if "sklearn" in model.metadata.flavors:
+        return mlflow.sklearn.load_model(model_dir)
+    estimator = getattr(model.unwrap_python_model(), "model", None)
+    if estimator is None:
+        raise UnsupportedModel("pyfunc model does not expose an estimator")
+    return estimator
+
+
+def export_fast_path(model_dir: str, rtol: float = 1e-9) -> str:
+    """Compile the model saved in ``model_dir`` and write :data:`FAST_PATH_FILE` into it.
+
+    The artifact is only written if it matches the pyfunc's predictions on random rows.
+    """
+    import mlflow.pyfunc
+
+    from .model_registry import FEATURE_COUNT
+
+    model = mlflow.pyfunc.load_model(model_dir)
+    fast_path = compile_estimator(find_estimator(model, model_dir))
+    rows = np.random.default_rng(0).random((PARITY_ROWS, FEATURE_COUNT))
+    expected = np.asarray(model.predict({"features": rows}), dtype=np.float64).reshape(-1)
+    if not np.allclose(fast_path.predict(rows), expected, rtol=rtol, atol=0):
+        raise UnsupportedModel("fast path does not reproduce the pyfunc predictions")
+    path = os.path.join(model_dir, FAST_PATH_FILE)
+    save_fast_path(fast_path, path)
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("model_dir", help="local directory of a saved MLflow pyfunc model")
+    args = parser.parse_args()
+    print(export_fast_path(args.model_dir))
+
+
+if __name__ == "__main__":
+    main()
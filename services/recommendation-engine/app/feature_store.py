@@ -1,30 +1,269 @@
 from __future__ import annotations
 
+import asyncio
+import logging
 import os
-from typing import Any, Dict
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Set, Tuple
 
 try:
     from feast import FeatureStore
 except ImportError:  # pragma: no cover - optional dependency during scaffolding
     FeatureStore = None  # type: ignore
 
+logger = logging.getLogger(__name__)
+
+FEATURE_VIEW = "options_liquidity_features"
+FEATURES = (
+    f"{FEATURE_VIEW}:avg_open_interest",
+    f"{FEATURE_VIEW}:avg_volume",
+    f"{FEATURE_VIEW}:liquidity_score",
+)
+# The view's ``ttl`` in feature-store/definitions/liquidity_feature_view.py: Feast itself
+# stops serving a row this long after its event timestamp, so no cached copy outlives it.
+FEATURE_VIEW_TTL_SECONDS = 7 * 24 * 3600.0
+
+EntityKey = Tuple[str, str, float]
+
+
+def entity_key(entity_row: Dict[str, Any]) -> EntityKey:
+    return (str(entity_row["symbol"]), str(entity_row["expiry"]), float(entity_row["strike"]))
+
+
+@dataclass
+class FeatureCacheStats:
+    hits: int = 0
+    stale_hits: int = 0
+    negative_hits: int = 0
+    misses: int = 0
+    store_calls: int = 0
+    store_rows: int = 0
+    refreshes: int = 0
+    refresh_errors: int = 0
+    evictions: int = 0
+
+
+class FeatureCache:
+    """Bounded LRU of online feature rows keyed by entity.
+
+    A row is fresh for ``ttl_seconds`` after it was fetched; after that it is stale and
+    may still be served (while a refresh runs) until ``max_age_seconds``. Entities the
+    store has no values for are cached as ``None`` for ``negative_ttl_seconds`` and are
+    never served stale. Not thread-safe on its own; :class:`FeatureStoreClient` locks it.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        negative_ttl_seconds: float,
+        max_age_seconds: float,
+        max_entries: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.max_age_seconds = max(max_age_seconds, ttl_seconds)
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[EntityKey, Tuple[float, Dict[str, Any] | None]] = OrderedDict()
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def lookup(self, key: EntityKey) -> Tuple[str, Dict[str, Any] | None]:
+        """``("fresh" | "stale" | "negative" | "miss", values)`` for ``key``."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return "miss", None
+        fetched_at, values = entry
+        age = self._clock() - fetched_at
+        if values is None:
+            if age < self.negative_ttl_seconds:
+                return "negative", None
+        elif age < self.ttl_seconds:
+            self._entries.move_to_end(key)
+            return "fresh", values
+        elif age < self.max_age_seconds:
+            return "stale", values
+        del self._entries[key]
+        return "miss", None
+
+    def put(self, key: EntityKey, values: Dict[str, Any] | None) -> None:
+        if not self.enabled:
+            return
+        self._entries.pop(key, None)
+        self._entries[key] = (self._clock(), values)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
 
 class FeatureStoreClient:
-    def __init__(self, repo_path: str | None = None) -> None:
+    """Online liquidity features for option contracts, read through an in-process cache.
+
+    :meth:`get_online_features_batch` resolves many entity rows with at most one online
+    store call for the rows the cache cannot answer. Stale rows (fetched more than
+    ``ttl_seconds`` but less than ``max_stale_seconds`` ago) are returned as they are and
+    refreshed in one batched call on a background thread (stale-while-revalidate).
+    :meth:`get_online_features_batch_async` answers hits on the event loop and makes the
+    store call for misses on a worker thread.
+    """
+
+    def __init__(
+        self,
+        repo_path: str | None = None,
+        *,
+        store: Any = None,
+        ttl_seconds: float = 300.0,
+        negative_ttl_seconds: float = 60.0,
+        max_stale_seconds: float = 900.0,
+        max_entries: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
         self.repo_path = repo_path or os.getenv("FEAST_REPO_PATH")
-        self._store = FeatureStore(repo_path=self.repo_path) if FeatureStore and self.repo_path else None
+        if store is None and FeatureStore and self.repo_path:
+            store = FeatureStore(repo_path=self.repo_path)
+        self._store = store
+        self._cache = FeatureCache(
+            ttl_seconds,
+            negative_ttl_seconds,
+            min(max_stale_seconds, FEATURE_VIEW_TTL_SECONDS),
+            max_entries,
+            clock,
+        )
+        self._lock = threading.Lock()
+        self._refresher = ThreadPoolExecutor(1, thread_name_prefix="feature-refresh")
+        self._refreshing: Set[EntityKey] = set()
+        self._stats = FeatureCacheStats()
 
     def get_online_features(self, entity_rows: Dict[str, Any]) -> Dict[str, Any]:
+        return self.get_online_features_batch([entity_rows])[0]
+
+    def get_online_features_batch(
+        self, entity_rows: Sequence[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Feature values per entity row (``{}`` for entities the store does not know)."""
         if not self._store:
-            return {}
-        features = [
-            "options_liquidity_features:avg_open_interest",
-            "options_liquidity_features:avg_volume",
-            "options_liquidity_features:liquidity_score",
-        ]
-        result = self._store.get_online_features(features=features, entity_rows=[entity_rows]).to_dict()
-        return {key: values[0] for key, values in result.items()}
+            return [{} for _ in entity_rows]
+        keys = [entity_key(row) for row in entity_rows]
+        found, missing = self._lookup(keys)
+        if missing:
+            found.update(self._fetch(missing))
+        return [dict(found[key] or {}) for key in keys]
+
+    async def get_online_features_batch_async(
+        self, entity_rows: Sequence[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """:meth:`get_online_features_batch` without blocking the event loop on misses."""
+        if not self._store:
+            return [{} for _ in entity_rows]
+        keys = [entity_key(row) for row in entity_rows]
+        found, missing = self._lookup(keys)
+        if missing:
+            found.update(await asyncio.to_thread(self._fetch, missing))
+        return [dict(found[key] or {}) for key in keys]
+
+    def close(self) -> None:
+        """Stop the refresh thread, letting an in-flight refresh finish."""
+        self._refresher.shutdown(wait=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = {**asdict(self._stats), "size": len(self._cache)}
+            stats["evictions"] = self._cache.evictions
+        lookups = stats["hits"] + stats["stale_hits"] + stats["negative_hits"] + stats["misses"]
+        stats["hit_rate"] = (lookups - stats["misses"]) / lookups if lookups else 0.0
+        stats["enabled"] = self._store is not None and self._cache.enabled
+        return stats
+
+    def _lookup(
+        self, keys: Sequence[EntityKey]
+    ) -> Tuple[Dict[EntityKey, Dict[str, Any] | None], List[EntityKey]]:
+        """Cached values for ``keys`` and the keys to fetch; schedules stale refreshes."""
+        found: Dict[EntityKey, Dict[str, Any] | None] = {}
+        missing: List[EntityKey] = []
+        stale: List[EntityKey] = []
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                state, values = self._cache.lookup(key)
+                if state == "miss":
+                    missing.append(key)
+                    self._stats.misses += 1
+                    continue
+                found[key] = values
+                if state == "fresh":
+                    self._stats.hits += 1
+                elif state == "negative":
+                    self._stats.negative_hits += 1
+                else:
+                    self._stats.stale_hits += 1
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        stale.append(key)
+        if stale:
+            self._refresher.submit(self._refresh, stale)
+        return found, missing
+
+    def _fetch(self, keys: Sequence[EntityKey]) -> Dict[EntityKey, Dict[str, Any] | None]:
+        """One online store call for ``keys``; the results are cached, absent ones as None."""
+        entity_rows = [{"symbol": s, "expiry": e, "strike": k} for s, e, k in keys]
+        columns = self._store.get_online_features(
+            features=list(FEATURES), entity_rows=entity_rows
+        ).to_dict()
+        rows = _rows(columns, FEATURES, len(keys))
+        with self._lock:
+            self._stats.store_calls += 1
+            self._stats.store_rows += len(keys)
+            for key, values in zip(keys, rows, strict=True):
+                self._cache.put(key, values)
+        return dict(zip(keys, rows, strict=True))
+
+    def _refresh(self, keys: List[EntityKey]) -> None:
+        try:
+            self._fetch(keys)
+            with self._lock:
+                self._stats.refreshes += 1
+        except Exception:
+            logger.exception("feature refresh failed for %d entities", len(keys))
+            with self._lock:
+                self._stats.refresh_errors += 1
+        finally:
+            with self._lock:
+                self._refreshing.difference_update(keys)
+
+
+def _rows(
+    columns: Dict[str, List[Any]], features: Iterable[str], count: int
+) -> List[Dict[str, Any] | None]:
+    """Column-wise Feast output to one dict per entity; None where no feature has a value.
+
+    Feast names result columns without the view prefix (unless full names are requested);
+    either way they are returned under the ``view:feature`` names callers ask for.
+    """
+    named = []
+    for feature in features:
+        column = columns.get(feature, columns.get(feature.split(":", 1)[1]))
+        named.append((feature, column if column is not None else [None] * count))
+    rows: List[Dict[str, Any] | None] = []
+    for index in range(count):
+        values = {name: column[index] for name, column in named if column[index] is not None}
+        rows.append(values or None)
+    return rows
 
 
 def build_feature_store_client() -> FeatureStoreClient:
-    return FeatureStoreClient()
+    return FeatureStoreClient(
+        ttl_seconds=float(os.getenv("FEATURE_CACHE_TTL_SECONDS", "300")),
+        negative_ttl_seconds=float(os.getenv("FEATURE_CACHE_NEGATIVE_TTL_SECONDS", "60")),
+        max_stale_seconds=float(os.getenv("FEATURE_CACHE_MAX_STALE_SECONDS", "900")),
+        max_entries=int(os.getenv("FEATURE_CACHE_MAX_ENTRIES", "100000")),
+    )
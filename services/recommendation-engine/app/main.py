@@ -1,17 +1,78 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from typing import Any
 
-from .schemas import RecommendationRequest
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from .model_registry import ModelNotReady
+from .schemas import PortfolioRequest, RecommendationRequest
 from .service import build_engine
 
-app = FastAPI(title="Recommendation Engine", version="0.1.0")
 engine = build_engine()
 
 
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    # Loading happens in the background; /readyz reports when the model is warm.
+    await engine.registry.start()
+    try:
+        yield
+    finally:
+        await engine.registry.aclose()
+        engine.feature_store.close()
+
+
+app = FastAPI(title="Recommendation Engine", version="0.1.0", lifespan=lifespan)
+
+
+@app.exception_handler(ModelNotReady)
+async def model_not_ready(_: Request, exc: ModelNotReady) -> JSONResponse:
+    return JSONResponse({"detail": str(exc)}, status_code=503, headers={"Retry-After": "1"})
+
+
 @app.get("/healthz")
 async def healthcheck() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/readyz")
+async def readiness() -> JSONResponse:
+    ready = engine.registry.ready
+    return JSONResponse(
+        {"status": "ready" if ready else "loading", "model": engine.registry.stats()},
+        status_code=200 if ready else 503,
+    )
+
+
+@app.get("/metrics")
+async def metrics() -> dict[str, dict[str, Any]]:
+    return {
+        "batching": engine.batcher.stats(),
+        "model": engine.registry.stats(),
+        "feature_store": engine.feature_store.stats(),
+        "scenarios": engine.scenarios.stats(),
+    }
+
+
+@app.post("/admin/model/reload")
+async def reload_model() -> JSONResponse:
+    # Only ever the configured MLFLOW_MODEL_URI: loading a pyfunc model runs its pickled code, so
+    # the URI must not come from the request.
+    try:
+        await engine.registry.reload()
+    except Exception as exc:
+        return JSONResponse(
+            {"detail": f"model reload failed: {exc}", "model": engine.registry.stats()},
+            status_code=503,
+        )
+    return JSONResponse(engine.registry.stats())
+
+
 @app.post("/score")
 async def score(request: RecommendationRequest):
     return await engine.recommend(request)
+
+
+@app.post("/score:portfolio")
+async def score_portfolio(request: PortfolioRequest):
+    return await engine.recommend_portfolio(request)
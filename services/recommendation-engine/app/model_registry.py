@@ -1,31 +1,220 @@
 from __future__ import annotations
 
+import asyncio
+import logging
 import os
-from typing import Any, Dict
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List
 
-import mlflow
 import numpy as np
 
+from .fast_path import FAST_PATH_FILE, FastPath, load_fast_path
+
+logger = logging.getLogger(__name__)
+
+FEATURE_COUNT = 6
+# Batch shapes the warm-up pushes through a freshly loaded model before it takes traffic.
+WARMUP_BATCH_SIZES = (1, 16, 256)
+
+
+class ModelNotReady(RuntimeError):
+    """Raised when a request waits longer than the readiness timeout for the first model."""
+
+
+@dataclass(frozen=True)
+class LoadedModel:
+    """One model generation; requests read it once, so a swap never splits a batch."""
+
+    uri: str | None
+    model: Any
+    model_uuid: str | None = None
+    fast_path: FastPath | None = None
+    load_seconds: float = 0.0
+    warmup_seconds: float = 0.0
+    error: str | None = None
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        if self.fast_path is not None:
+            return self.fast_path.predict(features)
+        if self.model is None:
+            return features.mean(axis=1)
+        data: Dict[str, Any] = {"features": features}
+        prediction = self.model.predict(data)
+        return np.asarray(prediction, dtype=np.float64).reshape(-1)
+
 
 class ModelRegistry:
-    def __init__(self, model_uri: str | None = None) -> None:
+    """Serves the MLflow model without blocking startup or the event loop.
+
+    :meth:`start` loads the model in the background; until the first generation is loaded
+    and warmed up the registry is not ready and :meth:`predict_async` waits (up to
+    ``ready_timeout``). Inference runs on a dedicated executor. :meth:`reload` loads and
+    warms a new generation next to the serving one and swaps it in with a single
+    assignment, so in-flight batches finish on the model they started with. With
+    ``reload_interval`` set, the URI is polled and reloaded when its model changes.
+    Without a URI (or if loading fails) the registry serves the feature-mean fallback.
+
+    A model directory holding a :mod:`~app.fast_path` artifact is served from it instead
+    of the pyfunc wrapper, unless ``use_fast_path`` is off.
+    """
+
+    def __init__(
+        self,
+        model_uri: str | None = None,
+        *,
+        inference_workers: int = 1,
+        ready_timeout: float = 30.0,
+        reload_interval: float = 0.0,
+        use_fast_path: bool = True,
+    ) -> None:
         self.model_uri = model_uri or os.getenv("MLFLOW_MODEL_URI")
-        self._model = None
-        if self.model_uri:
+        self.ready_timeout = ready_timeout
+        self.reload_interval = reload_interval
+        self.use_fast_path = use_fast_path
+        self._active = LoadedModel(uri=None, model=None)
+        self._inference = ThreadPoolExecutor(inference_workers, thread_name_prefix="inference")
+        self._loader = ThreadPoolExecutor(1, thread_name_prefix="model-loader")
+        self._ready: asyncio.Event | None = None
+        self._tasks: List[asyncio.Task] = []
+        self._reload_lock: asyncio.Lock | None = None
+        self.generation = 0
+
+    @property
+    def ready(self) -> bool:
+        return self._ready is not None and self._ready.is_set()
+
+    async def start(self) -> None:
+        """Kick off the initial load (and the reload poller); returns immediately."""
+        if self._ready is not None:
+            return
+        self._ready = asyncio.Event()
+        self._reload_lock = asyncio.Lock()
+        self._tasks.append(asyncio.create_task(self.reload()))
+        if self.reload_interval > 0 and self.model_uri:
+            self._tasks.append(asyncio.create_task(self._poll()))
+
+    async def aclose(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._inference.shutdown(wait=False, cancel_futures=True)
+        self._loader.shutdown(wait=False, cancel_futures=True)
+
+    async def wait_ready(self, timeout: float | None = None) -> None:
+        await self.start()
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout or self.ready_timeout)
+        except asyncio.TimeoutError:
+            raise ModelNotReady("model is still loading") from None
+
+    async def reload(self, model_uri: str | None = None) -> LoadedModel:
+        """Load, warm up and swap in a model generation (double-buffered).
+
+        A generation that fails to load or warm up never takes traffic: the serving one
+        stays, or, before the first generation, the fallback scorer is served.
+        """
+        await self.start()
+        uri = model_uri or self.model_uri
+        async with self._reload_lock:
+            loop = asyncio.get_running_loop()
             try:
-                self._model = mlflow.pyfunc.load_model(self.model_uri)
-            except Exception:
-                self._model = None
+                loaded = await loop.run_in_executor(
+                    self._loader, _load_and_warm, uri, self.use_fast_path
+                )
+            except Exception as exc:
+                logger.exception("failed to load model %s", uri)
+                if self.ready:
+                    raise
+                loaded = LoadedModel(uri=uri, model=None, error=repr(exc))
+            self._active = loaded
+            self.model_uri = uri
+            self.generation += 1
+            self._ready.set()
+            logger.info(
+                "model generation %s ready (%s, load %.2fs, warm-up %.2fs)",
+                self.generation, uri or "fallback", loaded.load_seconds, loaded.warmup_seconds,
+            )
+            return loaded
 
     def predict(self, features: np.ndarray) -> float:
-        if not self._model:
-            return float(features.mean())
-        data: Dict[str, Any] = {"features": features.reshape(1, -1)}
-        prediction = self._model.predict(data)
-        if isinstance(prediction, (list, tuple, np.ndarray)):
-            return float(prediction[0])
-        return float(prediction)
+        return float(self.predict_batch(features.reshape(1, -1))[0])
+
+    def predict_batch(self, features: np.ndarray) -> np.ndarray:
+        """Scores for a ``(rows, features)`` matrix in one model call, on the calling thread."""
+        return self._active.predict(features)
+
+    async def predict_async(self, features: np.ndarray) -> np.ndarray:
+        """:meth:`predict_batch` on the inference executor, once a model is ready."""
+        if not self.ready:
+            await self.wait_ready()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._inference, self.predict_batch, features)
+
+    def stats(self) -> Dict[str, Any]:
+        active = self._active
+        return {
+            "ready": self.ready,
+            "generation": self.generation,
+            "uri": active.uri,
+            "model_uuid": active.model_uuid,
+            "fallback": active.model is None,
+            "fast_path": active.fast_path is not None,
+            "load_seconds": active.load_seconds,
+            "warmup_seconds": active.warmup_seconds,
+            "error": active.error,
+        }
+
+    async def _poll(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            try:
+                uuid = await loop.run_in_executor(self._loader, _model_uuid, self.model_uri)
+                if uuid and uuid != self._active.model_uuid:
+                    await self.reload()
+            except Exception:
+                logger.exception("model reload check failed for %s", self.model_uri)
+
+
+def _model_uuid(uri: str) -> str | None:
+    import mlflow.models
+
+    return mlflow.models.get_model_info(uri).model_uuid
+
+
+def _load_and_warm(uri: str | None, use_fast_path: bool = True) -> LoadedModel:
+    if not uri:
+        return LoadedModel(uri=None, model=None)
+    started = time.perf_counter()
+    # Imported here, on the loader thread: mlflow alone takes seconds to import, which
+    # would otherwise be paid by every worker before it can answer /healthz.
+    import mlflow.artifacts
+    import mlflow.pyfunc
+
+    local_path = mlflow.artifacts.download_artifacts(artifact_uri=uri)
+    model = mlflow.pyfunc.load_model(local_path)
+    fast_path_file = os.path.join(local_path, FAST_PATH_FILE)
+    fast_path = None
+    if use_fast_path and os.path.exists(fast_path_file):
+        fast_path = load_fast_path(fast_path_file)
+    loaded = time.perf_counter()
+    candidate = LoadedModel(
+        uri=uri, model=model, model_uuid=model.metadata.model_uuid, fast_path=fast_path
+    )
+    for rows in WARMUP_BATCH_SIZES:
+        candidate.predict(np.zeros((rows, FEATURE_COUNT)))
+    return replace(
+        candidate, load_seconds=loaded - started, warmup_seconds=time.perf_counter() - loaded
+    )
 
 
 def build_registry() -> ModelRegistry:
-    return ModelRegistry()
+    return ModelRegistry(
+        inference_workers=int(os.getenv("MODEL_INFERENCE_WORKERS", "1")),
+        ready_timeout=float(os.getenv("MODEL_READY_TIMEOUT_SECONDS", "30")),
+        reload_interval=float(os.getenv("MODEL_RELOAD_INTERVAL_SECONDS", "0")),
+        use_fast_path=os.getenv("MODEL_FAST_PATH", "1") != "0",
+    )
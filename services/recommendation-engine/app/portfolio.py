@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+import numpy as np
+
+GREEKS = ("delta", "gamma", "theta", "vega")
+CONTRACT_MULTIPLIER = 100
+
+
+@dataclass(frozen=True)
+class AllocationLimits:
+    """Allocation constraints in the units :func:`allocate` works in.
+
+    ``greek_limits`` caps the absolute portfolio exposure per Greek (``inf`` where
+    unconstrained), in position units (per-share Greek x multiplier x contracts).
+    """
+
+    budget: float
+    per_trade_cap: float
+    greek_limits: np.ndarray
+    max_new_positions: int
+    min_score: float
+
+
+@dataclass(frozen=True)
+class Allocation:
+    quantities: np.ndarray  # contracts per candidate, 0 where nothing is bought
+    order: np.ndarray  # candidate indices in the order the optimizer picked them
+    exposure_before: np.ndarray
+    exposure_after: np.ndarray
+    budget_used: float
+
+
+def greek_matrix(rows: Sequence[Any]) -> np.ndarray:
+    """``(len(rows), 4)`` per-share Greeks of contracts or positions, in :data:`GREEKS` order."""
+    return np.array([[getattr(row, greek) for greek in GREEKS] for row in rows], dtype=float)
+
+
+def portfolio_exposure(greeks: np.ndarray, quantities: np.ndarray) -> np.ndarray:
+    """Aggregate position Greeks: per-share Greeks x multiplier x signed contracts."""
+    return CONTRACT_MULTIPLIER * (quantities @ greeks) if len(quantities) else np.zeros(4)
+
+
+def greek_headroom(
+    exposure: np.ndarray, unit_greeks: np.ndarray, limits: np.ndarray
+) -> np.ndarray:
+    """Most contracts of each candidate that keep every ``|exposure|`` within its limit.
+
+    A limit the book already breaches is held at the current exposure: trades may reduce
+    it but never push it further out. ``inf`` where a candidate has no sensitivity.
+    """
+    bound = np.maximum(limits, np.abs(exposure))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        upper = np.where(
+            unit_greeks > 0,
+            (bound - exposure) / unit_greeks,
+            np.where(unit_greeks < 0, (-bound - exposure) / unit_greeks, np.inf),
+        )
+    return np.floor(upper.min(axis=1) + 1e-9)
+
+
+def allocate(
+    scores: np.ndarray,
+    unit_cost: np.ndarray,
+    unit_greeks: np.ndarray,
+    exposure: np.ndarray,
+    limits: AllocationLimits,
+) -> Allocation:
+    """Greedy long-only allocation over candidates, best model score first.
+
+    ``unit_cost`` is the premium per contract and ``unit_greeks`` the position Greeks per
+    contract. Each step recomputes, for every candidate at once, the most contracts the
+    per-trade cap, the remaining risk budget and the Greek limits allow, then buys that
+    many of the best-scoring candidate that can take at least one. It stops after
+    ``max_new_positions`` buys or when nothing fits.
+    """
+    quantities = np.zeros(len(scores), dtype=np.int64)
+    order = []
+    start = exposure.astype(float)
+    exposure = start.copy()
+    remaining = limits.budget
+    available = (scores >= limits.min_score) & (unit_cost > 0)
+    # Best score first; ties go to the cheaper contract.
+    priority = np.lexsort((unit_cost, -scores))
+    cost = np.where(unit_cost > 0, unit_cost, np.inf)
+    for _ in range(limits.max_new_positions):
+        cap = np.floor(np.minimum(limits.per_trade_cap, remaining) / cost)
+        fits = np.minimum(cap, greek_headroom(exposure, unit_greeks, limits.greek_limits))
+        feasible = available & (fits >= 1)
+        ranked = priority[feasible[priority]]
+        if not len(ranked):
+            break
+        pick = ranked[0]
+        quantity = int(fits[pick])
+        quantities[pick] = quantity
+        order.append(pick)
+        available[pick] = False
+        exposure += quantity * unit_greeks[pick]
+        remaining -= quantity * unit_cost[pick]
+    return Allocation(
+        quantities=quantities,
+        order=np.array(order, dtype=np.intp),
+        exposure_before=start,
+        exposure_after=exposure,
+        budget_used=limits.budget - remaining,
+    )
@@ -0,0 +1,346 @@
+from __future__ import annotations
+
+import re
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import datetime, time
+from typing import Any, Dict, Hashable, List, Sequence, Tuple
+
+import numpy as np
+from scipy.special import ndtr, ndtri
+
+from .portfolio import CONTRACT_MULTIPLIER
+from .schemas import ContractRecommendation, ScenarioGridSpec
+
+EXPIRY_CUTOFF = time(20, 0)  # 4pm New York, in UTC, when an expiry carries no time
+SECONDS_PER_YEAR = 365.0 * 24 * 3600
+DAYS_PER_YEAR = 365.0
+MIN_VOL = 0.01
+VAR_LEVELS = (0.95, 0.99)
+_OCC_TYPE = re.compile(r"\d{6}([CP])\d{8}$")
+
+
+@dataclass(frozen=True)
+class Legs:
+    """Priceable legs as parallel arrays (one entry per distinct contract)."""
+
+    symbols: Tuple[str, ...]
+    quantity: np.ndarray  # signed contracts
+    strike: np.ndarray
+    years: np.ndarray
+    vol: np.ndarray
+    is_call: np.ndarray
+    spot: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+
+@dataclass
+class ScenarioStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+def option_type(contract: ContractRecommendation) -> bool:
+    """True for calls: from ``"AAPL 2025-01-17 180C"`` or OCC symbols, else the delta sign."""
+    last = contract.symbol[-1:]
+    if last not in ("C", "P"):
+        match = _OCC_TYPE.search(contract.symbol)
+        last = match.group(1) if match else ("C" if contract.delta >= 0 else "P")
+    return last == "C"
+
+
+def years_to_expiry(expiry: str, now: datetime) -> float:
+    try:
+        moment = datetime.fromisoformat(expiry)
+    except (TypeError, ValueError):
+        return float("nan")
+    if moment.time() == time(0):
+        moment = datetime.combine(moment.date(), EXPIRY_CUTOFF)
+    return (moment.replace(tzinfo=None) - now).total_seconds() / SECONDS_PER_YEAR
+
+
+def implied_spot(
+    delta: float, strike: float, years: float, vol: float, is_call: bool, rate: float
+) -> float:
+    """The underlying price at which a Black-Scholes option has ``delta``.
+
+    Screened chains carry each contract's delta and IV but not the spot they were
+    computed from; inverting ``N(d1)`` recovers it.
+    """
+    probability = delta if is_call else delta + 1
+    if not 0 < probability < 1:
+        return float("nan")
+    spread = vol * np.sqrt(years)
+    return float(strike * np.exp(ndtri(probability) * spread - (rate + 0.5 * vol * vol) * years))
+
+
+def build_legs(
+    contracts: Sequence[ContractRecommendation],
+    quantities: Sequence[int],
+    spot: float | None,
+    now: datetime,
+    rate: float,
+) -> Tuple[Legs, List[str]]:
+    """Legs for the contracts held in non-zero size, and the symbols that cannot be priced
+    (no IV, expired, or no spot to price from)."""
+    held: Dict[Tuple[Any, ...], List[Any]] = {}
+    skipped: List[str] = []
+    for contract, quantity in zip(contracts, quantities, strict=True):
+        if not quantity:
+            continue
+        is_call = option_type(contract)
+        years = years_to_expiry(contract.expiry, now)
+        vol = contract.implied_vol
+        if not (years > 0 and vol > 0):
+            skipped.append(contract.symbol)
+            continue
+        underlying = spot or implied_spot(
+            contract.delta, contract.strike, years, vol, is_call, rate
+        )
+        if not underlying > 0:
+            skipped.append(contract.symbol)
+            continue
+        key = (contract.symbol, contract.strike, years, vol, is_call, underlying)
+        held.setdefault(key, [contract.symbol, 0])[1] += quantity
+    rows = list(held.items())
+    return (
+        Legs(
+            symbols=tuple(symbol for _, (symbol, _) in rows),
+            quantity=np.array([quantity for _, (_, quantity) in rows], dtype=float),
+            strike=np.array([key[1] for key, _ in rows], dtype=float),
+            years=np.array([key[2] for key, _ in rows], dtype=float),
+            vol=np.array([key[3] for key, _ in rows], dtype=float),
+            is_call=np.array([key[4] for key, _ in rows], dtype=bool),
+            spot=np.array([key[5] for key, _ in rows], dtype=float),
+        ),
+        skipped,
+    )
+
+
+def grid_axes(spec: ScenarioGridSpec) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """``(spot moves, IV shifts, days forward)``, each symmetric around / starting at 0."""
+    return (
+        np.linspace(-spec.spot_move_pct, spec.spot_move_pct, spec.spot_steps),
+        np.linspace(-spec.vol_shift, spec.vol_shift, spec.vol_steps),
+        np.linspace(0, spec.days_forward, spec.day_steps),
+    )
+
+
+def reprice(
+    legs: Legs,
+    spot_moves: np.ndarray,
+    vol_shifts: np.ndarray,
+    days: np.ndarray,
+    rate: float,
+) -> np.ndarray:
+    """Position P&L over the grid, shape ``(spot moves, IV shifts, days forward)``.
+
+    Every leg is revalued with Black-Scholes at every grid point and compared with its
+    value at the current snapshot, so the base scenario is 0. Legs are accumulated one at a
+    time into reused ``(S, V, T)`` buffers, which keeps the working set cache-sized;
+    within a leg the grid is one broadcast computation. Puts come from the call value by
+    put-call parity, their linear part added once on the ``(S, T)`` plane. Legs that
+    expire inside the grid settle at intrinsic value.
+    """
+    shape = (len(spot_moves), len(vol_shifts), len(days))
+    pnl = np.zeros(shape)
+    if not len(legs):
+        return pnl
+    calls = np.empty(shape)
+    puts_linear = np.zeros((len(spot_moves), len(days)))
+    scratch = np.empty(shape)
+    base = _price(legs.spot, legs.strike, legs.years, legs.vol, legs.is_call, rate)
+    weights = legs.quantity * CONTRACT_MULTIPLIER
+    for leg in range(len(legs)):
+        spot = legs.spot[leg] * (1 + spot_moves)  # (S,)
+        years = np.maximum(legs.years[leg] - days / DAYS_PER_YEAR, 0.0)  # (T,)
+        vol = np.maximum(legs.vol[leg] + vol_shifts, MIN_VOL)  # (V,)
+        strike, weight = legs.strike[leg], weights[leg]
+        live = years > 0
+        root = np.sqrt(np.where(live, years, 1.0))
+        spread = vol[:, None] * root[None, :]  # (V, T)
+        drift = (rate + 0.5 * vol[:, None] ** 2) * np.where(live, years, 0.0) / spread
+        discounted = strike * np.exp(-rate * years)  # (T,)
+        # d1 = log(S/K)/spread + drift; the call is S N(d1) - K e^{-rt} N(d1 - spread).
+        np.divide(np.log(spot / strike)[:, None, None], spread, out=scratch)
+        scratch += drift
+        ndtr(scratch, out=calls)
+        calls *= spot[:, None, None]
+        scratch -= spread
+        ndtr(scratch, out=scratch)
+        scratch *= discounted
+        calls -= scratch
+        if not live.all():
+            calls[:, :, ~live] = np.maximum(spot[:, None] - strike, 0.0)[:, None, :]
+        calls *= weight
+        pnl += calls
+        if not legs.is_call[leg]:
+            puts_linear += weight * (discounted[None, :] - spot[:, None])
+    pnl += puts_linear[:, None, :]
+    pnl -= float(weights @ base)
+    return pnl
+
+
+def scenario_weights(
+    spot_moves: np.ndarray, vol_shifts: np.ndarray, horizon_days: float, vol: float
+) -> np.ndarray:
+    """Probability of each (spot move, IV shift) cell after ``horizon_days``.
+
+    Spot moves follow a driftless lognormal at the position's IV, discretised on the
+    grid; IV shifts are equally likely. With no horizon all mass sits on the smallest
+    move.
+    """
+    if horizon_days <= 0:
+        spot = (np.abs(spot_moves) == np.abs(spot_moves).min()).astype(float)
+    else:
+        spread = vol * np.sqrt(horizon_days / DAYS_PER_YEAR)
+        log_moves = np.log1p(spot_moves)
+        spot = np.exp(-0.5 * ((log_moves + 0.5 * spread**2) / spread) ** 2) / (1 + spot_moves)
+    spot = spot / spot.sum()
+    return np.repeat(spot[:, None] / len(vol_shifts), len(vol_shifts), axis=1)
+
+
+def risk_stats(
+    pnl: np.ndarray,
+    spot_moves: np.ndarray,
+    vol_shifts: np.ndarray,
+    days: np.ndarray,
+    vol: float,
+) -> Dict[str, Any]:
+    """VaR/CVaR and expected P&L at the last horizon, plus the grid's worst case.
+
+    The grid only spans the moves it was asked for, so tail figures are bounded by its
+    range; ``worst_loss`` is the largest loss anywhere on it.
+    """
+    horizon = float(days[-1])
+    weights = scenario_weights(spot_moves, vol_shifts, horizon, vol).ravel()
+    final = pnl[:, :, -1].ravel()
+    order = np.argsort(final)
+    losses, cumulative = final[order], np.cumsum(weights[order])
+    stats: Dict[str, Any] = {
+        "horizon_days": horizon,
+        "expected_pnl": round(float(weights @ final), 2),
+    }
+    for level in VAR_LEVELS:
+        tail = 1 - level
+        cut = min(int(np.searchsorted(cumulative, tail)), len(losses) - 1)
+        stats[f"var_{round(level * 100)}"] = round(max(0.0, -float(losses[cut])), 2)
+        mass = cumulative[cut]
+        stats[f"cvar_{round(level * 100)}"] = round(
+            max(0.0, -float(weights[order][: cut + 1] @ losses[: cut + 1]) / mass), 2
+        )
+    worst = np.unravel_index(int(np.argmin(pnl)), pnl.shape)
+    stats["worst_loss"] = round(max(0.0, -float(pnl[worst])), 2)
+    stats["worst_scenario"] = {
+        "spot_move": float(spot_moves[worst[0]]),
+        "vol_shift": float(vol_shifts[worst[1]]),
+        "days_forward": float(days[worst[2]]),
+    }
+    stats["best_gain"] = round(max(0.0, float(pnl.max())), 2)
+    return stats
+
+
+class ScenarioEngine:
+    """Stress grids for recommended positions, cached per (snapshot, legs, grid).
+
+    A snapshot is identified by the chain snapshot's symbol and timestamp, so a repeated
+    request against the same market data is served from the cache. Results carry the
+    legs and the risk summary; the axes and the P&L grid itself are only turned into
+    lists for requests that set ``include_grid``.
+    """
+
+    def __init__(self, rate: float = 0.045, max_entries: int = 256) -> None:
+        self.rate = rate
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, Tuple[Dict[str, Any], Dict[str, Any]]] = (
+            OrderedDict()
+        )
+        self._stats = ScenarioStats()
+
+    def evaluate(
+        self,
+        contracts: Sequence[ContractRecommendation],
+        quantities: Sequence[int],
+        snapshot: Dict[str, Any],
+        spec: ScenarioGridSpec,
+        now: datetime | None = None,
+    ) -> Dict[str, Any]:
+        now = now or datetime.utcnow()
+        spot = snapshot.get("spot")
+        # Without a snapshot timestamp, the market state is only as good as the minute.
+        moment = snapshot.get("timestamp") or now.replace(second=0, microsecond=0).isoformat()
+        key = (
+            snapshot.get("symbol"),
+            moment,
+            spot,
+            tuple(
+                (c.symbol, c.strike, c.expiry, c.implied_vol, c.delta, int(q))
+                for c, q in zip(contracts, quantities, strict=True)
+            ),
+            tuple(spec.model_dump(exclude={"include_grid"}).values()),
+        )
+        cached = self._entries.get(key)
+        if cached is not None:
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+        else:
+            self._stats.misses += 1
+            cached = self._evaluate(contracts, quantities, spot, spec, now)
+            if self.max_entries > 0:
+                self._entries[key] = cached
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._stats.evictions += 1
+        summary, grid = cached
+        if not spec.include_grid:
+            return summary
+        return {
+            **summary,
+            "axes": {name: axis.tolist() for name, axis in grid["axes"].items()},
+            "pnl": grid["pnl"].tolist(),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {**asdict(self._stats), "size": len(self._entries)}
+
+    def _evaluate(
+        self,
+        contracts: Sequence[ContractRecommendation],
+        quantities: Sequence[int],
+        spot: float | None,
+        spec: ScenarioGridSpec,
+        now: datetime,
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        legs, skipped = build_legs(contracts, quantities, spot, now, self.rate)
+        spot_moves, vol_shifts, days = grid_axes(spec)
+        pnl = reprice(legs, spot_moves, vol_shifts, days, self.rate)
+        exposure = np.abs(legs.quantity)
+        vol = float(exposure @ legs.vol / exposure.sum()) if len(legs) else 0.0
+        summary = {
+            "legs": list(legs.symbols),
+            "skipped": skipped,
+            "stats": risk_stats(pnl, spot_moves, vol_shifts, days, vol) if len(legs) else {},
+        }
+        grid = {
+            "axes": {"spot_move": spot_moves, "vol_shift": vol_shifts, "days_forward": days},
+            "pnl": np.round(pnl, 2),
+        }
+        return summary, grid
+
+
+def _price(
+    spot: np.ndarray,
+    strike: np.ndarray,
+    years: np.ndarray,
+    vol: np.ndarray,
+    is_call: np.ndarray,
+    rate: float,
+) -> np.ndarray:
+    spread = vol * np.sqrt(years)
+    d1 = (np.log(spot / strike) + (rate + 0.5 * vol * vol) * years) / spread
+    discounted = strike * np.exp(-rate * years)
+    call = spot * ndtr(d1) - discounted * ndtr(d1 - spread)
+    return np.where(is_call, call, call - spot + discounted)
@@ -1,6 +1,18 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+
+class ScenarioGridSpec(BaseModel):
+    """Stress grid: spot moves x IV shifts x days forward, each evenly spaced."""
+
+    spot_move_pct: float = Field(0.2, gt=0, lt=1)
+    spot_steps: int = Field(41, ge=1, le=201)
+    vol_shift: float = Field(0.10, ge=0, le=1)  # absolute IV, either side
+    vol_steps: int = Field(11, ge=1, le=101)
+    days_forward: int = Field(21, ge=0, le=365)
+    day_steps: int = Field(4, ge=1, le=61)
+    include_grid: bool = False  # the full P&L grid, not just its VaR/CVaR summary
 
 
 class RecommendationRequest(BaseModel):
@@ -9,6 +21,7 @@ class RecommendationRequest(BaseModel):
     chain_snapshot: Dict[str, Any]
     signals: Dict[str, Any]
     request: Dict[str, Any]
+    scenarios: ScenarioGridSpec = ScenarioGridSpec()
 
 
 class ContractRecommendation(BaseModel):
@@ -31,3 +44,47 @@ class RecommendationResponse(BaseModel):
     confidence: float
     rationale: Dict[str, Any]
     disclosure: str
+    scenarios: Optional[Dict[str, Any]] = None
+
+
+class PortfolioPosition(BaseModel):
+    symbol: str
+    quantity: int  # contracts; negative when short
+    delta: float = 0.0
+    gamma: float = 0.0
+    theta: float = 0.0
+    vega: float = 0.0
+    mid: float = 0.0
+
+
+class PortfolioLimits(BaseModel):
+    risk_budget_pct: float = 0.10  # premium at risk across the book, share of capital
+    per_trade_pct: float = 0.02
+    max_new_positions: int = 5
+    min_score: float = 0.5
+    # Caps on |portfolio Greek| in position units (per-share Greek x 100 x contracts).
+    max_abs_delta: Optional[float] = None
+    max_abs_gamma: Optional[float] = None
+    max_abs_theta: Optional[float] = None
+    max_abs_vega: Optional[float] = None
+
+
+class PortfolioRequest(RecommendationRequest):
+    positions: List[PortfolioPosition] = []
+    limits: PortfolioLimits = PortfolioLimits()
+
+
+class PortfolioAllocation(BaseModel):
+    contract: ContractRecommendation
+    quantity: int
+    score: float
+    premium: float
+
+
+class PortfolioResponse(BaseModel):
+    allocations: List[PortfolioAllocation]
+    exposure: Dict[str, Dict[str, float]]
+    risk_budget: Dict[str, float]
+    rationale: Dict[str, Any]
+    disclosure: str
+    scenarios: Optional[Dict[str, Any]] = None
@@ -1,14 +1,34 @@
 from __future__ import annotations
 
+import os
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 import numpy as np
 
+from .batching import MicroBatcher
 from .feature_store import FeatureStoreClient, build_feature_store_client
 from .model_registry import ModelRegistry, build_registry
-from .schemas import ContractRecommendation, RecommendationRequest, RecommendationResponse
+from .portfolio import (
+    CONTRACT_MULTIPLIER,
+    GREEKS,
+    AllocationLimits,
+    allocate,
+    greek_matrix,
+    portfolio_exposure,
+)
+from .scenarios import ScenarioEngine
+from .schemas import (
+    ContractRecommendation,
+    PortfolioAllocation,
+    PortfolioRequest,
+    PortfolioResponse,
+    RecommendationRequest,
+    RecommendationResponse,
+)
+
+MAX_RANKED_CONTRACTS = 3
 
 
 @dataclass
@@ -23,9 +43,14 @@ class RecommendationEngine:
         self,
         feature_store: FeatureStoreClient | None = None,
         registry: ModelRegistry | None = None,
+        max_batch_size: int = 256,
+        max_batch_wait: float = 0.002,
+        scenarios: ScenarioEngine | None = None,
     ) -> None:
         self.feature_store = feature_store or build_feature_store_client()
+        self.scenarios = scenarios or ScenarioEngine()
         self.registry = registry or build_registry()
+        self.batcher = MicroBatcher(self.registry.predict_async, max_batch_size, max_batch_wait)
         self.rules = [
             StrategyRule(name="LONG_CALL", direction="CALL", min_confidence=0.55),
             StrategyRule(name="LONG_PUT", direction="PUT", min_confidence=0.55),
@@ -33,23 +58,26 @@ class RecommendationEngine:
         ]
 
     async def recommend(self, payload: RecommendationRequest) -> RecommendationResponse:
-        chain = payload.chain_snapshot.get("candidates", [])
         signals = payload.signals
-
-        contracts = [self._build_contract(candidate) for candidate in chain]
-        if not contracts:
-            raise ValueError("empty contract universe")
-
-        best_contract = max(contracts, key=lambda c: c.liquidity_score)
-        features = self._assemble_features(best_contract, signals, payload.request)
-        score = self.registry.predict(features)
-        score = float(max(0.0, min(score, 0.99)))
+        contracts, scores = await self._score_candidates(payload)
+        # Best model score first; equal scores fall back to the more liquid contract.
+        liquidity = np.array([c.liquidity_score for c in contracts])
+        ranking = np.lexsort((-liquidity, -scores))[:MAX_RANKED_CONTRACTS]
+        ranked = [contracts[index] for index in ranking]
+        best_contract, score = ranked[0], float(scores[ranking[0]])
         chosen_rule = self._select_rule(score)
 
         position = self._position_size(best_contract.mid, payload.request)
+        scenarios = self.scenarios.evaluate(
+            [best_contract], [position["contracts"]], payload.chain_snapshot, payload.scenarios
+        )
 
         rationale = {
             "summary": "Momentum supportive with contained event risk.",
+            "ranking": [
+                {"symbol": contracts[index].symbol, "score": float(scores[index])}
+                for index in ranking
+            ],
             "layers": {
                 "liquidity": {
                     "oi": payload.chain_snapshot.get("diagnostics", {}).get("universe", "n/a"),
@@ -80,13 +108,108 @@ class RecommendationEngine:
 
         return RecommendationResponse(
             decision=decision,
-            contracts=[best_contract],
+            contracts=ranked,
             position=position,
             confidence=score,
             rationale=rationale,
             disclosure="Educational information, not investment advice.",
+            scenarios=scenarios,
+        )
+
+    async def recommend_portfolio(self, payload: PortfolioRequest) -> PortfolioResponse:
+        """Allocate across the candidates given the user's book, Greek limits and risk budget."""
+        contracts, scores = await self._score_candidates(payload)
+        limits = payload.limits
+        capital = float(payload.request.get("capital_usd", 0))
+
+        positions = payload.positions
+        quantities = np.array([p.quantity for p in positions], dtype=float)
+        exposure = portfolio_exposure(greek_matrix(positions), quantities)
+        # Long premium is the most those positions can lose; shorts are not counted.
+        mids = np.array([p.mid for p in positions], dtype=float)
+        existing = CONTRACT_MULTIPLIER * float(np.maximum(quantities, 0) @ mids)
+        budget = capital * limits.risk_budget_pct
+
+        unit_cost = CONTRACT_MULTIPLIER * np.array([c.mid for c in contracts])
+        allocation = allocate(
+            scores,
+            unit_cost,
+            CONTRACT_MULTIPLIER * greek_matrix(contracts),
+            exposure,
+            AllocationLimits(
+                budget=budget - existing,
+                per_trade_cap=capital * limits.per_trade_pct,
+                greek_limits=np.array(
+                    [
+                        np.inf if limit is None else limit
+                        for limit in (
+                            limits.max_abs_delta,
+                            limits.max_abs_gamma,
+                            limits.max_abs_theta,
+                            limits.max_abs_vega,
+                        )
+                    ]
+                ),
+                max_new_positions=limits.max_new_positions,
+                min_score=limits.min_score,
+            ),
         )
 
+        allocations = [
+            PortfolioAllocation(
+                contract=contracts[index],
+                quantity=int(allocation.quantities[index]),
+                score=float(scores[index]),
+                premium=round(float(allocation.quantities[index] * unit_cost[index]), 2),
+            )
+            for index in allocation.order
+        ]
+        used = existing + allocation.budget_used
+        scenarios = self.scenarios.evaluate(
+            [allocated.contract for allocated in allocations],
+            [allocated.quantity for allocated in allocations],
+            payload.chain_snapshot,
+            payload.scenarios,
+        )
+        return PortfolioResponse(
+            allocations=allocations,
+            exposure={
+                "before": dict(zip(GREEKS, allocation.exposure_before.tolist(), strict=True)),
+                "after": dict(zip(GREEKS, allocation.exposure_after.tolist(), strict=True)),
+            },
+            risk_budget={
+                "budget": round(budget, 2),
+                "existing": round(existing, 2),
+                "allocated": round(allocation.budget_used, 2),
+                "remaining": round(budget - used, 2),
+                "utilization": used / budget if budget > 0 else 0.0,
+            },
+            rationale={
+                "summary": f"{len(allocations)} of {len(contracts)} candidates allocated.",
+                "eligible": int(np.count_nonzero(scores >= limits.min_score)),
+            },
+            disclosure="Educational information, not investment advice.",
+            scenarios=scenarios,
+        )
+
+    async def _score_candidates(
+        self, payload: RecommendationRequest
+    ) -> Tuple[List[ContractRecommendation], np.ndarray]:
+        contracts = [
+            self._build_contract(candidate)
+            for candidate in payload.chain_snapshot.get("candidates", [])
+        ]
+        if not contracts:
+            raise ValueError("empty contract universe")
+
+        feast_rows = await self.feature_store.get_online_features_batch_async(
+            [{"symbol": c.symbol, "expiry": c.expiry, "strike": c.strike} for c in contracts]
+        )
+        features = self._assemble_feature_matrix(
+            contracts, feast_rows, payload.signals, payload.request
+        )
+        return contracts, np.clip(await self.batcher.predict(features), 0.0, 0.99)
+
     def _build_contract(self, candidate: Dict[str, Any]) -> ContractRecommendation:
         return ContractRecommendation(
             symbol=candidate.get("symbol"),
@@ -101,23 +224,34 @@ class RecommendationEngine:
             liquidity_score=float(candidate.get("liquidity_score", 0)),
         )
 
-    def _assemble_features(self, contract: ContractRecommendation, signals: Dict[str, Any], request: Dict[str, Any]) -> np.ndarray:
-        liquidity = contract.liquidity_score / 100
+    def _assemble_feature_matrix(
+        self,
+        contracts: List[ContractRecommendation],
+        feast_rows: List[Dict[str, Any]],
+        signals: Dict[str, Any],
+        request: Dict[str, Any],
+    ) -> np.ndarray:
+        """One row of the six model features per contract; signal columns are shared."""
+        liquidity = np.array([c.liquidity_score for c in contracts]) / 100
         ivr = float(signals.get("iv_rank", 0))
         sentiment = float(signals.get("sentiment_score", 0))
         risk_bias = {"conservative": 0.4, "neutral": 0.5, "aggressive": 0.6}.get(request.get("risk_profile"), 0.5)
 
-        feast_features = self.feature_store.get_online_features(
-            {
-                "symbol": contract.symbol,
-                "expiry": contract.expiry,
-                "strike": contract.strike,
-            }
+        liquidity_scores = np.array(
+            [
+                float(row.get("options_liquidity_features:liquidity_score", default))
+                for row, default in zip(feast_rows, liquidity, strict=True)
+            ]
+        )
+        avg_open_interest = np.array(
+            [
+                float(row.get("options_liquidity_features:avg_open_interest", c.liquidity_score))
+                for row, c in zip(feast_rows, contracts, strict=True)
+            ]
         )
-        liquidity_score = float(feast_features.get("options_liquidity_features:liquidity_score", liquidity))
-        avg_open_interest = float(feast_features.get("options_liquidity_features:avg_open_interest", contract.liquidity_score))
 
-        return np.array([liquidity, ivr, sentiment, risk_bias, liquidity_score / 100, avg_open_interest / 1000])
+        shared = np.broadcast_to([ivr, sentiment, risk_bias], (len(contracts), 3))
+        return np.column_stack((liquidity, shared, liquidity_scores / 100, avg_open_interest / 1000))
 
     def _select_rule(self, score: float) -> StrategyRule:
         for rule in self.rules:
@@ -138,4 +272,11 @@ class RecommendationEngine:
 
 
 def build_engine() -> RecommendationEngine:
-    return RecommendationEngine()
+    return RecommendationEngine(
+        max_batch_size=int(os.getenv("RECOMMENDER_BATCH_MAX_SIZE", "256")),
+        max_batch_wait=float(os.getenv("RECOMMENDER_BATCH_MAX_WAIT_MS", "2")) / 1000,
+        scenarios=ScenarioEngine(
+            rate=float(os.getenv("RISK_FREE_RATE", "0.045")),
+            max_entries=int(os.getenv("SCENARIO_CACHE_MAX_ENTRIES", "256")),
+        ),
+    )
@@ -0,0 +1,77 @@
+"""Inference throughput in rows/sec: MLflow pyfunc vs the compiled NumPy fast path.
+
+Usage: ``python benchmarks/fast_path.py [--batch-sizes 1 20 256 4096]``
+
+Uses the pyfunc GBM from ``benchmarks/inference.py`` (100 trees of depth 3) and a ridge
+model behind the same wrapper. "pyfunc" is the registry serving the wrapper, "sklearn"
+calls the estimator directly (the floor without the wrapper's input handling) and "fast
+path" is the registry serving the artifact written by ``python -m app.fast_path``.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import mlflow
+import numpy as np
+from inference import FeatureModel, save_model
+from sklearn.linear_model import Ridge
+
+from app.fast_path import export_fast_path
+from app.model_registry import ModelRegistry
+
+
+def save_ridge(directory: str) -> str:
+    rng = np.random.default_rng(0)
+    features = rng.random((2000, 6))
+    target = features @ [0.3, 0.1, 0.2, 0.1, 0.2, 0.1] + rng.normal(0, 0.02, 2000)
+    path = os.path.join(directory, "ridge")
+    mlflow.pyfunc.save_model(path, python_model=FeatureModel(Ridge().fit(features, target)))
+    return path
+
+
+def rows_per_second(predict, rows: np.ndarray, budget: float = 0.5) -> float:
+    predict(rows)
+    calls, start = 0, time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < budget:
+        predict(rows)
+        calls += 1
+    return calls * len(rows) / elapsed
+
+
+async def loaded(uri: str, use_fast_path: bool) -> ModelRegistry:
+    registry = ModelRegistry(uri, use_fast_path=use_fast_path)
+    await registry.wait_ready()
+    return registry
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 20, 256, 4096])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name, uri in (("gbm", save_model(directory)), ("ridge", save_ridge(directory))):
+            export_fast_path(uri)
+            pyfunc = asyncio.run(loaded(uri, use_fast_path=False))
+            fast = asyncio.run(loaded(uri, use_fast_path=True))
+            estimator = mlflow.pyfunc.load_model(uri).unwrap_python_model().model
+            for size in args.batch_sizes:
+                rows = np.random.default_rng(size).random((size, 6))
+                rates = {
+                    "pyfunc": rows_per_second(pyfunc.predict_batch, rows),
+                    "sklearn": rows_per_second(estimator.predict, rows),
+                    "fast path": rows_per_second(fast.predict_batch, rows),
+                }
+                print(
+                    f"{name:>5} batch {size:>5}: "
+                    + "  ".join(f"{key}={rate:12,.0f} rows/s" for key, rate in rates.items())
+                    + f"  ({rates['fast path'] / rates['pyfunc']:5.1f}x pyfunc)"
+                )
+
+
+if __name__ == "__main__":
+    main()
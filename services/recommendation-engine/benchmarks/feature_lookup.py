@@ -0,0 +1,152 @@
+"""Online feature lookups per request: per-row calls vs one batched call vs the cache.
+
+Usage: ``python benchmarks/feature_lookup.py [--requests 2000] [--candidates 20] [--rtt-ms 0.5]``
+
+The online store is a SQLite stand-in with Feast's call shape (column-wise results,
+``None`` for unknown entities) holding ``--entities`` contracts; each call also sleeps
+``--rtt-ms`` for the network round trip to a real online store. Requests draw
+``--candidates`` contracts from a Zipf-skewed universe (a few underlyings are most of the
+traffic) with 5% unknown contracts. "per-row" is the old one-call-per-candidate path,
+"batched" sends every candidate in one call, "cold" and "warm" add the in-process cache
+(first and second pass over the workload) and "stale" runs with every entry past its
+TTL, so rows are served stale and refreshed in the background.
+"""
+from __future__ import annotations
+
+import argparse
+import pathlib
+import sqlite3
+import sys
+import threading
+import time
+from functools import partial
+from typing import Dict, List
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+
+from app.feature_store import FeatureStoreClient  # noqa: E402
+
+COLUMNS = ("avg_open_interest", "avg_volume", "liquidity_score")
+
+
+class SQLiteOnlineStore:
+    def __init__(self, entities: int, rtt: float) -> None:
+        self.rtt = rtt
+        self.calls = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(":memory:", check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE features (symbol TEXT, expiry TEXT, strike REAL, avg_open_interest "
+            "INTEGER, avg_volume INTEGER, liquidity_score REAL, "
+            "PRIMARY KEY (symbol, expiry, strike))"
+        )
+        rng = np.random.default_rng(0)
+        self._db.executemany(
+            "INSERT INTO features VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (*contract(i), int(rng.integers(0, 5000)), int(rng.integers(0, 900)),
+                 float(rng.uniform(0, 100)))
+                for i in range(entities)
+            ],
+        )
+
+    def get_online_features(self, features, entity_rows):
+        time.sleep(self.rtt)
+        keys = [(r["symbol"], r["expiry"], float(r["strike"])) for r in entity_rows]
+        query = (
+            f"SELECT {', '.join(COLUMNS)} FROM features "
+            "WHERE symbol = ? AND expiry = ? AND strike = ?"
+        )
+        with self._lock:
+            self.calls += 1
+            # Point reads on the primary key, like the per-entity reads a Redis pipeline does.
+            found = {key: self._db.execute(query, key).fetchone() for key in keys}
+        columns: Dict[str, List] = {name: [] for name in COLUMNS}
+        for key in keys:
+            values = found.get(key)
+            for index, name in enumerate(COLUMNS):
+                columns[name].append(values[index] if values else None)
+        return type("OnlineResponse", (), {"to_dict": lambda self: columns})()
+
+
+def contract(index: int):
+    return f"U{index // 200:03d}", f"2025-{1 + index % 12:02d}-17", float(50 + index % 200)
+
+
+def request_rows(rng, requests: int, candidates: int, entities: int):
+    picks = np.minimum(rng.zipf(1.3, (requests, candidates)), entities) - 1
+    unknown = rng.random((requests, candidates)) < 0.05
+    out = []
+    for request, missing in zip(picks, unknown, strict=True):
+        rows = []
+        for pick, absent in zip(request, missing, strict=True):
+            symbol, expiry, strike = contract(int(pick))
+            rows.append({"symbol": "?" + symbol if absent else symbol, "expiry": expiry,
+                         "strike": strike})
+        out.append(rows)
+    return out
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.offset = 0.0
+
+    def __call__(self) -> float:
+        return time.monotonic() + self.offset
+
+
+def per_row(client: FeatureStoreClient, rows) -> None:
+    for row in rows:
+        client.get_online_features(row)
+
+
+def run(name: str, lookup, store: SQLiteOnlineStore, workload) -> None:
+    calls = store.calls
+    latencies = []
+    for rows in workload:
+        start = time.perf_counter()
+        lookup(rows)
+        latencies.append(time.perf_counter() - start)
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1e3
+    print(
+        f"{name:>8}: {len(workload) / sum(latencies):8.0f} req/s  p50={p50:6.3f}ms "
+        f"p99={p99:6.3f}ms  store calls/request={(store.calls - calls) / len(workload):5.2f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--candidates", type=int, default=20)
+    parser.add_argument("--entities", type=int, default=50_000)
+    parser.add_argument("--rtt-ms", type=float, default=0.5)
+    args = parser.parse_args()
+
+    store = SQLiteOnlineStore(args.entities, args.rtt_ms / 1000)
+    workload = request_rows(
+        np.random.default_rng(1), args.requests, args.candidates, args.entities
+    )
+    uncached = FeatureStoreClient(store=store, ttl_seconds=0)
+    clock = Clock()
+    cached = FeatureStoreClient(store=store, ttl_seconds=300, clock=clock)
+
+    run("per-row", partial(per_row, uncached), store, workload[: len(workload) // 10])
+    run("batched", uncached.get_online_features_batch, store, workload)
+    run("cold", cached.get_online_features_batch, store, workload)
+    run("warm", cached.get_online_features_batch, store, workload)
+    clock.offset += 301
+    run("stale", cached.get_online_features_batch, store, workload)
+    cached.close()
+    stats = cached.stats()
+    print(
+        f"cache: {stats['size']} entries, hit rate {stats['hit_rate']:.3f}, "
+        f"{stats['stale_hits']} stale hits, {stats['refreshes']} background refreshes"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Per-candidate vs batched model scoring, and cross-request micro-batching.
+
+Usage: ``python benchmarks/inference.py [--candidates 50] [--requests 200]``
+
+Scores with a real MLflow pyfunc model (a scikit-learn GBM behind a ``{"features": ...}``
+wrapper, like the registry's production contract) saved to a temporary directory.
+"per-candidate" makes one ``predict`` call per contract, "batched" one ``predict_batch``
+call per request, and "micro-batched" runs ``--requests`` concurrent requests through
+:class:`MicroBatcher` with and without a wait window.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import pathlib
+import sys
+import tempfile
+import time
+import warnings
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+os.environ.setdefault("MLFLOW_DISABLE_AGENT_HINT", "1")
+warnings.filterwarnings("ignore", category=UserWarning)
+
+import mlflow  # noqa: E402
+import numpy as np  # noqa: E402
+from sklearn.ensemble import GradientBoostingRegressor  # noqa: E402
+
+from app.batching import MicroBatcher  # noqa: E402
+from app.model_registry import ModelRegistry  # noqa: E402
+
+logging.getLogger("mlflow").setLevel(logging.ERROR)
+
+
+class FeatureModel(mlflow.pyfunc.PythonModel):
+    def __init__(self, model) -> None:
+        self.model = model
+
+    def predict(self, context, model_input, params=None):
+        return self.model.predict(np.asarray(model_input["features"]))
+
+
+def save_model(directory: str, seed: int = 0) -> str:
+    """Train a small GBM on the six recommender features and save it as a pyfunc model."""
+    rng = np.random.default_rng(seed)
+    features = rng.random((2000, 6))
+    target = features @ [0.3, 0.1, 0.2, 0.1, 0.2, 0.1] + rng.normal(0, 0.02, 2000)
+    model = GradientBoostingRegressor(n_estimators=100, max_depth=3).fit(features, target)
+    path = os.path.join(directory, "model")
+    mlflow.pyfunc.save_model(path, python_model=FeatureModel(model))
+    return path
+
+
+def best_of(fn, repeat: int = 3) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+async def concurrent(batcher: MicroBatcher, requests: int, candidates: int) -> float:
+    rows = np.random.default_rng(1).random((candidates, 6))
+    start = time.perf_counter()
+    await asyncio.gather(*(batcher.predict(rows) for _ in range(requests)))
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--candidates", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--max-batch", type=int, default=1024)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        registry = ModelRegistry(save_model(directory))
+        rows = np.random.default_rng(2).random((args.candidates, 6))
+
+        single = best_of(lambda: [registry.predict(row) for row in rows])
+        batched = best_of(lambda: registry.predict_batch(rows))
+        print(
+            f"{args.candidates} candidates/request: per-candidate {single * 1e3:7.2f}ms, "
+            f"batched {batched * 1e3:6.2f}ms ({single / batched:.0f}x)"
+        )
+
+        for wait_ms in (0.0, 2.0):
+            batcher = MicroBatcher(registry.predict_batch, args.max_batch, wait_ms / 1000)
+            elapsed = asyncio.run(concurrent(batcher, args.requests, args.candidates))
+            stats = batcher.stats()
+            print(
+                f"{args.requests} concurrent requests, max_wait={wait_ms:g}ms: "
+                f"{elapsed * 1e3:7.1f}ms total, {args.requests / elapsed:7.0f} req/s, "
+                f"{stats['model_calls']} model calls (avg {stats['avg_batch_rows']:.0f} rows)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Model startup, first-request latency, steady-state throughput and hot reload.
+
+Usage: ``python benchmarks/model_lifecycle.py [--requests 2000] [--candidates 20]``
+
+Uses the pyfunc GBM from ``benchmarks/inference.py``. "startup" compares the old
+synchronous ``load_model`` at import time (the app could not serve anything until it
+returned) with :meth:`ModelRegistry.start`, which returns at once and loads in the
+background. "first request" is the first predict on a freshly loaded model without and
+with the registry's warm-up. "steady state" pushes concurrent requests through the
+micro-batcher with inference on the event loop vs on the inference executor, and
+"reload" swaps model generations while that traffic runs.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Tuple
+
+import mlflow
+import numpy as np
+from inference import save_model
+
+from app.batching import MicroBatcher
+from app.model_registry import ModelRegistry
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+OLD_STARTUP = """
+import time
+start = time.perf_counter()
+import mlflow.pyfunc
+mlflow.pyfunc.load_model(URI)
+print(time.perf_counter() - start, time.perf_counter() - start)
+"""
+NEW_STARTUP = """
+import asyncio, time
+start = time.perf_counter()
+from app.model_registry import ModelRegistry
+async def main():
+    registry = ModelRegistry(URI)
+    await registry.start()
+    serving = time.perf_counter() - start
+    await registry.wait_ready()
+    print(serving, time.perf_counter() - start)
+asyncio.run(main())
+"""
+
+
+def fresh_worker(script: str, uri: str) -> Tuple[float, float]:
+    """``(seconds until the worker can serve, seconds until the model is ready)`` in a
+    fresh interpreter, so imports are paid the way a cold worker pays them."""
+    benchmarks = os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run(
+        [sys.executable, "-c", script.replace("URI", repr(uri))],
+        capture_output=True,
+        text=True,
+        check=True,
+        # The pickled wrapper class lives in benchmarks/inference.py.
+        env={**os.environ, "PYTHONPATH": os.pathsep.join([benchmarks, str(ROOT)])},
+    )
+    serving, ready = result.stdout.strip().splitlines()[-1].split()
+    return float(serving), float(ready)
+
+
+async def steady_state(registry: ModelRegistry, predict, requests: int, rows: np.ndarray):
+    batcher = MicroBatcher(predict, max_batch_size=512, max_wait=0.002)
+    latencies = []
+    gate = asyncio.Semaphore(64)  # concurrent clients
+
+    async def one():
+        async with gate:
+            start = time.perf_counter()
+            await batcher.predict(rows)
+            latencies.append(time.perf_counter() - start)
+
+    async def ticker(lags):
+        # How late a 1ms timer fires: time the loop spent unable to serve anything else.
+        while True:
+            due = time.perf_counter() + 0.001
+            await asyncio.sleep(0.001)
+            lags.append(time.perf_counter() - due)
+
+    lags = []
+    tick = asyncio.ensure_future(ticker(lags))
+    start = time.perf_counter()
+    results = await asyncio.gather(*(one() for _ in range(requests)), return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    tick.cancel()
+    failures = sum(isinstance(r, Exception) for r in results)
+    return requests / elapsed, np.percentile(latencies, 99) * 1e3, max(lags) * 1e3, failures
+
+
+async def run(args, uris) -> None:
+    rows = np.random.default_rng(3).random((args.candidates, 6))
+
+    for name, script in (("import-time load", OLD_STARTUP), ("background load", NEW_STARTUP)):
+        serving, ready = fresh_worker(script, uris[0])
+        print(
+            f"startup ({name}): serving after {serving * 1e3:7.1f}ms, "
+            f"model ready after {ready * 1e3:7.1f}ms"
+        )
+    registry = ModelRegistry(uris[0])
+
+    cold = mlflow.pyfunc.load_model(uris[1])
+    start = time.perf_counter()
+    cold.predict({"features": rows})
+    unwarmed = time.perf_counter() - start
+    await registry.reload(uris[1])
+    start = time.perf_counter()
+    await registry.predict_async(rows)
+    warmed = time.perf_counter() - start
+    print(f"first request: unwarmed {unwarmed * 1e3:6.2f}ms, warmed {warmed * 1e3:6.2f}ms")
+
+    async def on_loop(features):
+        return registry.predict_batch(features)
+
+    for name, predict in (("on loop", on_loop), ("executor", registry.predict_async)):
+        rate, p99, lag, _ = await steady_state(registry, predict, args.requests, rows)
+        print(
+            f"steady state ({name}): {rate:7.0f} req/s, p99 {p99:6.2f}ms, "
+            f"max loop lag {lag:6.2f}ms"
+        )
+
+    traffic = asyncio.ensure_future(
+        steady_state(registry, registry.predict_async, args.requests * 2, rows)
+    )
+    generations = 0
+    while not traffic.done():
+        await registry.reload(uris[generations % 2])
+        generations += 1
+    rate, p99, _, failures = await traffic
+    print(
+        f"reload: {generations} swaps under load, {rate:7.0f} req/s, p99 {p99:6.2f}ms, "
+        f"{failures} failed requests"
+    )
+    await registry.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--candidates", type=int, default=20)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        uris = [save_model(f"{directory}/a", seed=0), save_model(f"{directory}/b", seed=1)]
+        asyncio.run(run(args, uris))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Portfolio-mode latency as candidates, held positions and new-position slots grow.
+
+Usage: ``python benchmarks/portfolio.py [--candidates 100 300 1000 3000] [--positions 10 50 200]``
+
+"allocate" times the optimizer alone; "request" is the whole
+``RecommendationEngine.recommend_portfolio`` call (contract parsing, feature matrix,
+micro-batched scoring with the registry's fallback scorer, exposure aggregation,
+allocation and response building). Delta and vega limits are set tight enough to bind.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import pathlib
+import sys
+import time
+from functools import partial
+from typing import Dict, List
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+
+from app.feature_store import FeatureStoreClient  # noqa: E402
+from app.model_registry import ModelRegistry  # noqa: E402
+from app.portfolio import (  # noqa: E402
+    CONTRACT_MULTIPLIER,
+    AllocationLimits,
+    allocate,
+    greek_matrix,
+    portfolio_exposure,
+)
+from app.schemas import PortfolioRequest  # noqa: E402
+from app.service import RecommendationEngine  # noqa: E402
+
+
+def greeks(rng, size: int) -> List[Dict]:
+    sign = rng.choice([-1.0, 1.0], size)
+    return [
+        {"delta": float(sign[i] * rng.uniform(0.1, 0.7)), "gamma": float(rng.uniform(0, 0.05)),
+         "theta": float(-rng.uniform(0, 0.1)), "vega": float(rng.uniform(0, 0.3)),
+         "mid": float(rng.uniform(0.5, 8))}
+        for i in range(size)
+    ]
+
+
+def build_request(candidates: int, positions: int, slots: int) -> PortfolioRequest:
+    rng = np.random.default_rng(candidates + positions)
+    return PortfolioRequest(
+        user_id="bench",
+        market_data_url="http://localhost",
+        chain_snapshot={
+            "candidates": [
+                {"symbol": f"C{i}", "strike": 100 + i % 40, "expiry": "2025-03-21",
+                 "implied_vol": 0.3, "liquidity_score": int(rng.integers(0, 101)), **row}
+                for i, row in enumerate(greeks(rng, candidates))
+            ]
+        },
+        signals={"iv_rank": 0.6, "sentiment_score": 0.7},
+        request={"capital_usd": 2_000_000},
+        positions=[
+            {"symbol": f"P{i}", "quantity": int(rng.integers(-10, 11)), **row}
+            for i, row in enumerate(greeks(rng, positions))
+        ],
+        limits={"risk_budget_pct": 0.25, "per_trade_pct": 0.005, "max_abs_delta": 5_000,
+                "max_abs_vega": 4_000, "max_new_positions": slots, "min_score": 0.0},
+    )
+
+
+def best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+async def run(args) -> None:
+    engine = RecommendationEngine(feature_store=FeatureStoreClient(), registry=ModelRegistry())
+    await engine.registry.wait_ready()
+    for slots in args.slots:
+        for positions in args.positions:
+            for candidates in args.candidates:
+                request = build_request(candidates, positions, slots)
+                chain = request.chain_snapshot["candidates"]
+                contracts = [engine._build_contract(candidate) for candidate in chain]
+                scores = np.random.default_rng(0).random(candidates)
+                unit_cost = CONTRACT_MULTIPLIER * np.array([c.mid for c in contracts])
+                unit_greeks = CONTRACT_MULTIPLIER * greek_matrix(contracts)
+                exposure = portfolio_exposure(
+                    greek_matrix(request.positions),
+                    np.array([p.quantity for p in request.positions], dtype=float),
+                )
+                limits = AllocationLimits(
+                    100_000, 10_000, np.array([5_000, np.inf, np.inf, 4_000]), slots, 0.0
+                )
+                optimizer = best_of(
+                    partial(allocate, scores, unit_cost, unit_greeks, exposure, limits), args.repeat
+                )
+                timings = []
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    response = await engine.recommend_portfolio(request)
+                    timings.append(time.perf_counter() - start)
+                print(
+                    f"{candidates:>5} candidates {positions:>4} positions {slots:>3} slots: "
+                    f"allocate {optimizer * 1e3:6.3f}ms  request {min(timings) * 1e3:7.2f}ms  "
+                    f"({len(response.allocations)} allocated, "
+                    f"budget {response.risk_budget['utilization']:.0%})"
+                )
+    await engine.registry.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--candidates", type=int, nargs="+", default=[100, 300, 1000, 3000])
+    parser.add_argument("--positions", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--slots", type=int, nargs="+", default=[5, 25])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
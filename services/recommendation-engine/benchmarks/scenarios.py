@@ -0,0 +1,129 @@
+"""Stress-grid repricing: grid size x legs, cold and cached, vs a per-point Python loop.
+
+Usage: ``python benchmarks/scenarios.py [--legs 1 5 20]``
+
+Legs are calls and puts across strikes and expiries (some expiring inside the grid).
+"grid" is :func:`reprice` alone, "cold" the whole :meth:`ScenarioEngine.evaluate`
+(leg building, repricing, VaR stats, JSON-ready lists) and "cached" the same request
+against the same snapshot. "loop" prices every grid point and leg with scalar ``math``
+calls, on the default grid only.
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import pathlib
+import sys
+import time
+from datetime import datetime, timedelta
+from functools import partial
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+from scipy.special import ndtr  # noqa: E402
+
+from app.scenarios import ScenarioEngine, build_legs, grid_axes, reprice  # noqa: E402
+from app.schemas import ContractRecommendation, ScenarioGridSpec  # noqa: E402
+
+NOW = datetime(2025, 1, 2, 15, 30)
+RATE = 0.045
+GRIDS = {
+    "default 41x11x4": ScenarioGridSpec(),
+    "100x50x30": ScenarioGridSpec(spot_steps=100, vol_steps=50, day_steps=30, days_forward=45),
+}
+
+
+def contracts(count: int):
+    rng = np.random.default_rng(count)
+    out = []
+    for i in range(count):
+        days = int(rng.integers(7, 120))
+        strike = float(np.round(100 * np.exp(rng.uniform(-0.2, 0.2))))
+        vol = float(rng.uniform(0.15, 0.6))
+        call = i % 2 == 0
+        years = days / 365
+        d1 = (math.log(100 / strike) + (RATE + 0.5 * vol**2) * years) / (vol * math.sqrt(years))
+        out.append(
+            ContractRecommendation(
+                symbol=f"X {strike:g}{'C' if call else 'P'} {i}",
+                strike=strike,
+                expiry=(NOW + timedelta(days=days)).date().isoformat(),
+                delta=float(ndtr(d1)) - (0 if call else 1),
+                gamma=0, theta=0, vega=0, implied_vol=vol, mid=1.0, liquidity_score=50,
+            )
+        )
+    return out, [int(q) or 1 for q in rng.integers(-5, 6, count)]
+
+
+def loop_reprice(legs, moves, shifts, days) -> np.ndarray:
+    def price(spot, strike, years, vol, call):
+        if years <= 0:
+            return max(spot - strike, 0) if call else max(strike - spot, 0)
+        spread = vol * math.sqrt(years)
+        d1 = (math.log(spot / strike) + (RATE + 0.5 * vol * vol) * years) / spread
+        n1 = 0.5 * math.erfc(-d1 / math.sqrt(2))
+        n2 = 0.5 * math.erfc(-(d1 - spread) / math.sqrt(2))
+        value = spot * n1 - strike * math.exp(-RATE * years) * n2
+        return value if call else value - spot + strike * math.exp(-RATE * years)
+
+    out = np.zeros((len(moves), len(shifts), len(days)))
+    for leg in range(len(legs)):
+        s0, k, t0 = legs.spot[leg], legs.strike[leg], legs.years[leg]
+        v0, call, weight = legs.vol[leg], bool(legs.is_call[leg]), legs.quantity[leg] * 100
+        base = price(s0, k, t0, v0, call)
+        for i, move in enumerate(moves):
+            for j, shift in enumerate(shifts):
+                for n, day in enumerate(days):
+                    value = price(s0 * (1 + move), k, t0 - day / 365, max(v0 + shift, 0.01), call)
+                    out[i, j, n] += weight * (value - base)
+    return out
+
+
+def evaluate_cold(request) -> None:
+    ScenarioEngine(RATE).evaluate(*request)
+
+
+def best_of(fn, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--legs", type=int, nargs="+", default=[1, 5, 20])
+    args = parser.parse_args()
+    snapshot = {"symbol": "X", "timestamp": NOW.isoformat()}
+
+    for name, spec in GRIDS.items():
+        moves, shifts, days = grid_axes(spec)
+        for count in args.legs:
+            chosen, quantities = contracts(count)
+            legs, _ = build_legs(chosen, quantities, None, NOW, RATE)
+            request = (chosen, quantities, snapshot, spec, NOW)
+            grid = best_of(partial(reprice, legs, moves, shifts, days, RATE))
+            cold = best_of(partial(evaluate_cold, request))
+            engine = ScenarioEngine(RATE)
+            engine.evaluate(*request)
+            cached = best_of(partial(engine.evaluate, *request))
+            line = (
+                f"{name:>16} {count:>3} legs: grid {grid * 1e3:8.2f}ms  cold {cold * 1e3:8.2f}ms"
+                f"  cached {cached * 1e6:6.1f}us"
+            )
+            if spec is GRIDS["default 41x11x4"]:
+                start = time.perf_counter()
+                expected = loop_reprice(legs, moves, shifts, days)
+                loop = time.perf_counter() - start
+                assert np.allclose(expected, reprice(legs, moves, shifts, days, RATE), atol=1e-6)
+                line += f"  loop {loop * 1e3:8.2f}ms"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+import asyncio
 import pathlib
 import sys
 
@@ -8,6 +9,7 @@ ROOT = pathlib.Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+from app.batching import MicroBatcher
 from app.feature_store import FeatureStoreClient
 from app.model_registry import ModelRegistry
 from app.schemas import RecommendationRequest
@@ -18,19 +20,27 @@ class StubFeatureStore(FeatureStoreClient):
     def __init__(self):
         pass
 
-    def get_online_features(self, entity_rows):
-        return {
-            "options_liquidity_features:liquidity_score": 85,
-            "options_liquidity_features:avg_open_interest": 2200,
-        }
+    async def get_online_features_batch_async(self, entity_rows):
+        return self.get_online_features_batch(entity_rows)
+
+    def get_online_features_batch(self, entity_rows):
+        return [
+            {
+                "options_liquidity_features:liquidity_score": 85,
+                "options_liquidity_features:avg_open_interest": 2200,
+            }
+            for _ in entity_rows
+        ]
 
 
 class StubRegistry(ModelRegistry):
     def __init__(self):
-        pass
+        super().__init__()
+        self.calls = []
 
-    def predict(self, features: np.ndarray) -> float:
-        return float(min(0.9, features.mean()))
+    def predict_batch(self, features: np.ndarray) -> np.ndarray:
+        self.calls.append(len(features))
+        return np.minimum(0.9, features.mean(axis=1))
 
 
 @pytest.mark.asyncio
@@ -71,3 +81,67 @@ async def test_recommendation_engine_returns_payload():
     assert response.decision["direction"] in {"CALL", "PUT"}
     assert response.contracts
     assert 0 <= response.confidence <= 1
+
+
+def candidate(symbol, liquidity_score, implied_vol=0.3):
+    return {
+        "symbol": symbol,
+        "strike": 100,
+        "expiry": "2025-01-17",
+        "implied_vol": implied_vol,
+        "mid": 1.5,
+        "liquidity_score": liquidity_score,
+    }
+
+
+class LiquidityStore(StubFeatureStore):
+    """Feast values that rank contracts opposite to their snapshot liquidity."""
+
+    def get_online_features_batch(self, entity_rows):
+        return [
+            {"options_liquidity_features:avg_open_interest": {"B": 5000}.get(row["symbol"], 0)}
+            for row in entity_rows
+        ]
+
+
+@pytest.mark.asyncio
+async def test_recommend_scores_every_candidate_in_one_call_and_ranks_by_model():
+    registry = StubRegistry()
+    engine = RecommendationEngine(feature_store=LiquidityStore(), registry=registry)
+    request = RecommendationRequest(
+        user_id="user123",
+        market_data_url="http://localhost",
+        chain_snapshot={
+            "candidates": [candidate("A", 95), candidate("B", 40), candidate("C", 60)]
+        },
+        signals={},
+        request={"capital_usd": 5000},
+    )
+
+    response = await engine.recommend(request)
+
+    assert registry.calls == [3]
+    assert [c.symbol for c in response.contracts] == ["B", "A", "C"]
+    ranking = response.rationale["ranking"]
+    assert ranking[0]["score"] == response.confidence
+    assert ranking[0]["score"] >= ranking[1]["score"] >= ranking[2]["score"]
+
+
+@pytest.mark.asyncio
+async def test_micro_batcher_coalesces_concurrent_requests():
+    calls = []
+
+    async def predict_batch(features):
+        calls.append(len(features))
+        return features[:, 0] * 2
+
+    batcher = MicroBatcher(predict_batch, max_batch_size=4, max_wait=0.01)
+    requests = [np.full((rows, 2), float(i)) for i, rows in enumerate((1, 2, 1, 3))]
+
+    results = await asyncio.gather(*(batcher.predict(rows) for rows in requests))
+
+    # The first three fill a batch of 4 and flush at once; the last waits out the window.
+    assert calls == [4, 3]
+    for index, (rows, scores) in enumerate(zip(requests, results, strict=True)):
+        assert np.array_equal(scores, np.full(len(rows), 2.0 * index))
+    assert batcher.stats()["model_calls"] == 2
@@ -0,0 +1,75 @@
+import os
+import pathlib
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+os.environ.setdefault("MLFLOW_DISABLE_AGENT_HINT", "1")
+
+import mlflow
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import Ridge
+from sklearn.neighbors import KNeighborsRegressor
+from sklearn.tree import DecisionTreeRegressor
+
+from app.fast_path import FAST_PATH_FILE, UnsupportedModel, export_fast_path
+from app.model_registry import ModelRegistry
+
+
+class FeatureModel(mlflow.pyfunc.PythonModel):
+    def __init__(self, model):
+        self.model = model
+
+    def predict(self, context, model_input, params=None):
+        return self.model.predict(np.asarray(model_input["features"]))
+
+
+def save(estimator, path):
+    rng = np.random.default_rng(0)
+    features = rng.random((500, 6))
+    target = features @ [0.3, 0.1, 0.2, 0.1, 0.2, 0.1] + rng.normal(0, 0.02, 500)
+    mlflow.pyfunc.save_model(str(path), python_model=FeatureModel(estimator.fit(features, target)))
+    return str(path)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "estimator",
+    [
+        Ridge(alpha=0.1),
+        DecisionTreeRegressor(max_depth=6),
+        RandomForestRegressor(n_estimators=20, max_depth=5, random_state=0),
+        GradientBoostingRegressor(n_estimators=50, max_depth=3, random_state=0),
+    ],
+    ids=lambda estimator: type(estimator).__name__,
+)
+async def test_fast_path_matches_pyfunc_and_is_preferred(estimator, tmp_path):
+    uri = save(estimator, tmp_path / "model")
+    rows = np.random.default_rng(5).normal(0.5, 0.4, (300, 6))
+    expected = mlflow.pyfunc.load_model(uri).predict({"features": rows})
+
+    export_fast_path(uri)
+    registry = ModelRegistry(uri)
+    await registry.wait_ready()
+
+    assert registry.stats()["fast_path"]
+    np.testing.assert_allclose(registry.predict_batch(rows), expected, rtol=1e-12)
+    await registry.aclose()
+
+
+@pytest.mark.asyncio
+async def test_unsupported_models_keep_the_pyfunc_path(tmp_path):
+    uri = save(KNeighborsRegressor(), tmp_path / "model")
+
+    with pytest.raises(UnsupportedModel):
+        export_fast_path(uri)
+    registry = ModelRegistry(uri)
+    await registry.wait_ready()
+
+    assert not (tmp_path / "model" / FAST_PATH_FILE).exists()
+    assert not registry.stats()["fast_path"]
+    await registry.aclose()
@@ -0,0 +1,139 @@
+import asyncio
+import pathlib
+import sys
+import threading
+import time
+
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.feature_store import FeatureStoreClient
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeOnlineStore:
+    """Feast-shaped online store: column-wise results, None for unknown entities."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+        self.threads = []
+
+    def get_online_features(self, features, entity_rows):
+        self.threads.append(threading.current_thread())
+        self.calls.append([row["symbol"] for row in entity_rows])
+        found = [self.rows.get(row["symbol"]) for row in entity_rows]
+        columns = {
+            name: [values[name] if values else None for values in found]
+            for name in ("avg_open_interest", "avg_volume", "liquidity_score")
+        }
+        columns["symbol"] = [row["symbol"] for row in entity_rows]
+        return type("Response", (), {"to_dict": lambda self: columns})()
+
+
+def rows(*symbols):
+    return [{"symbol": symbol, "expiry": "2025-01-17", "strike": 100} for symbol in symbols]
+
+
+def values(score):
+    return {"avg_open_interest": 1000, "avg_volume": 50, "liquidity_score": score}
+
+
+def test_batch_lookup_makes_one_store_call_and_caches_hits_and_misses():
+    store = FakeOnlineStore({"A": values(80), "B": values(60)})
+    client = FeatureStoreClient(store=store, clock=Clock())
+
+    first = client.get_online_features_batch(rows("A", "B", "A", "GONE"))
+    second = client.get_online_features_batch(rows("B", "GONE", "A"))
+
+    assert store.calls == [["A", "B", "GONE"]]
+    assert first[0] == first[2] == second[2]
+    assert first[1]["options_liquidity_features:liquidity_score"] == 60
+    assert first[3] == second[1] == {}
+    stats = client.stats()
+    assert (stats["hits"], stats["negative_hits"], stats["misses"]) == (2, 1, 3)
+
+
+def test_negative_entries_expire_before_positive_ones():
+    clock = Clock()
+    store = FakeOnlineStore({"A": values(80)})
+    client = FeatureStoreClient(
+        store=store, ttl_seconds=300, negative_ttl_seconds=60, clock=clock
+    )
+    client.get_online_features_batch(rows("A", "NEW"))
+    store.rows["NEW"] = values(40)
+
+    clock.now = 61
+    refreshed = client.get_online_features_batch(rows("A", "NEW"))
+
+    assert store.calls == [["A", "NEW"], ["NEW"]]
+    assert refreshed[1]["options_liquidity_features:liquidity_score"] == 40
+
+
+def test_stale_rows_are_served_while_one_batched_refresh_runs():
+    clock = Clock()
+    store = FakeOnlineStore({"A": values(80), "B": values(60)})
+    client = FeatureStoreClient(store=store, ttl_seconds=300, clock=clock)
+    client.get_online_features_batch(rows("A", "B"))
+    store.rows["A"] = values(10)
+
+    clock.now = 301
+    stale = client.get_online_features_batch(rows("A", "B"))
+    client.close()
+    fresh = client.get_online_features_batch(rows("A", "B"))
+
+    assert stale[0]["options_liquidity_features:liquidity_score"] == 80
+    assert fresh[0]["options_liquidity_features:liquidity_score"] == 10
+    assert store.calls == [["A", "B"], ["A", "B"]]
+    assert client.stats()["refreshes"] == 1
+
+
+def test_rows_past_the_stale_window_are_fetched_again_not_served():
+    clock = Clock()
+    store = FakeOnlineStore({"A": values(80)})
+    client = FeatureStoreClient(
+        store=store, ttl_seconds=300, max_stale_seconds=900, clock=clock
+    )
+    client.get_online_features_batch(rows("A"))
+    store.rows["A"] = values(10)
+
+    clock.now = 901
+    expired = client.get_online_features_batch(rows("A"))
+
+    assert expired[0]["options_liquidity_features:liquidity_score"] == 10
+    assert client.stats()["stale_hits"] == 0
+
+
+@pytest.mark.asyncio
+async def test_async_lookup_fetches_misses_off_the_event_loop():
+    store = FakeOnlineStore({"A": values(80)})
+    client = FeatureStoreClient(store=store, clock=Clock())
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0)
+
+    slow_fetch = store.get_online_features
+    store.get_online_features = lambda **kw: (time.sleep(0.05), slow_fetch(**kw))[1]
+    task = asyncio.create_task(ticker())
+    first = await client.get_online_features_batch_async(rows("A", "GONE"))
+    second = await client.get_online_features_batch_async(rows("A"))
+    task.cancel()
+
+    assert store.threads[0] is not threading.main_thread() and ticks > 1
+    assert first[0] == second[0] and first[1] == {}
+    assert store.calls == [["A", "GONE"]]
@@ -0,0 +1,103 @@
+import asyncio
+import os
+import pathlib
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+os.environ.setdefault("MLFLOW_DISABLE_AGENT_HINT", "1")
+
+import mlflow
+from mlflow.exceptions import MlflowException
+
+from app.model_registry import ModelRegistry
+
+
+class ScaledSum(mlflow.pyfunc.PythonModel):
+    def __init__(self, scale):
+        self.scale = scale
+
+    def predict(self, context, model_input, params=None):
+        return np.asarray(model_input["features"]).sum(axis=1) * self.scale
+
+
+@pytest.fixture(scope="module")
+def model_uris(tmp_path_factory):
+    root = tmp_path_factory.mktemp("models")
+    uris = []
+    for scale in (1, 2):
+        path = str(root / f"scale-{scale}")
+        mlflow.pyfunc.save_model(path, python_model=ScaledSum(scale))
+        uris.append(path)
+    return uris
+
+
+@pytest.mark.asyncio
+async def test_registry_loads_in_background_and_gates_on_readiness(model_uris):
+    registry = ModelRegistry(model_uris[0])
+    await registry.start()
+    assert not registry.ready
+
+    scores = await registry.predict_async(np.ones((3, 6)))
+
+    assert registry.ready and registry.generation == 1
+    assert np.array_equal(scores, np.full(3, 6.0))
+    assert registry.stats()["warmup_seconds"] > 0
+    await registry.aclose()
+
+
+@pytest.mark.asyncio
+async def test_hot_reload_swaps_models_without_failing_requests(model_uris):
+    registry = ModelRegistry(model_uris[0])
+    await registry.wait_ready()
+    seen = []
+
+    async def traffic():
+        while len(seen) < 2 or seen[-1] != 12.0:
+            seen.append(float((await registry.predict_async(np.ones((1, 6))))[0]))
+            await asyncio.sleep(0)
+
+    client = asyncio.ensure_future(traffic())
+    await registry.reload(model_uris[1])
+    await asyncio.wait_for(client, 10)
+
+    assert set(seen) == {6.0, 12.0}
+    assert seen == sorted(seen)
+    assert registry.generation == 2 and registry.stats()["uri"] == model_uris[1]
+    await registry.aclose()
+
+
+@pytest.mark.asyncio
+async def test_failed_reload_keeps_serving_current_model(model_uris, tmp_path):
+    registry = ModelRegistry(model_uris[0])
+    await registry.wait_ready()
+
+    with pytest.raises(MlflowException):
+        await registry.reload(str(tmp_path / "missing"))
+
+    assert registry.stats()["uri"] == model_uris[0]
+    assert (await registry.predict_async(np.ones((1, 6))))[0] == 6.0
+    await registry.aclose()
+
+
+def test_reload_endpoint_reloads_only_the_configured_uri(model_uris, tmp_path):
+    from fastapi.testclient import TestClient
+
+    from app import main
+
+    main.engine.registry = ModelRegistry(str(tmp_path / "missing"))
+    with TestClient(main.app) as client:
+        client.post("/admin/model/reload")  # the first load falls back rather than failing
+        main.engine.registry.model_uri = model_uris[1]
+        response = client.post("/admin/model/reload", json={"model_uri": model_uris[0]})
+        assert response.status_code == 200 and response.json()["uri"] == model_uris[1]
+
+        main.engine.registry.model_uri = str(tmp_path / "missing")
+        response = client.post("/admin/model/reload")
+        assert response.status_code == 503
+        assert "model reload failed" in response.json()["detail"]
+        assert response.json()["model"]["uri"] == model_uris[1]
@@ -0,0 +1,87 @@
+import pathlib
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.feature_store import FeatureStoreClient
+from app.model_registry import ModelRegistry
+from app.portfolio import AllocationLimits, allocate
+from app.schemas import PortfolioRequest
+from app.service import RecommendationEngine
+
+
+def limits(budget=10_000.0, per_trade=2_000.0, max_abs_delta=np.inf, positions=5):
+    return AllocationLimits(
+        budget=budget,
+        per_trade_cap=per_trade,
+        greek_limits=np.array([max_abs_delta, np.inf, np.inf, np.inf]),
+        max_new_positions=positions,
+        min_score=0.5,
+    )
+
+
+def test_allocate_respects_budget_per_trade_cap_and_greek_limits():
+    scores = np.array([0.9, 0.8, 0.7, 0.4])
+    cost = np.array([300.0, 500.0, 200.0, 100.0])
+    greeks = np.array([[40.0, 1, -2, 5], [-30.0, 1, -2, 5], [30.0, 1, -2, 5], [10.0, 1, -2, 5]])
+
+    result = allocate(scores, cost, greeks, np.array([100.0, 0, 0, 0]), limits(
+        budget=4_000, max_abs_delta=300
+    ))
+
+    # 0 is capped by delta (100 + 5 * 40 = 300), 1 by the per-trade cap (4 x 500), 2 by
+    # what is left of the budget; 3 scores under the floor.
+    assert result.order.tolist() == [0, 1, 2]
+    assert result.quantities.tolist() == [5, 4, 2, 0]
+    assert result.budget_used == 5 * 300 + 4 * 500 + 2 * 200
+    assert abs(result.exposure_after[0]) <= 300
+
+
+def test_breached_limits_only_admit_trades_that_reduce_them():
+    scores = np.array([0.9, 0.6])
+    greeks = np.array([[20.0, 0, 0, 0], [-20.0, 0, 0, 0]])
+
+    result = allocate(
+        scores, np.array([100.0, 100.0]), greeks, np.array([500.0, 0, 0, 0]),
+        limits(max_abs_delta=300),
+    )
+
+    # Only the delta-reducing trade fits at first; once it has brought the book back to
+    # 100, the other may use the headroom up to the limit again.
+    assert result.order.tolist() == [1, 0]
+    assert result.quantities.tolist() == [10, 20]
+    assert result.exposure_after[0] == 300.0
+
+
+@pytest.mark.asyncio
+async def test_portfolio_mode_reports_exposure_and_budget():
+    engine = RecommendationEngine(feature_store=FeatureStoreClient(), registry=ModelRegistry())
+    candidates = [
+        {"symbol": f"C{i}", "strike": 100 + i, "expiry": "2025-01-17", "delta": 0.5,
+         "gamma": 0.02, "theta": -0.04, "vega": 0.1, "mid": 2.0, "liquidity_score": 90 - i}
+        for i in range(10)
+    ]
+    request = PortfolioRequest(
+        user_id="user123",
+        market_data_url="http://localhost",
+        chain_snapshot={"candidates": candidates},
+        signals={"iv_rank": 0.6, "sentiment_score": 0.7},
+        request={"capital_usd": 50_000},
+        positions=[{"symbol": "HELD", "quantity": 4, "delta": 0.6, "mid": 5.0}],
+        limits={"max_abs_delta": 1_000, "min_score": 0.0},
+    )
+
+    response = await engine.recommend_portfolio(request)
+
+    assert response.exposure["before"]["delta"] == pytest.approx(240)
+    assert abs(response.exposure["after"]["delta"]) <= 1_000
+    assert response.risk_budget["existing"] == 2_000
+    assert response.risk_budget["remaining"] >= 0
+    assert sum(a.premium for a in response.allocations) == response.risk_budget["allocated"]
+    assert all(a.premium <= 1_000 for a in response.allocations)
+    await engine.registry.aclose()
@@ -0,0 +1,95 @@
+import pathlib
+import sys
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from scipy.special import ndtr
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.scenarios import ScenarioEngine, _price, build_legs, implied_spot, reprice
+from app.schemas import ContractRecommendation, ScenarioGridSpec
+
+NOW = datetime(2025, 1, 2, 15, 30)
+RATE = 0.045
+
+
+def contract(symbol, strike, days, vol, spot=100.0):
+    expiry = (NOW + timedelta(days=days)).date().isoformat()
+    years = (datetime.fromisoformat(expiry + "T20:00") - NOW).total_seconds() / (365 * 86400)
+    spread = vol * np.sqrt(years)
+    d1 = (np.log(spot / strike) + (RATE + 0.5 * vol * vol) * years) / spread
+    delta = float(ndtr(d1) - (0 if symbol.endswith("C") else 1))
+    return ContractRecommendation(
+        symbol=symbol, strike=strike, expiry=expiry, delta=delta, gamma=0, theta=0, vega=0,
+        implied_vol=vol, mid=1.0, liquidity_score=50,
+    )
+
+
+def test_grid_matches_pointwise_black_scholes_and_settles_expired_legs():
+    contracts = [
+        contract("X 105C", 105, 30, 0.25),
+        contract("X 95P", 95, 10, 0.35),
+        contract("X 100C", 100, 60, 0.3),
+    ]
+    legs, skipped = build_legs(contracts, [3, -2, 1], None, NOW, RATE)
+    moves, shifts = np.linspace(-0.2, 0.2, 9), np.linspace(-0.1, 0.1, 5)
+    days = np.array([0, 7, 20])
+
+    pnl = reprice(legs, moves, shifts, days, RATE)
+
+    assert not skipped
+    np.testing.assert_allclose(legs.spot, 100.0)
+    base = _price(legs.spot, legs.strike, legs.years, legs.vol, legs.is_call, RATE)
+    weights = legs.quantity * 100
+    expected = np.empty_like(pnl)
+    for i, j, k in np.ndindex(pnl.shape):
+        years = np.maximum(legs.years - days[k] / 365, 0)
+        spot = legs.spot * (1 + moves[i])
+        intrinsic = np.where(legs.is_call, spot - legs.strike, legs.strike - spot).clip(0)
+        value = np.where(
+            years > 0,
+            _price(spot, legs.strike, np.maximum(years, 1e-12), legs.vol + shifts[j],
+                   legs.is_call, RATE),
+            intrinsic,
+        )
+        expected[i, j, k] = weights @ (value - base)
+    np.testing.assert_allclose(pnl, expected, atol=1e-8)
+    assert pnl[4, 2, 0] == pytest.approx(0, abs=1e-9)
+
+
+def test_implied_spot_inverts_delta():
+    for symbol, strike in (("X 90C", 90), ("X 120P", 120)):
+        leg = contract(symbol, strike, 45, 0.4, spot=101.5)
+        years = (datetime.fromisoformat(leg.expiry + "T20:00") - NOW).total_seconds() / (
+            365 * 86400
+        )
+        spot = implied_spot(leg.delta, strike, years, 0.4, symbol.endswith("C"), RATE)
+        assert spot == pytest.approx(101.5)
+
+
+def test_results_are_cached_per_snapshot_and_report_var():
+    engine = ScenarioEngine(rate=RATE)
+    legs = [contract("X 100C", 100, 30, 0.3), contract("X 100P", 100, 30, 0.3)]
+    snapshot = {"symbol": "X", "timestamp": "2025-01-02T15:30:00", "spot": 100.0}
+    spec = ScenarioGridSpec(spot_steps=21, vol_steps=5, day_steps=3)
+
+    first = engine.evaluate(legs, [2, 2], snapshot, spec, now=NOW)
+    grid = spec.model_copy(update={"include_grid": True})
+    again = engine.evaluate(legs, [2, 2], snapshot, grid, now=NOW)
+    engine.evaluate(legs, [2, 2], {**snapshot, "timestamp": "later"}, spec, now=NOW)
+
+    assert engine.stats()["hits"] == 1 and engine.stats()["misses"] == 2
+    assert "pnl" not in first and "axes" not in first
+    assert again["stats"] == first["stats"]
+    assert np.asarray(again["pnl"]).shape == (21, 5, 3)
+    assert len(again["axes"]["spot_move"]) == 21
+    stats = first["stats"]
+    # A long straddle loses at most its premium; it is worst with spot pinned and IV down.
+    assert 0 < stats["var_95"] <= stats["cvar_95"] <= stats["worst_loss"]
+    assert stats["var_95"] <= stats["var_99"]
+    assert stats["worst_scenario"]["spot_move"] == 0
+    assert stats["worst_scenario"]["vol_shift"] == -0.1
@@ -0,0 +1,419 @@
+from __future__ import annotations
+
+import math
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+RSI_PERIOD = 14
+ATR_PERIOD = 14
+ADX_PERIOD = 14
+MACD_FAST = 12
+MACD_SLOW = 26
+MACD_SIGNAL = 9
+IV_RANK_DAYS = 252
+ADX_TREND_THRESHOLD = 25.0
+SECONDS_PER_DAY = 86_400
+# Bars after which every smoothed series has seen at least two periods of data.
+WARMUP_BARS = max(2 * ADX_PERIOD, RSI_PERIOD + 1, MACD_SLOW + MACD_SIGNAL)
+
+
+def _alpha(period: int) -> float:
+    """Wilder's smoothing factor."""
+    return 1.0 / period
+
+
+def _ema_alpha(span: int) -> float:
+    return 2.0 / (span + 1.0)
+
+
+@dataclass(frozen=True)
+class Bar:
+    timestamp: int  # epoch seconds
+    high: float
+    low: float
+    close: float
+    iv: float = math.nan  # NaN when the bar carries no implied-vol quote
+
+
+@dataclass(frozen=True)
+class BarSeries:
+    """Column arrays of a symbol's bar history, oldest first."""
+
+    timestamp: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    iv: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    @classmethod
+    def from_bars(cls, bars: Sequence[Bar]) -> "BarSeries":
+        return cls(
+            timestamp=np.array([bar.timestamp for bar in bars], dtype=np.int64),
+            high=np.array([bar.high for bar in bars], dtype=float),
+            low=np.array([bar.low for bar in bars], dtype=float),
+            close=np.array([bar.close for bar in bars], dtype=float),
+            iv=np.array([bar.iv for bar in bars], dtype=float),
+        )
+
+
+def smooth(values: np.ndarray, alpha: float) -> np.ndarray:
+    """Exponential smoothing, ``y[t] = y[t-1] + alpha (x[t] - y[t-1])``, seeded with ``x[0]``.
+
+    Runs in pandas' compiled ``ewm`` loop. NaNs at the head (series that start on the
+    second bar) stay NaN and the recursion seeds on the first observation.
+    """
+    return pd.Series(values).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+
+
+def _smooth_step(previous: float, value: float, alpha: float) -> float:
+    # The same arithmetic as pandas' adjust=False ewm, so incremental updates continue a
+    # backfilled series to the last bit rather than drifting from it.
+    if previous != previous:
+        return value
+    if previous == value:
+        return previous
+    return ((1.0 - alpha) * previous + alpha * value) / ((1.0 - alpha) + alpha)
+
+
+def rsi_series(close: np.ndarray, period: int = RSI_PERIOD) -> Dict[str, np.ndarray]:
+    delta = np.r_[np.nan, np.diff(close)]
+    avg_gain = smooth(np.where(np.isnan(delta), np.nan, np.maximum(delta, 0.0)), _alpha(period))
+    avg_loss = smooth(np.where(np.isnan(delta), np.nan, np.maximum(-delta, 0.0)), _alpha(period))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    # No losses at all: 100; neither gains nor losses: neutral.
+    rsi = np.where(avg_loss == 0, np.where(avg_gain == 0, 50.0, 100.0), rsi)
+    return {"rsi": rsi, "avg_gain": avg_gain, "avg_loss": avg_loss}
+
+
+def macd_series(
+    close: np.ndarray, fast: int = MACD_FAST, slow: int = MACD_SLOW, signal: int = MACD_SIGNAL
+) -> Dict[str, np.ndarray]:
+    ema_fast = smooth(close, _ema_alpha(fast))
+    ema_slow = smooth(close, _ema_alpha(slow))
+    macd = ema_fast - ema_slow
+    macd_signal = smooth(macd, _ema_alpha(signal))
+    return {
+        "macd": macd,
+        "macd_signal": macd_signal,
+        "macd_histogram": macd - macd_signal,
+        "ema_fast": ema_fast,
+        "ema_slow": ema_slow,
+    }
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """Bar range extended to the previous close; the first bar is just ``high - low``."""
+    previous = np.r_[np.nan, close[:-1]]
+    return np.fmax(high - low, np.fmax(np.abs(high - previous), np.abs(low - previous)))
+
+
+def adx_series(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    period: int = ADX_PERIOD,
+    atr_period: int = ATR_PERIOD,
+) -> Dict[str, np.ndarray]:
+    atr = smooth(true_range(high, low, close), _alpha(atr_period))
+    up = np.r_[np.nan, np.diff(high)]
+    down = np.r_[np.nan, -np.diff(low)]
+    head = np.isnan(up)
+    plus_dm = smooth(np.where(head, np.nan, np.where((up > down) & (up > 0), up, 0.0)),
+                     _alpha(period))
+    minus_dm = smooth(np.where(head, np.nan, np.where((down > up) & (down > 0), down, 0.0)),
+                      _alpha(period))
+    plus_di, minus_di, dx = directional_index(plus_dm, minus_dm, atr)
+    return {
+        "atr": atr,
+        "adx": smooth(dx, _alpha(period)),
+        "plus_di": plus_di,
+        "minus_di": minus_di,
+        "plus_dm": plus_dm,
+        "minus_dm": minus_dm,
+    }
+
+
+def directional_index(plus_dm, minus_dm, atr):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        plus_di = np.where(atr > 0, 100.0 * np.asarray(plus_dm) / atr, 0.0)
+        minus_di = np.where(atr > 0, 100.0 * np.asarray(minus_dm) / atr, 0.0)
+        total = plus_di + minus_di
+        dx = np.where(total > 0, 100.0 * np.abs(plus_di - minus_di) / total, 0.0)
+    nan = np.isnan(plus_dm)
+    return (
+        np.where(nan, np.nan, plus_di),
+        np.where(nan, np.nan, minus_di),
+        np.where(nan, np.nan, dx),
+    )
+
+
+def iv_rank_series(
+    timestamp: np.ndarray, iv: np.ndarray, days: int = IV_RANK_DAYS
+) -> Dict[str, np.ndarray]:
+    """Where each bar's IV sits between the lowest and highest closing IV of the previous
+    ``days`` sessions (and itself). Bars without a quote carry the last one forward.
+    """
+    iv = pd.Series(iv).ffill().to_numpy()
+    day = timestamp // SECONDS_PER_DAY
+    starts = np.flatnonzero(np.r_[True, day[1:] != day[:-1]])
+    closes = iv[np.r_[starts[1:] - 1, len(day) - 1]]
+    # Window k covers the ``days`` sessions before session k.
+    windows = sliding_window_view(np.r_[np.full(days, np.nan), closes], days)[: len(closes)]
+    session = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(day)]))
+    low = np.fmin(np.fmin.reduce(windows, axis=1)[session], iv)
+    high = np.fmax(np.fmax.reduce(windows, axis=1)[session], iv)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rank = np.where(high > low, (iv - low) / (high - low), np.nan)
+    return {"iv": iv, "iv_rank": rank, "iv_closes": closes}
+
+
+def compute(series: BarSeries) -> Dict[str, np.ndarray]:
+    """Every indicator over a whole bar history, one vectorized pass per series."""
+    return {
+        **rsi_series(series.close),
+        **macd_series(series.close),
+        **adx_series(series.high, series.low, series.close),
+        **iv_rank_series(series.timestamp, series.iv),
+    }
+
+
+def macd_state(histogram: float, previous: float) -> str:
+    if previous == previous and (previous <= 0) != (histogram <= 0):
+        return "bullish-crossover" if histogram > 0 else "bearish-crossover"
+    return "bullish" if histogram > 0 else "bearish"
+
+
+def trend_regime(adx: float, plus_di: float, minus_di: float) -> str:
+    if not adx >= ADX_TREND_THRESHOLD:
+        return "range-bound"
+    return "uptrend" if plus_di >= minus_di else "downtrend"
+
+
+def _finite(value: float) -> float | None:
+    return float(value) if math.isfinite(value) else None
+
+
+@dataclass(frozen=True)
+class IndicatorSnapshot:
+    symbol: str
+    timestamp: int
+    bars: int
+    warm: bool  # at least WARMUP_BARS bars seen, so every smoothing has settled
+    rsi: float | None
+    macd: float | None
+    macd_signal: float | None
+    macd_histogram: float | None
+    macd_state: str
+    adx: float | None
+    plus_di: float | None
+    minus_di: float | None
+    trend_regime: str
+    atr: float | None
+    iv: float | None
+    iv_rank: float | None
+
+
+def _rsi(avg_gain: float, avg_loss: float) -> float:
+    if avg_loss == 0:
+        return 50.0 if avg_gain == 0 else 100.0
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+def _directional_index(plus_dm: float, minus_dm: float, atr: float):
+    plus_di = 100.0 * plus_dm / atr if atr > 0 else 0.0
+    minus_di = 100.0 * minus_dm / atr if atr > 0 else 0.0
+    total = plus_di + minus_di
+    return plus_di, minus_di, 100.0 * abs(plus_di - minus_di) / total if total > 0 else 0.0
+
+
+@dataclass(slots=True)
+class IndicatorState:
+    """Everything the next bar needs: the last value of every smoothed series.
+
+    :meth:`update` folds in one bar in constant time (the IV window is re-scanned once
+    per session, not per bar) with the same arithmetic as :func:`compute`, so a state
+    restored from a backfill and then updated bar by bar matches a full recompute.
+    """
+
+    bars: int = 0
+    timestamp: int = 0
+    high: float = math.nan
+    low: float = math.nan
+    close: float = math.nan
+    avg_gain: float = math.nan
+    avg_loss: float = math.nan
+    ema_fast: float = math.nan
+    ema_slow: float = math.nan
+    macd_signal: float = math.nan
+    previous_histogram: float = math.nan
+    atr: float = math.nan
+    plus_dm: float = math.nan
+    minus_dm: float = math.nan
+    adx: float = math.nan
+    iv: float = math.nan
+    iv_session: int | None = None
+    iv_closes: Deque[float] = field(default_factory=lambda: deque(maxlen=IV_RANK_DAYS))
+    iv_low: float = math.nan
+    iv_high: float = math.nan
+
+    @classmethod
+    def from_series(cls, series: BarSeries, values: Dict[str, np.ndarray]) -> "IndicatorState":
+        """The state after the last bar of a backfill, read off the computed series."""
+        last = {name: float(array[-1]) for name, array in values.items() if name != "iv_closes"}
+        closes = values["iv_closes"][:-1][-IV_RANK_DAYS:].tolist()
+        quoted = [value for value in closes if value == value]
+        histogram = values["macd_histogram"]
+        return cls(
+            bars=len(series),
+            timestamp=int(series.timestamp[-1]),
+            high=float(series.high[-1]),
+            low=float(series.low[-1]),
+            close=float(series.close[-1]),
+            avg_gain=last["avg_gain"],
+            avg_loss=last["avg_loss"],
+            ema_fast=last["ema_fast"],
+            ema_slow=last["ema_slow"],
+            macd_signal=last["macd_signal"],
+            previous_histogram=float(histogram[-2]) if len(histogram) > 1 else math.nan,
+            atr=last["atr"],
+            plus_dm=last["plus_dm"],
+            minus_dm=last["minus_dm"],
+            adx=last["adx"],
+            iv=last["iv"],
+            iv_session=int(series.timestamp[-1]) // SECONDS_PER_DAY,
+            iv_closes=deque(closes, maxlen=IV_RANK_DAYS),
+            iv_low=min(quoted, default=math.nan),
+            iv_high=max(quoted, default=math.nan),
+        )
+
+    def update(self, bar: Bar) -> None:
+        high, low, close = bar.high, bar.low, bar.close
+        if self.bars:
+            delta = close - self.close
+            self.avg_gain = _smooth_step(self.avg_gain, max(delta, 0.0), _alpha(RSI_PERIOD))
+            self.avg_loss = _smooth_step(self.avg_loss, max(-delta, 0.0), _alpha(RSI_PERIOD))
+            up, down = high - self.high, self.low - low
+            plus = up if up > down and up > 0 else 0.0
+            minus = down if down > up and down > 0 else 0.0
+            self.plus_dm = _smooth_step(self.plus_dm, plus, _alpha(ADX_PERIOD))
+            self.minus_dm = _smooth_step(self.minus_dm, minus, _alpha(ADX_PERIOD))
+            tr = max(high - low, abs(high - self.close), abs(low - self.close))
+            self.atr = _smooth_step(self.atr, tr, _alpha(ATR_PERIOD))
+            dx = _directional_index(self.plus_dm, self.minus_dm, self.atr)[2]
+            self.adx = _smooth_step(self.adx, dx, _alpha(ADX_PERIOD))
+            self.previous_histogram = (self.ema_fast - self.ema_slow) - self.macd_signal
+        else:
+            self.atr = high - low
+        self.ema_fast = _smooth_step(self.ema_fast, close, _ema_alpha(MACD_FAST))
+        self.ema_slow = _smooth_step(self.ema_slow, close, _ema_alpha(MACD_SLOW))
+        self.macd_signal = _smooth_step(
+            self.macd_signal, self.ema_fast - self.ema_slow, _ema_alpha(MACD_SIGNAL)
+        )
+
+        session = bar.timestamp // SECONDS_PER_DAY
+        if session != self.iv_session:
+            if self.iv_session is not None:
+                self.iv_closes.append(self.iv)
+                quoted = [value for value in self.iv_closes if value == value]
+                self.iv_low = min(quoted, default=math.nan)
+                self.iv_high = max(quoted, default=math.nan)
+            self.iv_session = session
+        if bar.iv == bar.iv:
+            self.iv = bar.iv
+
+        self.high, self.low, self.close = high, low, close
+        self.timestamp = bar.timestamp
+        self.bars += 1
+
+    def snapshot(self, symbol: str) -> IndicatorSnapshot:
+        macd = self.ema_fast - self.ema_slow
+        histogram = macd - self.macd_signal
+        plus_di, minus_di, _ = _directional_index(self.plus_dm, self.minus_dm, self.atr)
+        rsi = _rsi(self.avg_gain, self.avg_loss) if self.bars > 1 else math.nan
+        low = min(self.iv_low, self.iv) if self.iv_low == self.iv_low else self.iv
+        high = max(self.iv_high, self.iv) if self.iv_high == self.iv_high else self.iv
+        iv_rank = (self.iv - low) / (high - low) if high > low else math.nan
+        return IndicatorSnapshot(
+            symbol=symbol,
+            timestamp=self.timestamp,
+            bars=self.bars,
+            warm=self.bars >= WARMUP_BARS,
+            rsi=_finite(rsi),
+            macd=_finite(macd),
+            macd_signal=_finite(self.macd_signal),
+            macd_histogram=_finite(histogram),
+            macd_state=macd_state(histogram, self.previous_histogram),
+            adx=_finite(self.adx),
+            plus_di=_finite(plus_di) if self.bars > 1 else None,
+            minus_di=_finite(minus_di) if self.bars > 1 else None,
+            trend_regime=trend_regime(self.adx, plus_di, minus_di),
+            atr=_finite(self.atr),
+            iv=_finite(self.iv),
+            iv_rank=_finite(iv_rank),
+        )
+
+
+class IndicatorEngine:
+    """Rolling indicator state per symbol.
+
+    :meth:`backfill` computes a symbol's whole history in vectorized passes and keeps only
+    the final state; :meth:`update` advances that state by one bar. Snapshots read the
+    state, so serving never touches bar history.
+    """
+
+    def __init__(self) -> None:
+        self._states: Dict[str, IndicatorState] = {}
+
+    def backfill(self, symbol: str, series: BarSeries) -> Dict[str, np.ndarray]:
+        """Replace ``symbol``'s state with one computed from ``series``; returns every series."""
+        if not len(series):
+            raise ValueError("backfill needs at least one bar")
+        values = compute(series)
+        self._states[symbol] = IndicatorState.from_series(series, values)
+        return values
+
+    def update(self, symbol: str, bar: Bar) -> IndicatorSnapshot:
+        state = self._states.get(symbol)
+        if state is None:
+            state = self._states[symbol] = IndicatorState()
+        elif bar.timestamp < state.timestamp:
+            raise ValueError(
+                f"bar for {symbol} at {bar.timestamp} is older than the last one "
+                f"({state.timestamp})"
+            )
+        state.update(bar)
+        return state.snapshot(symbol)
+
+    def ingest(self, symbol: str, bars: Sequence[Bar]) -> IndicatorSnapshot | None:
+        """Backfill a symbol seen for the first time; otherwise apply the bars in order."""
+        if not bars:
+            return self.snapshot(symbol)
+        if symbol not in self._states and len(bars) > 1:
+            self.backfill(symbol, BarSeries.from_bars(bars))
+            return self.snapshot(symbol)
+        snapshot = None
+        for bar in bars:
+            snapshot = self.update(symbol, bar)
+        return snapshot
+
+    def snapshot(self, symbol: str) -> IndicatorSnapshot | None:
+        state = self._states.get(symbol)
+        return None if state is None else state.snapshot(symbol)
+
+    def symbols(self) -> Iterable[str]:
+        return self._states.keys()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "symbols": len(self._states),
+            "warm": sum(state.bars >= WARMUP_BARS for state in self._states.values()),
+        }
@@ -1,16 +1,72 @@
-from fastapi import FastAPI
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, List
 
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import Response, StreamingResponse
+
+from .schemas import BarBatch, SignalSnapshot, SnapshotBatchRequest
 from .service import build_service
 
-app = FastAPI(title="Signals Service", version="0.1.0")
+SNAPSHOT_BATCH_STREAM_THRESHOLD = int(os.getenv("SNAPSHOT_BATCH_STREAM_THRESHOLD", "500"))
+
 service = build_service()
 
 
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    # One pool for the app's lifetime instead of one per query, plus the shared inputs'
+    # scheduled reloads and NOTIFY subscriptions.
+    await service.start()
+    try:
+        yield
+    finally:
+        await service.aclose()
+
+
+app = FastAPI(title="Signals Service", version="0.1.0", lifespan=lifespan)
+
+
 @app.get("/healthz")
 async def healthcheck() -> dict[str, str]:
     return {"status": "ok"}
 
 
-@app.get("/snapshot/{symbol}")
+@app.get("/metrics")
+async def metrics() -> dict[str, Any]:
+    return service.stats()
+
+
+@app.get("/snapshot/{symbol}", response_model=SignalSnapshot)
 async def snapshot(symbol: str):
-    return await service.get_snapshot(symbol.upper())
+    # Serialized by pydantic directly: FastAPI's jsonable_encoder costs ~20x more and would
+    # dominate a read served from the snapshot store.
+    snapshot = await service.get_snapshot(symbol.upper())
+    return Response(snapshot.model_dump_json(), media_type="application/json")
+
+
+@app.post("/snapshots:batch")
+async def snapshots_batch(request: SnapshotBatchRequest):
+    # Small batches come back as one JSON document; large universes stream as NDJSON so
+    # the first snapshots leave before the last chunk has been queried.
+    if len(request.symbols) <= SNAPSHOT_BATCH_STREAM_THRESHOLD:
+        return {"snapshots": await service.get_snapshots(request.symbols)}
+    return StreamingResponse(
+        _ndjson(service.stream_snapshots(request.symbols)), media_type="application/x-ndjson"
+    )
+
+
+async def _ndjson(chunks: AsyncIterator[List[SignalSnapshot]]) -> AsyncIterator[str]:
+    async for chunk in chunks:
+        yield "".join(snapshot.model_dump_json() + "\n" for snapshot in chunk)
+
+
+@app.post("/bars/{symbol}")
+async def ingest_bars(symbol: str, batch: BarBatch):
+    # A symbol's first batch is backfilled in vectorized passes; later batches are applied
+    # bar by bar to its rolling state.
+    try:
+        indicators = service.ingest_bars(symbol.upper(), batch.bars)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    return indicators
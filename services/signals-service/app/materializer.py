@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Sequence, Set
+
+from .schemas import SignalSnapshot
+from .snapshot_store import SnapshotStore
+
+logger = logging.getLogger(__name__)
+
+Compute = Callable[[Sequence[str]], AsyncIterator[List[SignalSnapshot]]]
+
+
+@dataclass
+class MaterializerStats:
+    runs: int = 0
+    event_runs: int = 0
+    snapshots: int = 0
+    failures: int = 0
+    last_run_seconds: float = 0.0
+    last_version: int = 0
+
+
+class SnapshotMaterializer:
+    """Keeps the active universe's snapshots precomputed in a :class:`SnapshotStore`.
+
+    The active universe is the configured ``universe`` plus every symbol requested within
+    the last ``active_window_seconds``, at most ``max_requested`` of them (the least
+    recently requested go first, so a flood of unknown symbols cannot grow every run).
+    All of it is rematerialized every ``interval_seconds``; :meth:`notify` (a data-change
+    event) wakes the loop early, for some symbols or for all of them, and notifications
+    arriving within ``debounce_seconds`` of each other are folded into one run. Each run takes a new
+    store version and writes chunk by chunk as ``compute`` yields them.
+    """
+
+    def __init__(
+        self,
+        compute: Compute,
+        store: SnapshotStore,
+        *,
+        universe: Iterable[str] = (),
+        interval_seconds: float = 60.0,
+        active_window_seconds: float = 900.0,
+        max_requested: int = 5000,
+        debounce_seconds: float = 0.25,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._compute = compute
+        self.store = store
+        self.universe = list(dict.fromkeys(symbol.upper() for symbol in universe))
+        self.interval_seconds = interval_seconds
+        self.active_window_seconds = active_window_seconds
+        self.max_requested = max_requested
+        self.debounce_seconds = debounce_seconds
+        self._clock = clock
+        self._requested: OrderedDict[str, float] = OrderedDict()
+        self._dirty: Set[str] = set()
+        self._dirty_all = False
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._stats = MaterializerStats()
+
+    def touch(self, symbol: str) -> None:
+        """Record a request for ``symbol``, keeping it in the active universe."""
+        self._requested[symbol] = self._clock()
+        self._requested.move_to_end(symbol)
+        while len(self._requested) > self.max_requested:
+            self._requested.popitem(last=False)
+
+    def active_universe(self) -> List[str]:
+        cutoff = self._clock() - self.active_window_seconds
+        while self._requested and next(iter(self._requested.values())) < cutoff:
+            self._requested.popitem(last=False)
+        return list(dict.fromkeys([*self.universe, *self._requested]))
+
+    def notify(self, symbols: Iterable[str] | None = None) -> None:
+        """Rematerialize ``symbols`` (every active symbol when ``None``) soon."""
+        if symbols is None:
+            self._dirty_all = True
+        else:
+            self._dirty.update(symbols)
+        self._wake.set()
+
+    async def run_once(self, symbols: Sequence[str] | None = None) -> int:
+        """Materialize ``symbols`` (default: the active universe) under a new version."""
+        symbols = self.active_universe() if symbols is None else list(symbols)
+        if not symbols:
+            return 0
+        start = time.perf_counter()
+        version = await self.store.next_version()
+        written = 0
+        async for chunk in self._compute(symbols):
+            written += await self.store.put_many(chunk, version)
+        self._stats.runs += 1
+        self._stats.snapshots += written
+        self._stats.last_version = version
+        self._stats.last_run_seconds = round(time.perf_counter() - start, 4)
+        return written
+
+    async def start(self) -> None:
+        if self._task is None:
+            self.notify()  # materialize right away rather than after the first interval
+            self._task = asyncio.create_task(self._run_forever())
+
+    async def aclose(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **asdict(self._stats),
+            "universe": len(self.universe),
+            "requested": len(self._requested),
+            "max_requested": self.max_requested,
+        }
+
+    async def _run_forever(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.interval_seconds)
+            except asyncio.TimeoutError:
+                scheduled = True
+            else:
+                scheduled = False
+                self._stats.event_runs += 1
+                await asyncio.sleep(self.debounce_seconds)
+            # Cleared before the dirty set is taken: a notify() from here on wakes the
+            # next iteration instead of being lost.
+            self._wake.clear()
+            if scheduled or self._dirty_all:
+                symbols = None
+                self._dirty_all = False
+                self._dirty.clear()
+            else:
+                symbols = self._take_dirty()
+            try:
+                await self.run_once(symbols)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self._stats.failures += 1
+                logger.exception("snapshot materialization failed")
+
+    def _take_dirty(self) -> List[str]:
+        dirty, self._dirty = self._dirty, set()
+        return sorted(dirty)
@@ -1,55 +1,267 @@
 from __future__ import annotations
 
+import asyncio
+import logging
 import os
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Sequence
 
 import asyncpg
 
+logger = logging.getLogger(__name__)
+
+# Module constants, so asyncpg's per-connection statement cache prepares each query once
+# per pooled connection and every later call only binds and executes.
+CONGRESSIONAL_TRADES_QUERY = """
+    select person, party, committee, action, amount, trade_date
+    from congressional_trades
+    where symbol = $1
+    order by trade_date desc
+    limit 10
+"""
+# Every requested symbol's ten most recent trades in one round trip.
+CONGRESSIONAL_TRADES_BATCH_QUERY = """
+    select symbol, person, party, committee, action, amount, trade_date
+    from (
+        select symbol, person, party, committee, action, amount, trade_date,
+               row_number() over (partition by symbol order by trade_date desc) as position
+        from congressional_trades
+        where symbol = any($1::text[])
+    ) ranked
+    where position <= 10
+    order by symbol, trade_date desc
+"""
+MACRO_EVENTS_QUERY = """
+    select event_name, event_time
+    from macro_calendar
+    where event_time >= now()
+    order by event_time asc
+    limit 5
+"""
+
+# Channel the macro calendar announces changes on. The trigger is installed when the pool
+# opens (see ``install_triggers``); without it the cache falls back to its TTL.
+MACRO_EVENTS_CHANNEL = "macro_calendar_changed"
+MACRO_CALENDAR_NOTIFY_TRIGGER = f"""
+    create or replace function notify_macro_calendar_changed() returns trigger as $$
+    begin
+        perform pg_notify('{MACRO_EVENTS_CHANNEL}', tg_op);
+        return null;
+    end;
+    $$ language plpgsql;
+    drop trigger if exists macro_calendar_changed on macro_calendar;
+    create trigger macro_calendar_changed
+        after insert or update or delete or truncate on macro_calendar
+        for each statement execute function notify_macro_calendar_changed();
+"""
+NOTIFY_TRIGGERS = (MACRO_CALENDAR_NOTIFY_TRIGGER,)
+# Replicas starting together take turns replacing the triggers instead of racing.
+TRIGGER_INSTALL_LOCK = 0x5167_0001
+LISTENER_RETRY_SECONDS = 5.0
+
 
 class SignalsRepository:
-    def __init__(self, dsn: str | None = None) -> None:
+    """Signals queries over one connection pool that lives as long as the app.
+
+    :meth:`start` (called from the app lifespan, or lazily by the first query) opens the
+    pool; :meth:`aclose` closes it. ``statement_timeout_ms`` is set as the server-side
+    ``statement_timeout`` on every pooled connection and ``command_timeout`` bounds each
+    call on the client, so a slow query fails fast instead of holding a connection.
+    With ``install_triggers`` the ``NOTIFY`` triggers the listeners rely on are
+    (re)installed once the pool is open; if that fails (no table yet, no privilege) the
+    service still starts and shared inputs refresh on their TTL.
+    """
+
+    def __init__(
+        self,
+        dsn: str | None = None,
+        *,
+        min_size: int = 1,
+        max_size: int = 10,
+        statement_timeout_ms: int = 2000,
+        command_timeout: float = 5.0,
+        statement_cache_size: int = 100,
+        install_triggers: bool = False,
+    ) -> None:
         self.dsn = dsn or os.getenv("SIGNALS_DB_DSN")
+        self.min_size = min_size
+        self.max_size = max_size
+        self.statement_timeout_ms = statement_timeout_ms
+        self.command_timeout = command_timeout
+        self.statement_cache_size = statement_cache_size
+        self.install_triggers = install_triggers
+        self._pool: asyncpg.Pool | None = None
+        self._pool_lock = asyncio.Lock()
+        self._channels: Dict[str, List[Callable[[str | None], None]]] = {}
+        self._listener: asyncpg.Connection | None = None
+        self._listener_lock = asyncio.Lock()
+        self._reconnect: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        if not self.dsn or self._pool is not None:
+            return
+        async with self._pool_lock:
+            if self._pool is None:
+                self._pool = await asyncpg.create_pool(
+                    self.dsn,
+                    min_size=self.min_size,
+                    max_size=self.max_size,
+                    command_timeout=self.command_timeout,
+                    statement_cache_size=self.statement_cache_size,
+                    server_settings={
+                        "statement_timeout": str(self.statement_timeout_ms),
+                        "application_name": "signals-service",
+                    },
+                )
+                if self.install_triggers:
+                    await self._install_triggers()
+
+    async def aclose(self) -> None:
+        self._channels.clear()
+        reconnect, self._reconnect = self._reconnect, None
+        if reconnect is not None:
+            reconnect.cancel()
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.remove_termination_listener(self._listener_lost)
+            await listener.close()
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            await pool.close()
+
+    async def listen(self, channel: str, callback: Callable[[str | None], None]) -> bool:
+        """Call ``callback(payload)`` on every ``NOTIFY channel``; ``False`` without a DSN.
+
+        Notifications arrive on one dedicated connection outside the pool. If it drops,
+        every callback is called with ``None`` (a notification may have been missed) and
+        the connection is re-established in the background with all its channels.
+        """
+        if not self.dsn:
+            return False
+        self._channels.setdefault(channel, []).append(callback)
+        async with self._listener_lock:
+            if self._listener is None:
+                await self._connect_listener()
+            elif len(self._channels[channel]) == 1:
+                await self._listener.add_listener(channel, self._notify)
+        return True
 
     async def fetch_congressional_trades(self, symbol: str) -> List[Dict[str, Any]]:
         if not self.dsn:
             return []
-        query = """
-            select person, party, committee, action, amount, trade_date
-            from congressional_trades
-            where symbol = $1
-            order by trade_date desc
-            limit 10
-        """
-        async with asyncpg.create_pool(self.dsn, max_size=2) as pool:
-            async with pool.acquire() as connection:
-                rows = await connection.fetch(query, symbol.upper())
-        return [
-            {
-                "name": row["person"],
-                "party": row["party"],
-                "committee": row["committee"],
-                "action": row["action"],
-                "amount": row["amount"],
-                "date": row["trade_date"].isoformat() if row["trade_date"] else None,
-            }
-            for row in rows
-        ]
+        rows = await self._fetch(CONGRESSIONAL_TRADES_QUERY, symbol.upper())
+        return [_trade(row) for row in rows]
+
+    async def fetch_congressional_trades_batch(
+        self, symbols: Sequence[str]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Recent trades keyed by upper-cased symbol; symbols without trades are absent."""
+        if not self.dsn or not symbols:
+            return {}
+        rows = await self._fetch(
+            CONGRESSIONAL_TRADES_BATCH_QUERY, [symbol.upper() for symbol in symbols]
+        )
+        trades: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            trades.setdefault(row["symbol"], []).append(_trade(row))
+        return trades
 
     async def fetch_macro_events(self) -> List[str]:
         if not self.dsn:
             return []
-        query = """
-            select event_name, event_time
-            from macro_calendar
-            where event_time >= now()
-            order by event_time asc
-            limit 5
-        """
-        async with asyncpg.create_pool(self.dsn, max_size=2) as pool:
-            async with pool.acquire() as connection:
-                rows = await connection.fetch(query)
+        rows = await self._fetch(MACRO_EVENTS_QUERY)
         return [f"{row['event_name']} on {row['event_time'].date().isoformat()}" for row in rows]
 
+    def stats(self) -> Dict[str, Any]:
+        pool = self._pool
+        if pool is None:
+            return {"open": False}
+        return {
+            "open": True,
+            "size": pool.get_size(),
+            "idle": pool.get_idle_size(),
+            "min_size": pool.get_min_size(),
+            "max_size": pool.get_max_size(),
+        }
+
+    async def _install_triggers(self) -> None:
+        async with self._pool.acquire() as connection:
+            try:
+                async with connection.transaction():
+                    await connection.execute(
+                        "select pg_advisory_xact_lock($1)", TRIGGER_INSTALL_LOCK
+                    )
+                    for trigger in NOTIFY_TRIGGERS:
+                        await connection.execute(trigger)
+            except asyncpg.PostgresError:
+                logger.warning(
+                    "could not install NOTIFY triggers; shared inputs refresh on their TTL",
+                    exc_info=True,
+                )
+
+    async def _connect_listener(self) -> None:
+        listener = await asyncpg.connect(
+            self.dsn, server_settings={"application_name": "signals-service-listener"}
+        )
+        for channel in self._channels:
+            await listener.add_listener(channel, self._notify)
+        listener.add_termination_listener(self._listener_lost)
+        self._listener = listener
+
+    def _notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        for callback in self._channels.get(channel, ()):
+            callback(payload)
+
+    def _listener_lost(self, connection: Any) -> None:
+        self._listener = None
+        if not self._channels:
+            return
+        for callbacks in self._channels.values():
+            for callback in callbacks:
+                callback(None)
+        if self._reconnect is None:
+            self._reconnect = asyncio.create_task(self._reconnect_listener())
+
+    async def _reconnect_listener(self) -> None:
+        try:
+            while self._listener is None and self._channels:
+                await asyncio.sleep(LISTENER_RETRY_SECONDS)
+                try:
+                    async with self._listener_lock:
+                        if self._listener is None:
+                            await self._connect_listener()
+                except (OSError, asyncpg.PostgresError):
+                    logger.warning("notification listener reconnect failed", exc_info=True)
+                    continue
+                # Anything sent while disconnected was lost; reload once more.
+                for callbacks in self._channels.values():
+                    for callback in callbacks:
+                        callback(None)
+        finally:
+            self._reconnect = None
+
+    async def _fetch(self, query: str, *args: Any) -> List[asyncpg.Record]:
+        if self._pool is None:
+            await self.start()
+        async with self._pool.acquire() as connection:
+            return await connection.fetch(query, *args)
+
+
+def _trade(row: asyncpg.Record) -> Dict[str, Any]:
+    return {
+        "name": row["person"],
+        "party": row["party"],
+        "committee": row["committee"],
+        "action": row["action"],
+        "amount": row["amount"],
+        "date": row["trade_date"].isoformat() if row["trade_date"] else None,
+    }
+
 
 def build_repository() -> SignalsRepository:
-    return SignalsRepository()
+    return SignalsRepository(
+        min_size=int(os.getenv("SIGNALS_DB_POOL_MIN_SIZE", "1")),
+        max_size=int(os.getenv("SIGNALS_DB_POOL_MAX_SIZE", "10")),
+        statement_timeout_ms=int(os.getenv("SIGNALS_DB_STATEMENT_TIMEOUT_MS", "2000")),
+        command_timeout=float(os.getenv("SIGNALS_DB_COMMAND_TIMEOUT_SECONDS", "5")),
+        install_triggers=os.getenv("SIGNALS_DB_INSTALL_TRIGGERS", "1") != "0",
+    )
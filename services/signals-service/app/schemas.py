@@ -1,7 +1,18 @@
+import os
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+MAX_SNAPSHOT_BATCH = int(os.getenv("MAX_SNAPSHOT_BATCH", "10000"))
+
+
+class SnapshotFreshness(BaseModel):
+    source: str  # "materialized" (read from the snapshot store) or "computed" (on request)
+    version: Optional[int] = None  # materializer run that wrote it
+    materialized_at: datetime
+    age_seconds: float
+    stale: bool
 
 
 class SignalSnapshot(BaseModel):
@@ -9,6 +20,7 @@ class SignalSnapshot(BaseModel):
     rsi: float
     macd: str
     adx: float
+    atr: Optional[float] = None
     trend_regime: str
     iv: float
     iv_rank: float
@@ -21,3 +33,20 @@ class SignalSnapshot(BaseModel):
     macro_events: List[str]
     macro_risk_flag: bool
     generated_at: datetime
+    freshness: Optional[SnapshotFreshness] = None
+
+
+class BarIn(BaseModel):
+    timestamp: datetime
+    high: float
+    low: float
+    close: float
+    iv: Optional[float] = None
+
+
+class BarBatch(BaseModel):
+    bars: List[BarIn]
+
+
+class SnapshotBatchRequest(BaseModel):
+    symbols: List[str] = Field(min_length=1, max_length=MAX_SNAPSHOT_BATCH)
@@ -1,36 +1,251 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+import math
+import os
 from datetime import datetime, timedelta
+from functools import partial
 from random import randint
-from typing import List
+from typing import Any, AsyncIterator, Dict, List, Sequence
 
-from .repository import SignalsRepository, build_repository
-from .schemas import SignalSnapshot
+from redis.asyncio import BlockingConnectionPool, Redis
+from redis.exceptions import RedisError
+
+from .indicators import Bar, IndicatorEngine, IndicatorSnapshot
+from .materializer import SnapshotMaterializer
+from .repository import MACRO_EVENTS_CHANNEL, SignalsRepository, build_repository
+from .schemas import BarIn, SignalSnapshot, SnapshotFreshness
+from .shared_inputs import SharedInput
+from .snapshot_store import SnapshotStore
+
+logger = logging.getLogger(__name__)
+
+# Symbols per congressional-trades query when a batch is streamed.
+SNAPSHOT_BATCH_CHUNK = int(os.getenv("SNAPSHOT_BATCH_CHUNK", "500"))
 
 
 class SignalsService:
-    def __init__(self, repository: SignalsRepository | None = None) -> None:
+    def __init__(
+        self,
+        repository: SignalsRepository | None = None,
+        *,
+        indicators: IndicatorEngine | None = None,
+        macro_ttl_seconds: float = 300.0,
+        macro_max_stale_seconds: float = 6 * 3600.0,
+        macro_refresh_seconds: float | None = 240.0,
+        store: SnapshotStore | None = None,
+        universe: Sequence[str] = (),
+        materialize_interval_seconds: float = 60.0,
+        active_window_seconds: float = 900.0,
+        max_requested_symbols: int = 5000,
+    ) -> None:
         self.repository = repository or build_repository()
+        self.indicators = indicators or IndicatorEngine()
+        # Symbol-independent inputs: one load serves every symbol's snapshot.
+        self.macro_events = SharedInput(
+            "macro_events",
+            self.repository.fetch_macro_events,
+            channel=MACRO_EVENTS_CHANNEL,
+            ttl_seconds=macro_ttl_seconds,
+            max_stale_seconds=macro_max_stale_seconds,
+            refresh_interval_seconds=macro_refresh_seconds,
+        )
+        self.shared_inputs: List[SharedInput] = [self.macro_events]
+        # With a store, /snapshot/{symbol} reads precomputed snapshots and the
+        # materializer keeps them current for the active universe.
+        self.store = store
+        self.materializer = (
+            SnapshotMaterializer(
+                self.materialize_snapshots,
+                store,
+                universe=universe,
+                interval_seconds=materialize_interval_seconds,
+                active_window_seconds=active_window_seconds,
+                max_requested=max_requested_symbols,
+            )
+            if store is not None
+            else None
+        )
+
+    async def start(self) -> None:
+        await self.repository.start()
+        for shared in self.shared_inputs:
+            await shared.start()
+            if shared.channel:
+                await self.repository.listen(
+                    shared.channel, partial(self._shared_input_changed, shared)
+                )
+        if self.materializer is not None:
+            await self.materializer.start()
+
+    async def aclose(self) -> None:
+        if self.materializer is not None:
+            await self.materializer.aclose()
+        for shared in self.shared_inputs:
+            await shared.aclose()
+        await self.repository.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "db_pool": self.repository.stats(),
+            "shared_inputs": {shared.name: shared.stats() for shared in self.shared_inputs},
+            "indicators": self.indicators.stats(),
+            "snapshot_store": self.store.stats() if self.store is not None else None,
+            "materializer": self.materializer.stats() if self.materializer else None,
+        }
+
+    def ingest_bars(self, symbol: str, bars: List[BarIn]) -> IndicatorSnapshot | None:
+        if self.materializer is not None:
+            self.materializer.notify([symbol])
+        return self.indicators.ingest(
+            symbol,
+            [
+                Bar(
+                    timestamp=int(bar.timestamp.timestamp()),
+                    high=bar.high,
+                    low=bar.low,
+                    close=bar.close,
+                    iv=math.nan if bar.iv is None else bar.iv,
+                )
+                for bar in sorted(bars, key=lambda bar: bar.timestamp)
+            ],
+        )
 
     async def get_snapshot(self, symbol: str) -> SignalSnapshot:
+        """The materialized snapshot when there is one; otherwise computed and written back."""
+        if self.store is None:
+            return await self.compute_snapshot(symbol)
+        self.materializer.touch(symbol)
+        snapshot = await self.store.get(symbol)
+        if snapshot is not None:
+            return snapshot
+        snapshot = await self.compute_snapshot(symbol)
+        await self._write_back([snapshot])
+        return snapshot
+
+    async def compute_snapshot(self, symbol: str) -> SignalSnapshot:
         now = datetime.utcnow()
 
-        congress_events = await self.repository.fetch_congressional_trades(symbol)
-        macro_events = await self.repository.fetch_macro_events()
+        congress_events, macro_events = await asyncio.gather(
+            self.repository.fetch_congressional_trades(symbol),
+            self.macro_events.get(),
+        )
+        return self._build_snapshot(
+            symbol, congress_events, self._macro_context(macro_events, now), now
+        )
+
+    async def get_snapshots(self, symbols: Sequence[str]) -> List[SignalSnapshot]:
+        """Snapshots for many symbols from one trades query and one macro read."""
+        snapshots: List[SignalSnapshot] = []
+        async for chunk in self.stream_snapshots(symbols, chunk_size=max(len(symbols), 1)):
+            snapshots.extend(chunk)
+        return snapshots
+
+    async def stream_snapshots(
+        self, symbols: Sequence[str], chunk_size: int = SNAPSHOT_BATCH_CHUNK
+    ) -> AsyncIterator[List[SignalSnapshot]]:
+        """Yield snapshots ``chunk_size`` symbols at a time, in request order.
 
-        if not macro_events:
-            macro_events = self._mock_macro_events(now)
+        Symbols are upper-cased and de-duplicated. With a store, each chunk is one read of
+        the materialized snapshots and only the misses are computed (and written back);
+        without one, every chunk is computed by :meth:`compute_snapshots`.
+        """
+        if self.store is None:
+            async for chunk in self.compute_snapshots(symbols, chunk_size):
+                yield chunk
+            return
+        unique = _unique(symbols)
+        for start in range(0, len(unique), chunk_size):
+            chunk = unique[start : start + chunk_size]
+            found = await self.store.get_many(chunk)
+            missing = [symbol for symbol in chunk if symbol not in found]
+            if missing:
+                async for computed in self.compute_snapshots(missing, len(missing)):
+                    found.update((snapshot.symbol, snapshot) for snapshot in computed)
+                    await self._write_back(computed)
+            yield [found[symbol] for symbol in chunk]
+
+    async def compute_snapshots(
+        self, symbols: Sequence[str], chunk_size: int = SNAPSHOT_BATCH_CHUNK
+    ) -> AsyncIterator[List[SignalSnapshot]]:
+        """Compute snapshots ``chunk_size`` symbols at a time, one trades query per chunk.
+
+        Symbols are upper-cased and de-duplicated, in request order. Macro events are read
+        once for the whole batch, and the next chunk's query runs while the current chunk
+        is built and sent.
+        """
+        unique = _unique(symbols)
+        chunks = [unique[start : start + chunk_size] for start in range(0, len(unique), chunk_size)]
+        if not chunks:
+            return
+        now = datetime.utcnow()
+        fetch = self.repository.fetch_congressional_trades_batch
+        pending = asyncio.ensure_future(fetch(chunks[0]))
+        try:
+            macro_events = self._macro_context(await self.macro_events.get(), now)
+            for index, chunk in enumerate(chunks):
+                trades = await pending
+                if index + 1 < len(chunks):
+                    pending = asyncio.ensure_future(fetch(chunks[index + 1]))
+                yield [
+                    self._build_snapshot(symbol, trades.get(symbol), macro_events, now)
+                    for symbol in chunk
+                ]
+        finally:
+            pending.cancel()
+
+    async def materialize_snapshots(
+        self, symbols: Sequence[str]
+    ) -> AsyncIterator[List[SignalSnapshot]]:
+        """:meth:`compute_snapshots` once shared inputs have caught up with any change event."""
+        for shared in self.shared_inputs:
+            await shared.settled()
+        async for chunk in self.compute_snapshots(symbols):
+            yield chunk
+
+    async def _write_back(self, snapshots: List[SignalSnapshot]) -> None:
+        try:
+            await self.store.put_many(snapshots, source="computed", only_missing=True)
+        except RedisError:
+            logger.warning(
+                "snapshot write-back for %d symbols failed", len(snapshots), exc_info=True
+            )
+
+    def _shared_input_changed(self, shared: SharedInput, payload: str | None) -> None:
+        shared.invalidate(payload)
+        # A symbol-independent input changed: every materialized snapshot embeds it.
+        if self.materializer is not None:
+            self.materializer.notify()
+
+    def _macro_context(self, macro_events: List[str], now: datetime) -> List[str]:
+        # A copy: the cached list is shared by every snapshot.
+        return list(macro_events) or self._mock_macro_events(now)
+
+    def _build_snapshot(
+        self,
+        symbol: str,
+        congress_events: List[Dict[str, Any]] | None,
+        macro_events: List[str],
+        now: datetime,
+    ) -> SignalSnapshot:
         if not congress_events:
             congress_events = self._mock_congressional_events(now)
 
+        # Indicators come from the rolling per-symbol state once it has warmed up;
+        # symbols without bar history keep the placeholder readings.
+        indicators = self.indicators.snapshot(symbol)
+        if indicators is None or not indicators.warm:
+            indicators = None
         return SignalSnapshot(
             symbol=symbol,
-            rsi=54.2,
-            macd="bullish-crossover",
-            adx=22.3,
-            trend_regime="uptrend",
-            iv=0.29,
-            iv_rank=0.32,
+            rsi=_reading(indicators, "rsi", 54.2),
+            macd=indicators.macd_state if indicators else "bullish-crossover",
+            adx=_reading(indicators, "adx", 22.3),
+            atr=indicators.atr if indicators else None,
+            trend_regime=indicators.trend_regime if indicators else "uptrend",
+            iv=_reading(indicators, "iv", 0.29),
+            iv_rank=_reading(indicators, "iv_rank", 0.32),
             earnings_proximity="11 days",
             sentiment_score=0.24,
             sentiment_momentum="improving",
@@ -40,6 +255,9 @@ class SignalsService:
             macro_events=macro_events,
             macro_risk_flag="FOMC" in " ".join(macro_events),
             generated_at=now,
+            freshness=SnapshotFreshness(
+                source="computed", materialized_at=now, age_seconds=0.0, stale=False
+            ),
         )
 
     def _mock_macro_events(self, now: datetime) -> List[str]:
@@ -60,5 +278,38 @@ class SignalsService:
         ]
 
 
+def _unique(symbols: Sequence[str]) -> List[str]:
+    return list(dict.fromkeys(s.strip().upper() for s in symbols if s.strip()))
+
+
+def _reading(indicators: IndicatorSnapshot | None, name: str, placeholder: float) -> float:
+    value = getattr(indicators, name) if indicators else None
+    return placeholder if value is None else value
+
+
 def build_service() -> SignalsService:
-    return SignalsService()
+    refresh = float(os.getenv("MACRO_EVENTS_REFRESH_SECONDS", "240"))
+    redis_uri = os.getenv("SNAPSHOT_REDIS_URI")
+    store = None
+    if redis_uri:
+        # A blocking pool: a burst of reads waits for a connection instead of failing.
+        pool = BlockingConnectionPool.from_url(
+            redis_uri, max_connections=int(os.getenv("SNAPSHOT_REDIS_MAX_CONNECTIONS", "32"))
+        )
+        store = SnapshotStore(
+            Redis(connection_pool=pool),
+            ttl_seconds=float(os.getenv("SNAPSHOT_TTL_SECONDS", "900")),
+            stale_after_seconds=float(os.getenv("SNAPSHOT_STALE_AFTER_SECONDS", "120")),
+            namespace=os.getenv("REDIS_NAMESPACE", ""),
+        )
+    universe = [s for s in os.getenv("SIGNALS_UNIVERSE", "").upper().split(",") if s.strip()]
+    return SignalsService(
+        macro_ttl_seconds=float(os.getenv("MACRO_EVENTS_TTL_SECONDS", "300")),
+        macro_max_stale_seconds=float(os.getenv("MACRO_EVENTS_MAX_STALE_SECONDS", "21600")),
+        macro_refresh_seconds=refresh or None,
+        store=store,
+        universe=[symbol.strip() for symbol in universe],
+        materialize_interval_seconds=float(os.getenv("SNAPSHOT_REFRESH_SECONDS", "60")),
+        active_window_seconds=float(os.getenv("SNAPSHOT_ACTIVE_WINDOW_SECONDS", "900")),
+        max_requested_symbols=int(os.getenv("SNAPSHOT_MAX_REQUESTED_SYMBOLS", "5000")),
+    )
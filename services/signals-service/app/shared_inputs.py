@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class SharedInputStats:
+    hits: int = 0
+    stale_hits: int = 0
+    loads: int = 0
+    load_errors: int = 0
+    invalidations: int = 0
+
+
+class SharedInput(Generic[T]):
+    """A symbol-independent signal input, loaded once and shared by every snapshot.
+
+    The value is fresh for ``ttl_seconds`` after a load. Once it is stale (by age or
+    because :meth:`invalidate` was called, e.g. from a Postgres ``NOTIFY``) it is still
+    served while a single background load replaces it, up to ``max_stale_seconds``; past
+    that, or before the first load, callers wait for the load. Concurrent callers share
+    one in-flight load. With ``refresh_interval_seconds``, :meth:`start` also reloads on a
+    schedule so that snapshots rarely see a stale value at all. A failed background load
+    keeps serving the previous value.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        loader: Callable[[], Awaitable[T]],
+        *,
+        channel: str | None = None,
+        ttl_seconds: float = 300.0,
+        max_stale_seconds: float = 6 * 3600.0,
+        refresh_interval_seconds: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.channel = channel
+        self.ttl_seconds = ttl_seconds
+        self.max_stale_seconds = max(max_stale_seconds, ttl_seconds)
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self._loader = loader
+        self._clock = clock
+        self._value: T | None = None
+        self._loaded_at: float | None = None
+        # Bumped by invalidate(); a load that started before the bump does not make the
+        # value fresh again, since it may have read the rows from before the change.
+        self._generation = 0
+        self._fresh_generation = -1
+        self._inflight: asyncio.Task | None = None
+        self._scheduler: asyncio.Task | None = None
+        self._stats = SharedInputStats()
+
+    async def get(self) -> T:
+        if self._loaded_at is None:
+            return await self._load()
+        age = self._clock() - self._loaded_at
+        if age > self.max_stale_seconds:
+            return await self._load()
+        if age > self.ttl_seconds or self._fresh_generation != self._generation:
+            self._stats.stale_hits += 1
+            self._refresh_in_background()
+        else:
+            self._stats.hits += 1
+        return self._value
+
+    async def settled(self) -> T:
+        """Like :meth:`get`, but waits for a reload rather than serving an invalidated value.
+
+        For callers that must not see the value an invalidation just superseded. Joins a
+        load in flight (and, if that load began before the invalidation, one more); if
+        reloading fails the last value is served as :meth:`get` would.
+        """
+        for _ in range(2):
+            if self._inflight is None and self._fresh_generation == self._generation:
+                break
+            try:
+                await self._load()
+            except Exception:
+                if self._loaded_at is None:
+                    raise
+                logger.warning("reload of %s failed; serving the last value", self.name)
+                break
+        return await self.get()
+
+    def invalidate(self, payload: str | None = None) -> None:
+        """Mark the value stale and start reloading it; safe to call from a listener."""
+        self._generation += 1
+        self._stats.invalidations += 1
+        if self._loaded_at is not None:
+            self._refresh_in_background()
+
+    async def start(self) -> None:
+        if self.refresh_interval_seconds and self._scheduler is None:
+            self._scheduler = asyncio.create_task(self._refresh_on_schedule())
+
+    async def aclose(self) -> None:
+        tasks = [task for task in (self._scheduler, self._inflight) if task is not None]
+        self._scheduler = self._inflight = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        age = None if self._loaded_at is None else round(self._clock() - self._loaded_at, 3)
+        return {
+            **asdict(self._stats),
+            "age_seconds": age,
+            "stale": self._fresh_generation != self._generation,
+            "channel": self.channel,
+        }
+
+    async def _load(self) -> T:
+        if self._inflight is None:
+            self._inflight = asyncio.create_task(self._run_load())
+        # shield: one caller being cancelled must not cancel the load the others wait on.
+        return await asyncio.shield(self._inflight)
+
+    async def _run_load(self) -> T:
+        generation = self._generation
+        self._stats.loads += 1
+        try:
+            value = await self._loader()
+        except Exception:
+            self._stats.load_errors += 1
+            raise
+        finally:
+            self._inflight = None
+        self._value = value
+        self._loaded_at = self._clock()
+        self._fresh_generation = generation
+        return value
+
+    def _refresh_in_background(self) -> None:
+        if self._inflight is None:
+            self._inflight = asyncio.create_task(self._run_load())
+            self._inflight.add_done_callback(self._log_failure)
+
+    def _log_failure(self, task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(
+                "background reload of %s failed", self.name, exc_info=task.exception()
+            )
+
+    async def _refresh_on_schedule(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval_seconds)
+            try:
+                await self._load()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("scheduled reload of %s failed", self.name)
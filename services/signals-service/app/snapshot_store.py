@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Sequence
+
+from pydantic import ValidationError
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from .schemas import SignalSnapshot, SnapshotFreshness
+
+logger = logging.getLogger(__name__)
+
+# Part of every key: bump it when SignalSnapshot changes shape, so a deploy reads only what
+# its own version wrote (a miss, then a recompute) instead of parsing the old layout.
+SNAPSHOT_SCHEMA_VERSION = 1
+
+
+@dataclass
+class SnapshotStoreStats:
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    errors: int = 0
+
+
+class SnapshotStore:
+    """Materialized snapshots in Redis, one compact JSON document per symbol.
+
+    Each document carries its :class:`SnapshotFreshness`: the materializer run
+    (``version``, from a Redis counter shared by every replica) and when it was written.
+    Reads fill in the age and flag snapshots older than ``stale_after_seconds``; keys
+    expire after ``ttl_seconds`` so nothing older than that is ever served. Redis errors
+    are logged and reported as misses, so callers fall back to computing.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        *,
+        ttl_seconds: float = 900.0,
+        stale_after_seconds: float = 120.0,
+        namespace: str = "",
+        clock: Callable[[], datetime] = datetime.utcnow,
+    ) -> None:
+        self.redis = redis
+        self.ttl_seconds = ttl_seconds
+        self.stale_after_seconds = stale_after_seconds
+        prefix = f"{namespace}:" if namespace else ""
+        self._prefix = f"{prefix}signals:snapshot:v{SNAPSHOT_SCHEMA_VERSION}:"
+        self._version_key = f"{prefix}signals:snapshot:version"
+        self._clock = clock
+        self._stats = SnapshotStoreStats()
+
+    def key(self, symbol: str) -> str:
+        return self._prefix + symbol
+
+    async def next_version(self) -> int:
+        return int(await self.redis.incr(self._version_key))
+
+    async def get(self, symbol: str) -> SignalSnapshot | None:
+        try:
+            value = await self.redis.get(self.key(symbol))
+        except RedisError:
+            self._stats.errors += 1
+            logger.warning("snapshot read for %s failed", symbol, exc_info=True)
+            return None
+        return self._read(symbol, value)
+
+    async def get_many(self, symbols: Sequence[str]) -> Dict[str, SignalSnapshot]:
+        try:
+            values = await self.redis.mget([self.key(symbol) for symbol in symbols])
+        except RedisError:
+            self._stats.errors += 1
+            logger.warning("snapshot read for %d symbols failed", len(symbols), exc_info=True)
+            return {}
+        found = {}
+        for symbol, value in zip(symbols, values, strict=True):
+            snapshot = self._read(symbol, value)
+            if snapshot is not None:
+                found[symbol] = snapshot
+        return found
+
+    async def put_many(
+        self,
+        snapshots: Iterable[SignalSnapshot],
+        version: int | None = None,
+        *,
+        source: str = "materialized",
+        only_missing: bool = False,
+    ) -> int:
+        """Write snapshots stamped with ``source`` and ``version``; ``only_missing`` never
+        overwrites a key.
+
+        Returns how many were sent. Write-backs of snapshots computed on a miss are written
+        as ``source="computed"`` with ``only_missing``, so they cannot replace a
+        materialized one that landed meanwhile.
+        """
+        now = self._clock()
+        pipe = self.redis.pipeline(transaction=False)
+        count = 0
+        for snapshot in snapshots:
+            freshness = SnapshotFreshness(
+                source=source,
+                version=version,
+                materialized_at=now,
+                age_seconds=0.0,
+                stale=False,
+            )
+            payload = snapshot.model_copy(update={"freshness": freshness})
+            pipe.set(
+                self.key(snapshot.symbol),
+                payload.model_dump_json(exclude_none=True),
+                ex=int(self.ttl_seconds),
+                nx=only_missing,
+            )
+            count += 1
+        if count:
+            await pipe.execute()
+            self._stats.writes += count
+        return count
+
+    def stats(self) -> Dict[str, Any]:
+        return {**asdict(self._stats), "schema_version": SNAPSHOT_SCHEMA_VERSION}
+
+    def _read(self, symbol: str, value: bytes | None) -> SignalSnapshot | None:
+        if value is None:
+            self._stats.misses += 1
+            return None
+        try:
+            snapshot = SignalSnapshot.model_validate_json(value)
+        except ValidationError:
+            self._stats.errors += 1
+            logger.warning("discarding unreadable snapshot for %s", symbol)
+            return None
+        freshness = snapshot.freshness
+        if freshness is None:
+            self._stats.misses += 1
+            return None
+        age = max((self._clock() - freshness.materialized_at).total_seconds(), 0.0)
+        stale = age > self.stale_after_seconds
+        if stale:
+            self._stats.stale_hits += 1
+        else:
+            self._stats.hits += 1
+        freshness.age_seconds = round(age, 3)
+        freshness.stale = stale
+        return snapshot
@@ -0,0 +1,102 @@
+"""Indicator backfill throughput and per-bar update cost across many symbols.
+
+Usage: ``python benchmarks/indicators.py [--symbols 5000] [--sessions 252] [--ticks 200000]``
+
+Each symbol gets ``--sessions`` sessions of 390 one-minute bars (a random walk, IV
+quoted on ~5% of bars). "backfill" is :meth:`IndicatorEngine.backfill` over the whole
+history, bar generation excluded. "update" then streams ``--ticks`` live bars round-robin
+over all symbols through :meth:`IndicatorEngine.update` (which also builds the snapshot),
+and "recompute" is what the same tick would cost if the snapshot recomputed the history.
+"""
+from __future__ import annotations
+
+import argparse
+import pathlib
+import sys
+import time
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+
+from app.indicators import Bar, BarSeries, IndicatorEngine, compute  # noqa: E402
+
+BARS_PER_SESSION = 390
+SESSION_OPEN = 14 * 3600 + 30 * 60  # 09:30 New York in UTC seconds past midnight (EST)
+
+
+def minute_bars(rng, sessions: int) -> BarSeries:
+    size = sessions * BARS_PER_SESSION
+    days = np.repeat(19_000 + np.arange(sessions) * 7 // 5, BARS_PER_SESSION)
+    minutes = np.tile(np.arange(BARS_PER_SESSION) * 60, sessions)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.0008, size)))
+    spread = rng.uniform(0, 0.001, size)
+    return BarSeries(
+        timestamp=days * 86_400 + SESSION_OPEN + minutes,
+        high=close * (1 + spread),
+        low=close * (1 - spread),
+        close=close,
+        iv=np.where(rng.random(size) < 0.05, 0.3 + 0.05 * rng.standard_normal(size), np.nan),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=5000)
+    parser.add_argument("--sessions", type=int, default=252)
+    parser.add_argument("--ticks", type=int, default=200_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    engine = IndicatorEngine()
+    backfill = 0.0
+    closes, clock = {}, {}
+    for i in range(args.symbols):
+        series = minute_bars(rng, args.sessions)
+        start = time.perf_counter()
+        engine.backfill(f"S{i:05d}", series)
+        backfill += time.perf_counter() - start
+        # Only the tail is kept: a year of bars for every symbol would not fit in memory.
+        closes[f"S{i:05d}"] = float(series.close[-1])
+        clock[f"S{i:05d}"] = int(series.timestamp[-1])
+    bars = args.symbols * args.sessions * BARS_PER_SESSION
+    print(
+        f"backfill: {args.symbols} symbols x {args.sessions * BARS_PER_SESSION} bars in "
+        f"{backfill:.1f}s ({backfill / args.symbols * 1e3:.2f}ms/symbol, "
+        f"{bars / backfill / 1e6:.1f}M bars/s)"
+    )
+
+    symbols = list(closes)
+    step = rng.normal(0, 0.0008, args.ticks)
+    ticks = []
+    for k in range(args.ticks):
+        symbol = symbols[k % len(symbols)]
+        closes[symbol] *= float(np.exp(step[k]))
+        clock[symbol] += 60
+        close = closes[symbol]
+        ticks.append((symbol, Bar(clock[symbol], close * 1.0005, close * 0.9995, close,
+                                  0.3 if k % 20 == 0 else float("nan"))))
+    start = time.perf_counter()
+    for symbol, bar in ticks:
+        engine.update(symbol, bar)
+    elapsed = time.perf_counter() - start
+    print(
+        f"update:   {args.ticks} bars in {elapsed:.2f}s "
+        f"({elapsed / args.ticks * 1e6:.1f}us/bar, {args.ticks / elapsed / 1e3:.0f}k bars/s)"
+    )
+
+    start = time.perf_counter()
+    for _ in range(5):
+        compute(series)
+    recompute = (time.perf_counter() - start) / 5
+    print(
+        f"recompute: {recompute * 1e3:.2f}ms per tick for one symbol's history "
+        f"({recompute / (elapsed / args.ticks):.0f}x the incremental update)"
+    )
+    print(f"engine: {engine.stats()}")
+
+
+if __name__ == "__main__":
+    main()
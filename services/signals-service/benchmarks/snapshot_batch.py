@@ -0,0 +1,118 @@
+"""Multi-symbol snapshots: one call per symbol vs ``get_snapshots`` vs the streamed batch.
+
+Usage: ``python benchmarks/snapshot_batch.py --dsn postgresql://... [--symbols 100 1000 5000]``
+
+Seeds ``--universe`` symbols with 20 congressional trades each (on top of
+``snapshot_load.py``'s tables). "per-symbol" is what the gateway does today: one
+``get_snapshot`` per symbol, ``--concurrency`` at a time, each with its own trades query.
+"batch" is a single ``get_snapshots`` call (one trades query, one macro read); "stream"
+is ``stream_snapshots`` in chunks of ``SNAPSHOT_BATCH_CHUNK``, serialized to NDJSON as
+the endpoint does, with the time to the first chunk.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import pathlib
+import sys
+import time
+from datetime import date, timedelta
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import asyncpg  # noqa: E402
+from snapshot_load import seed  # noqa: E402
+
+from app.repository import SignalsRepository  # noqa: E402
+from app.service import SignalsService  # noqa: E402
+
+
+def universe(size: int):
+    return [f"B{i:05d}" for i in range(size)]
+
+
+async def seed_universe(dsn: str, size: int) -> None:
+    await seed(dsn)
+    connection = await asyncpg.connect(dsn)
+    try:
+        seeded = await connection.fetchval(
+            "select count(distinct symbol) from congressional_trades where symbol like 'B%'"
+        )
+        if seeded >= size:
+            return
+        await connection.execute("delete from congressional_trades where symbol like 'B%'")
+        await connection.copy_records_to_table(
+            "congressional_trades",
+            records=[
+                (symbol, f"Member {j}", "I", "Finance", "buy", "$1k",
+                 date(2025, 1, 1) - timedelta(days=3 * j))
+                for symbol in universe(size)
+                for j in range(20)
+            ],
+        )
+        await connection.execute("analyze congressional_trades")
+    finally:
+        await connection.close()
+
+
+async def per_symbol(service: SignalsService, symbols, concurrency: int) -> None:
+    queue = iter(symbols)
+
+    async def worker() -> None:
+        for symbol in queue:
+            (await service.get_snapshot(symbol)).model_dump_json()
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+async def streamed(service: SignalsService, symbols) -> float:
+    start = time.perf_counter()
+    first = None
+    async for chunk in service.stream_snapshots(symbols):
+        "".join(snapshot.model_dump_json() + "\n" for snapshot in chunk)
+        first = first or time.perf_counter() - start
+    return first
+
+
+async def timed(coroutine) -> tuple:
+    start = time.perf_counter()
+    result = await coroutine
+    return time.perf_counter() - start, result
+
+
+async def run(args) -> None:
+    await seed_universe(args.dsn, max(args.symbols))
+    service = SignalsService(repository=SignalsRepository(args.dsn, max_size=args.pool_size))
+    await service.start()
+    await service.get_snapshots(universe(50))  # warm connections and statements
+    for size in args.symbols:
+        symbols = universe(size)
+        loop, _ = await timed(per_symbol(service, symbols, args.concurrency))
+        batch, snapshots = await timed(service.get_snapshots(symbols))
+        stream, first = await timed(streamed(service, symbols))
+        assert len(snapshots) == size
+        print(
+            f"{size:>5} symbols: per-symbol {loop * 1e3:8.1f}ms  batch {batch * 1e3:7.1f}ms "
+            f"({loop / batch:4.1f}x)  stream {stream * 1e3:7.1f}ms, "
+            f"first chunk after {first * 1e3:6.1f}ms"
+        )
+    await service.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dsn", default=os.getenv("SIGNALS_DB_DSN"))
+    parser.add_argument("--symbols", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--pool-size", type=int, default=10)
+    args = parser.parse_args()
+    if not args.dsn:
+        parser.error("--dsn or SIGNALS_DB_DSN is required")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
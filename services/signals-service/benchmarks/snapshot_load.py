@@ -0,0 +1,160 @@
+"""Snapshot latency and throughput: a pool per query and serial queries vs one pool, gathered.
+
+Usage: ``python benchmarks/snapshot_load.py --dsn postgresql://... [--concurrency 1 16 64]``
+
+Creates and seeds ``congressional_trades`` and ``macro_calendar`` when they are missing.
+"legacy" reproduces the previous repository: every query opens its own
+``asyncpg.create_pool`` (so a new connection, a fresh statement cache and a parse per
+call) and the snapshot awaits the two queries one after the other. "pooled" is the
+current :class:`SignalsRepository` and :class:`SignalsService`. ``--dsn`` defaults to
+``SIGNALS_DB_DSN``.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import pathlib
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, List
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import asyncpg  # noqa: E402
+import numpy as np  # noqa: E402
+
+from app.repository import SignalsRepository  # noqa: E402
+from app.service import SignalsService  # noqa: E402
+
+SYMBOLS = [f"S{i:03d}" for i in range(200)]
+
+SCHEMA = """
+    create table if not exists congressional_trades (
+        symbol text, person text, party text, committee text, action text, amount text,
+        trade_date date
+    );
+    create index if not exists congressional_trades_symbol_date
+        on congressional_trades (symbol, trade_date desc);
+    create table if not exists macro_calendar (event_name text, event_time timestamptz);
+    create index if not exists macro_calendar_time on macro_calendar (event_time);
+"""
+
+
+class LegacyRepository(SignalsRepository):
+    # The old code passed only max_size=2, which asyncpg rejects against its default
+    # min_size of 10; min_size=1 is the cheapest version of what it meant to do.
+    async def _fetch(self, query: str, *args: Any) -> List[asyncpg.Record]:
+        async with asyncpg.create_pool(self.dsn, min_size=1, max_size=2) as pool:
+            async with pool.acquire() as connection:
+                return await connection.fetch(query, *args)
+
+
+class FetchedRepository:
+    """Hands back rows that were already fetched, so only snapshot assembly remains."""
+
+    def __init__(self, trades, events) -> None:
+        self.trades, self.events = trades, events
+
+    async def fetch_congressional_trades(self, symbol: str):
+        return self.trades
+
+    async def fetch_macro_events(self):
+        return self.events
+
+
+class LegacyService(SignalsService):
+    async def get_snapshot(self, symbol: str):
+        trades = await self.repository.fetch_congressional_trades(symbol)
+        events = await self.repository.fetch_macro_events()
+        return await SignalsService(FetchedRepository(trades, events)).get_snapshot(symbol)
+
+
+async def seed(dsn: str) -> None:
+    connection = await asyncpg.connect(dsn)
+    try:
+        await connection.execute(SCHEMA)
+        if await connection.fetchval("select count(*) from congressional_trades"):
+            return
+        rng = np.random.default_rng(0)
+        today = datetime.now(timezone.utc).date()
+        await connection.copy_records_to_table(
+            "congressional_trades",
+            records=[
+                (symbol, f"Member {j}", "D" if j % 2 else "R", "Finance",
+                 "buy" if rng.random() < 0.5 else "sell", "$15k",
+                 today - timedelta(days=int(rng.integers(0, 720))))
+                for symbol in SYMBOLS
+                for j in range(50)
+            ],
+        )
+        now = datetime.now(timezone.utc)
+        await connection.copy_records_to_table(
+            "macro_calendar",
+            records=[
+                (("CPI", "FOMC", "NFP", "GDP")[k % 4], now + timedelta(days=k - 100))
+                for k in range(400)
+            ],
+        )
+        await connection.execute("analyze congressional_trades; analyze macro_calendar")
+    finally:
+        await connection.close()
+
+
+async def drive(service: SignalsService, requests: int, concurrency: int):
+    latencies: List[float] = []
+    queue = iter(range(requests))
+
+    async def worker() -> None:
+        for i in queue:
+            start = time.perf_counter()
+            await service.get_snapshot(SYMBOLS[i % len(SYMBOLS)])
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return np.array(latencies), time.perf_counter() - start
+
+
+async def run(args) -> None:
+    await seed(args.dsn)
+    for concurrency in args.concurrency:
+        legacy = LegacyService(repository=LegacyRepository(args.dsn))
+        legacy_requests = max(concurrency, args.requests // 10)
+        pooled = SignalsService(
+            repository=SignalsRepository(args.dsn, min_size=1, max_size=args.pool_size)
+        )
+        await pooled.repository.start()
+        await drive(pooled, concurrency * 4, concurrency)  # warm connections and statements
+        for name, service, requests in (
+            ("legacy", legacy, legacy_requests),
+            ("pooled", pooled, args.requests),
+        ):
+            latencies, elapsed = await drive(service, requests, concurrency)
+            print(
+                f"{name:>6} concurrency {concurrency:>3}: "
+                f"p50 {np.percentile(latencies, 50) * 1e3:7.2f}ms  "
+                f"p99 {np.percentile(latencies, 99) * 1e3:7.2f}ms  "
+                f"{requests / elapsed:8.0f} req/s  ({requests} requests)"
+            )
+        print(f"        pool after run: {pooled.repository.stats()}")
+        await pooled.repository.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dsn", default=os.getenv("SIGNALS_DB_DSN"))
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--pool-size", type=int, default=10)
+    args = parser.parse_args()
+    if not args.dsn:
+        parser.error("--dsn or SIGNALS_DB_DSN is required")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
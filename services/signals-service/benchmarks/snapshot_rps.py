@@ -0,0 +1,139 @@
+"""``GET /snapshot/{symbol}`` latency under a fixed request rate, computed vs materialized.
+
+Usage: ``python benchmarks/snapshot_rps.py --dsn postgresql://... --redis redis://... [--rps 2000]``
+
+Requests are ASGI calls straight into the FastAPI app (an httpx client on the same core
+would cost more than the server), open-loop:
+request ``i`` is due at ``i / rps`` and its latency is measured from that due time, so a
+server that falls behind shows up as queueing instead of a slower request rate.
+"computed" is the service without a snapshot store (two queries per request);
+"materialized" reads through Redis after the materializer has written the universe.
+Seeds the same tables as ``snapshot_load.py``; the store uses a throwaway namespace.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import pathlib
+import sys
+import time
+import uuid
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+from redis.asyncio import BlockingConnectionPool, Redis  # noqa: E402
+from snapshot_load import SYMBOLS, seed  # noqa: E402
+
+from app import main  # noqa: E402
+from app.repository import SignalsRepository  # noqa: E402
+from app.service import SignalsService  # noqa: E402
+from app.snapshot_store import SnapshotStore  # noqa: E402
+
+
+async def get(path: str):
+    """One ``GET`` through the ASGI app: ``(status, body)``."""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "", "headers": [(b"host", b"signals")], "server": ("signals", 80),
+        "client": ("bench", 1),
+    }
+    status, body = 0, []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    await main.app(scope, receive, send)
+    return status, b"".join(body)
+
+
+async def drive(rps: int, seconds: float):
+    latencies, ages, failures = [], [], 0
+
+    async def request(symbol: str, due: float) -> None:
+        nonlocal failures
+        status, body = await get(f"/snapshot/{symbol}")
+        latencies.append(time.perf_counter() - due)
+        if status != 200:
+            failures += 1
+            return
+        ages.append(json.loads(body)["freshness"]["age_seconds"])
+
+    total = int(rps * seconds)
+    symbols = np.random.default_rng(0).choice(SYMBOLS, total)
+    tasks = []
+    start = time.perf_counter()
+    for i in range(total):
+        due = start + i / rps
+        delay = due - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(request(str(symbols[i]), due)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+    return np.array(latencies), np.array(ages), failures, total / elapsed
+
+
+async def run(args) -> None:
+    await seed(args.dsn)
+    namespace = f"bench-{uuid.uuid4().hex[:8]}"
+    redis = Redis(connection_pool=BlockingConnectionPool.from_url(args.redis, max_connections=32))
+    services = {
+        "computed": SignalsService(repository=SignalsRepository(args.dsn)),
+        "materialized": SignalsService(
+            repository=SignalsRepository(args.dsn),
+            store=SnapshotStore(redis, namespace=namespace),
+            universe=SYMBOLS,
+        ),
+    }
+    for name, service in services.items():
+        main.service = service
+        await service.start()
+        if service.materializer is not None:
+            while not service.materializer.stats()["runs"]:
+                await asyncio.sleep(0.05)
+        await drive(min(args.rps, 500), 1.0)  # warm-up
+        for rps in args.rps_levels or [args.rps]:
+            latencies, ages, failures, achieved = await drive(rps, args.seconds)
+            p50, p99, p999 = np.percentile(latencies, [50, 99, 99.9]) * 1e3
+            print(
+                f"{name:>12} @ {rps:>4} rps: achieved {achieved:6.0f}/s  p50 {p50:7.2f}ms  "
+                f"p99 {p99:8.2f}ms  p99.9 {p999:8.2f}ms  failures {failures}  "
+                f"snapshot age p50 {np.median(ages):.2f}s max {ages.max():.2f}s"
+            )
+        if service.store is not None:
+            print(f"{'':>12}   store {service.store.stats()}")
+        await service.aclose()
+    keys = [key async for key in redis.scan_iter(match=f"{namespace}:*")]
+    if keys:
+        await redis.delete(*keys)
+    await redis.aclose()
+
+
+def main_() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dsn", default=os.getenv("SIGNALS_DB_DSN"))
+    parser.add_argument("--redis", default=os.getenv("SNAPSHOT_REDIS_URI"))
+    parser.add_argument("--rps", type=int, default=2000)
+    parser.add_argument("--rps-levels", type=int, nargs="*", default=[500, 1000, 2000])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+    if not args.dsn or not args.redis:
+        parser.error("--dsn (or SIGNALS_DB_DSN) and --redis (or SNAPSHOT_REDIS_URI) are required")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main_()
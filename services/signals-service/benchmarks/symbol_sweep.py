@@ -0,0 +1,113 @@
+"""Macro queries and wall time of an N-symbol snapshot sweep, with and without the shared cache.
+
+Usage: ``python benchmarks/symbol_sweep.py --dsn postgresql://... [--symbols 1000]``
+
+"per-snapshot" queries ``macro_calendar`` inside every snapshot, as the service did before
+the shared cache; "shared" is the current :class:`SignalsService`, measured on a cold
+cache and then a warm one. Also reports how long after a write to ``macro_calendar`` the
+NOTIFY-driven reload has the new rows. Seeds the same tables as ``snapshot_load.py``.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import pathlib
+import sys
+import time
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from snapshot_load import FetchedRepository, seed  # noqa: E402
+
+from app.repository import MACRO_CALENDAR_NOTIFY_TRIGGER, SignalsRepository  # noqa: E402
+from app.service import SignalsService  # noqa: E402
+
+
+class CountingRepository(SignalsRepository):
+    macro_queries = 0
+
+    async def fetch_macro_events(self):
+        self.macro_queries += 1
+        return await super().fetch_macro_events()
+
+
+class PerSnapshotService(SignalsService):
+    async def get_snapshot(self, symbol: str):
+        trades, events = await asyncio.gather(
+            self.repository.fetch_congressional_trades(symbol),
+            self.repository.fetch_macro_events(),
+        )
+        return await SignalsService(FetchedRepository(trades, events)).get_snapshot(symbol)
+
+
+async def sweep(service: SignalsService, symbols: int, concurrency: int) -> float:
+    names = iter([f"S{i % 200:03d}" for i in range(symbols)])
+
+    async def worker() -> None:
+        for name in names:
+            await service.get_snapshot(name)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - start
+
+
+async def notify_latency(service: SignalsService) -> float:
+    loads = service.macro_events.stats()["loads"]
+    async with service.repository._pool.acquire() as connection:
+        start = time.perf_counter()
+        await connection.execute(
+            "insert into macro_calendar values ('BENCH', now() + interval '1 minute')"
+        )
+    while service.macro_events.stats()["loads"] == loads or service.macro_events._inflight:
+        await asyncio.sleep(0.0005)
+    elapsed = time.perf_counter() - start
+    assert any(event.startswith("BENCH") for event in await service.macro_events.get())
+    async with service.repository._pool.acquire() as connection:
+        await connection.execute("delete from macro_calendar where event_name = 'BENCH'")
+    return elapsed
+
+
+async def run(args) -> None:
+    await seed(args.dsn)
+    setup = SignalsRepository(args.dsn)
+    await setup.start()
+    async with setup._pool.acquire() as connection:
+        await connection.execute(MACRO_CALENDAR_NOTIFY_TRIGGER)
+    await setup.aclose()
+
+    for name, cls in (("per-snapshot", PerSnapshotService), ("shared", SignalsService)):
+        repository = CountingRepository(args.dsn, max_size=args.pool_size)
+        service = cls(repository=repository)
+        await service.start()
+        for label in ("cold", "warm"):
+            repository.macro_queries = 0
+            elapsed = await sweep(service, args.symbols, args.concurrency)
+            print(
+                f"{name:>12} {label}: {args.symbols} snapshots in {elapsed * 1e3:7.1f}ms "
+                f"({args.symbols / elapsed:6.0f}/s), {repository.macro_queries} macro queries"
+            )
+        if cls is SignalsService:
+            timings = sorted([await notify_latency(service) for _ in range(20)])
+            print(f"{'':>12} NOTIFY -> reloaded: median {timings[10] * 1e3:.2f}ms, "
+                  f"max {timings[-1] * 1e3:.2f}ms")
+        await service.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dsn", default=os.getenv("SIGNALS_DB_DSN"))
+    parser.add_argument("--symbols", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--pool-size", type=int, default=10)
+    args = parser.parse_args()
+    if not args.dsn:
+        parser.error("--dsn or SIGNALS_DB_DSN is required")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
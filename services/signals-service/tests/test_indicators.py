@@ -0,0 +1,102 @@
+import pathlib
+import sys
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.indicators import WARMUP_BARS, Bar, BarSeries, IndicatorEngine, compute
+from app.repository import SignalsRepository
+from app.schemas import BarIn
+from app.service import SignalsService
+
+READINGS = ("rsi", "macd", "macd_signal", "macd_histogram", "adx", "plus_di", "minus_di",
+            "atr", "iv", "iv_rank")
+
+
+def random_bars(size: int, seed: int = 0) -> BarSeries:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, size)))
+    return BarSeries(
+        # 30-minute bars, so the IV window rolls over many sessions.
+        timestamp=1_700_000_000 + 1_800 * np.arange(size),
+        high=close * (1 + rng.uniform(0, 0.003, size)),
+        low=close * (1 - rng.uniform(0, 0.003, size)),
+        close=close,
+        iv=np.where(rng.random(size) < 0.3, 0.3 + 0.05 * rng.standard_normal(size), np.nan),
+    )
+
+
+def bar(series: BarSeries, i: int) -> Bar:
+    return Bar(int(series.timestamp[i]), series.high[i], series.low[i], series.close[i],
+               series.iv[i])
+
+
+def test_incremental_updates_continue_a_backfill_exactly():
+    series = random_bars(4_000)
+    expected = compute(series)
+    engine = IndicatorEngine()
+    head = BarSeries(*(getattr(series, name)[:2_500] for name in
+                       ("timestamp", "high", "low", "close", "iv")))
+    engine.backfill("SPY", head)
+
+    for i in range(2_500, len(series)):
+        snapshot = engine.update("SPY", bar(series, i))
+        if i % 500 == 0 or i == len(series) - 1:
+            for name in READINGS:
+                assert getattr(snapshot, name) == pytest.approx(expected[name][i], rel=1e-12)
+
+    # Built purely bar by bar from nothing, too.
+    for i in range(len(series)):
+        from_scratch = engine.update("QQQ", bar(series, i))
+    assert from_scratch.rsi == pytest.approx(expected["rsi"][-1], rel=1e-12)
+    assert from_scratch.iv_rank == pytest.approx(expected["iv_rank"][-1], rel=1e-12)
+    with pytest.raises(ValueError):
+        engine.update("SPY", bar(series, 0))
+
+
+def test_reference_readings_for_simple_series():
+    size = 60
+    rising = np.linspace(100.0, 159.0, size)
+    values = compute(BarSeries(
+        timestamp=1_700_000_000 + 86_400 * np.arange(size),
+        high=rising + 1, low=rising - 1, close=rising,
+        iv=np.r_[np.linspace(0.2, 0.4, size - 1), 0.3],
+    ))
+
+    assert values["rsi"][-1] == 100.0
+    # Up a dollar a bar on a two-dollar range: the true range is always 2, and all the
+    # directional movement is up.
+    assert values["atr"][-1] == pytest.approx(2.0)
+    assert values["minus_di"][-1] == 0.0 and values["adx"][-1] > 90
+    # 0.3 sits halfway between the lowest (0.2) and highest (~0.4) closing IV.
+    assert values["iv_rank"][-1] == pytest.approx(0.5, abs=1e-9)
+    assert np.isnan(values["iv_rank"][0])
+
+
+@pytest.mark.asyncio
+async def test_snapshot_reads_indicator_state_once_warm():
+    service = SignalsService(repository=SignalsRepository(dsn=None))
+    start = datetime(2025, 1, 2, 14, 30, tzinfo=timezone.utc)
+    prices = 100 - 0.5 * np.arange(WARMUP_BARS + 5)
+    bars = [
+        BarIn(timestamp=start + timedelta(minutes=i), high=p + 0.2, low=p - 0.2, close=p, iv=0.4)
+        for i, p in enumerate(prices)
+    ]
+
+    service.ingest_bars("AAPL", bars[:5])
+    cold = await service.get_snapshot("AAPL")
+    service.ingest_bars("AAPL", bars[5:])
+    snapshot = await service.get_snapshot("AAPL")
+
+    assert cold.atr is None and cold.rsi == 54.2
+    assert snapshot.rsi == 0.0
+    assert snapshot.trend_regime == "downtrend"
+    assert snapshot.macd == "bearish"
+    # Each bar opens 0.3 below the last close and trades 0.4 lower: a true range of 0.7.
+    assert snapshot.atr == pytest.approx(0.7, rel=0.05)
+    assert snapshot.iv == 0.4
@@ -0,0 +1,155 @@
+import asyncio
+import pathlib
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.repository import SignalsRepository
+from app.service import SignalsService
+from app.snapshot_store import SnapshotStore
+
+
+class MemoryRedis:
+    """Just the GET/MGET/INCR/SET-pipeline surface the snapshot store uses."""
+
+    def __init__(self) -> None:
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def mget(self, keys):
+        return [self.values.get(key) for key in keys]
+
+    async def incr(self, key):
+        self.values[key] = int(self.values.get(key, 0)) + 1
+        return self.values[key]
+
+    def pipeline(self, transaction=True):
+        redis, commands = self, []
+
+        class Pipeline:
+            def set(self, key, value, ex=None, nx=False):
+                commands.append((key, value.encode(), nx))
+
+            async def execute(self):
+                for key, value, nx in commands:
+                    if not (nx and key in redis.values):
+                        redis.values[key] = value
+
+        return Pipeline()
+
+
+class CountingRepository(SignalsRepository):
+    def __init__(self) -> None:
+        super().__init__(dsn=None)
+        self.trade_queries = 0
+        self.macro = ["CPI on 2025-02-12"]
+
+    async def fetch_congressional_trades(self, symbol: str):
+        self.trade_queries += 1
+        return []
+
+    async def fetch_congressional_trades_batch(self, symbols):
+        self.trade_queries += 1
+        return {}
+
+    async def fetch_macro_events(self):
+        return list(self.macro)
+
+
+def build(clock, **options):
+    repository = CountingRepository()
+    store = SnapshotStore(MemoryRedis(), stale_after_seconds=60, clock=lambda: clock[0])
+    service = SignalsService(
+        repository=repository, store=store, macro_refresh_seconds=None, **options
+    )
+    return service, repository
+
+
+@pytest.mark.asyncio
+async def test_snapshot_reads_through_the_store_with_freshness():
+    clock = [datetime(2025, 1, 2, 15, 0)]
+    service, repository = build(clock)
+
+    computed = await service.get_snapshot("AAPL")
+    clock[0] += timedelta(seconds=30)
+    served = await service.get_snapshot("AAPL")
+    clock[0] += timedelta(seconds=60)
+    stale = await service.get_snapshot("AAPL")
+
+    assert computed.freshness.source == "computed"
+    assert repository.trade_queries == 1
+    # A write-back of an on-request computation says so, and has no materializer version.
+    assert served.freshness.source == "computed" and served.freshness.version is None
+    assert served.freshness.age_seconds == 30.0 and not served.freshness.stale
+    assert stale.freshness.stale and stale.freshness.age_seconds == 90.0
+    assert served.macro_events == computed.macro_events
+
+    written = await service.materializer.run_once()
+    fresh = await service.get_snapshot("AAPL")
+    assert written == 1 and repository.trade_queries == 2
+    assert fresh.freshness.source == "materialized" and fresh.freshness.version == 1
+    assert fresh.freshness.age_seconds == 0.0
+    assert service.stats()["snapshot_store"]["stale_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_change_events_rematerialize_with_the_new_inputs():
+    clock = [datetime(2025, 1, 2, 15, 0)]
+    service, repository = build(clock, universe=["SPY", "QQQ"], materialize_interval_seconds=60)
+    service.materializer.debounce_seconds = 0.01
+    await service.start()
+    await asyncio.sleep(0.05)
+    assert (await service.get_snapshot("SPY")).freshness.version == 1
+
+    # Bars for one symbol: only that symbol is rewritten.
+    service.ingest_bars("QQQ", [])
+    await asyncio.sleep(0.05)
+    assert (await service.get_snapshot("QQQ")).freshness.version == 2
+    assert (await service.get_snapshot("SPY")).freshness.version == 1
+
+    # A macro-calendar NOTIFY: everything is rewritten, after the macro reload.
+    repository.macro = ["FOMC on 2025-01-29"]
+    service._shared_input_changed(service.macro_events, "INSERT")
+    await asyncio.sleep(0.05)
+    snapshot = await service.get_snapshot("SPY")
+    assert snapshot.freshness.version == 3 and snapshot.macro_risk_flag
+    assert service.materializer.stats()["event_runs"] == 3
+    await service.aclose()
+
+
+@pytest.mark.asyncio
+async def test_batches_read_through_and_compute_only_the_misses():
+    clock = [datetime(2025, 1, 2, 15, 0)]
+    service, repository = build(clock, universe=["SPY", "QQQ"])
+    await service.materializer.run_once()
+    queries = repository.trade_queries
+
+    snapshots = await service.get_snapshots(["qqq", "AAPL", "SPY", "MSFT"])
+    again = [chunk async for chunk in service.stream_snapshots(["AAPL", "MSFT"], chunk_size=1)]
+
+    assert [s.symbol for s in snapshots] == ["QQQ", "AAPL", "SPY", "MSFT"]
+    assert [s.freshness.source for s in snapshots] == [
+        "materialized", "computed", "materialized", "computed"
+    ]
+    # One trades query for the two misses; the second batch is all hits.
+    assert repository.trade_queries == queries + 1
+    assert [[s.symbol for s in chunk] for chunk in again] == [["AAPL"], ["MSFT"]]
+
+
+@pytest.mark.asyncio
+async def test_requested_symbols_are_capped_least_recent_first():
+    clock = [datetime(2025, 1, 2, 15, 0)]
+    service, _ = build(clock, universe=["SPY"], max_requested_symbols=3)
+
+    for symbol in ("A", "B", "C", "A", "D", "E"):
+        service.materializer.touch(symbol)
+
+    assert service.materializer.active_universe() == ["SPY", "A", "D", "E"]
+    assert service.materializer.stats()["requested"] == 3
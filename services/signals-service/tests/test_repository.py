@@ -0,0 +1,117 @@
+import asyncio
+import os
+import pathlib
+import sys
+from datetime import date
+
+import asyncpg
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.repository import SignalsRepository
+from app.service import SignalsService
+
+DSN = os.getenv("SIGNALS_TEST_DB_DSN")
+pytestmark = pytest.mark.skipif(not DSN, reason="set SIGNALS_TEST_DB_DSN to a scratch Postgres")
+
+
+@pytest.mark.asyncio
+async def test_queries_share_one_pool_with_statement_timeout():
+    repository = SignalsRepository(DSN, max_size=2, statement_timeout_ms=1500)
+    await repository.start()
+    async with repository._pool.acquire() as connection:
+        await connection.execute(
+            """
+            create temporary table congressional_trades (
+                symbol text, person text, party text, committee text, action text,
+                amount text, trade_date date
+            )
+            """
+        )
+        await connection.execute(
+            "insert into congressional_trades values ($1, 'Doe, Jane', 'I', 'Finance', 'buy', "
+            "'$15k', $2)",
+            "AAPL",
+            date(2025, 1, 2),
+        )
+        timeout = await connection.fetchval("show statement_timeout")
+    pool = repository._pool
+
+    trades = [await repository.fetch_congressional_trades("aapl") for _ in range(3)]
+
+    assert timeout == "1500ms"
+    assert repository._pool is pool and repository.stats()["max_size"] == 2
+    # The temporary table only exists on the connection that created it; with max_size=2
+    # and sequential calls, the pool hands that same idle connection back.
+    assert trades[0] and trades[0][0]["date"] == "2025-01-02"
+    await repository.aclose()
+    assert not repository.stats()["open"]
+
+
+@pytest.mark.asyncio
+async def test_macro_calendar_changes_invalidate_the_shared_cache():
+    connection = await asyncpg.connect(DSN)
+    await connection.execute(
+        "create table if not exists macro_calendar (event_name text, event_time timestamptz)"
+    )
+    await connection.execute("drop trigger if exists macro_calendar_changed on macro_calendar")
+    await connection.execute("delete from macro_calendar where event_name = 'TEST-CPI'")
+    await connection.close()
+    service = SignalsService(
+        repository=SignalsRepository(DSN, install_triggers=True), macro_refresh_seconds=None
+    )
+    # The app's startup path installs the trigger before subscribing.
+    await service.start()
+    before = await service.macro_events.get()
+
+    async with service.repository._pool.acquire() as connection:
+        await connection.execute(
+            "insert into macro_calendar values ('TEST-CPI', now() - interval '1 day'), "
+            "('TEST-CPI', now() + interval '1 minute')"
+        )
+    for _ in range(50):
+        await asyncio.sleep(0.02)
+        if service.macro_events.stats()["loads"] == 2:
+            break
+    after = await service.macro_events.get()
+
+    assert service.macro_events.stats()["invalidations"] >= 1
+    assert any(event.startswith("TEST-CPI") for event in after)
+    assert not any(event.startswith("TEST-CPI") for event in before)
+    async with service.repository._pool.acquire() as connection:
+        await connection.execute("delete from macro_calendar where event_name = 'TEST-CPI'")
+    await service.aclose()
+
+
+@pytest.mark.asyncio
+async def test_batch_trades_query_keeps_ten_most_recent_per_symbol():
+    repository = SignalsRepository(DSN, max_size=1)
+    await repository.start()
+    async with repository._pool.acquire() as connection:
+        await connection.execute(
+            """
+            create temporary table congressional_trades (
+                symbol text, person text, party text, committee text, action text,
+                amount text, trade_date date
+            )
+            """
+        )
+        await connection.executemany(
+            "insert into congressional_trades values ($1, $2, 'I', 'Finance', 'buy', '$1k', $3)",
+            [
+                (symbol, f"Member {day}", date(2025, 1, day))
+                for symbol, days in (("AAPL", 12), ("MSFT", 3))
+                for day in range(1, days + 1)
+            ],
+        )
+
+    batch = await repository.fetch_congressional_trades_batch(["aapl", "msft", "spy"])
+    single = await repository.fetch_congressional_trades("aapl")
+    await repository.aclose()
+
+    assert set(batch) == {"AAPL", "MSFT"}
+    assert batch["AAPL"] == single and len(single) == 10
+    assert batch["AAPL"][0]["date"] == "2025-01-12" and len(batch["MSFT"]) == 3
@@ -1,5 +1,8 @@
+import asyncio
+import json
 import pathlib
 import sys
+import time
 
 import pytest
 
@@ -31,3 +34,85 @@ async def test_snapshot_includes_macro_and_congress_layers():
     assert isinstance(snapshot, SignalSnapshot)
     assert snapshot.macro_events
     assert snapshot.congressional_events
+
+
+class SlowRepository(StubRepository):
+    """Each query takes one simulated round trip."""
+
+    async def fetch_congressional_trades(self, symbol: str):
+        await asyncio.sleep(0.05)
+        return [{"name": "Doe, John", "action": "sell", "amount": "$5k", "date": "2025-01-02"}]
+
+    async def fetch_macro_events(self):
+        await asyncio.sleep(0.05)
+        return ["FOMC on 2025-01-29"]
+
+
+@pytest.mark.asyncio
+async def test_snapshot_runs_both_queries_concurrently():
+    service = SignalsService(repository=SlowRepository())
+
+    start = time.perf_counter()
+    snapshot = await service.get_snapshot("AAPL")
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.09
+    assert snapshot.macro_risk_flag
+    assert snapshot.congressional_events[0]["name"] == "Doe, John"
+
+
+class BatchRepository(StubRepository):
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches = []
+        self.macro_queries = 0
+
+    async def fetch_congressional_trades_batch(self, symbols):
+        self.batches.append(list(symbols))
+        return {
+            symbol: [{"name": f"Member {symbol}", "action": "buy", "amount": "$1k",
+                      "date": "2025-01-02"}]
+            for symbol in symbols if symbol != "NONE"
+        }
+
+    async def fetch_macro_events(self):
+        self.macro_queries += 1
+        return ["FOMC on 2025-01-29"]
+
+
+@pytest.mark.asyncio
+async def test_batch_snapshots_share_one_trades_query_per_chunk_and_one_macro_read():
+    repository = BatchRepository()
+    service = SignalsService(repository=repository)
+
+    snapshots = await service.get_snapshots(["aapl", "MSFT", "AAPL ", "NONE"])
+    chunks = [chunk async for chunk in service.stream_snapshots(
+        [f"S{i}" for i in range(5)], chunk_size=2
+    )]
+
+    assert [snapshot.symbol for snapshot in snapshots] == ["AAPL", "MSFT", "NONE"]
+    assert snapshots[1].congressional_events[0]["name"] == "Member MSFT"
+    # No trades on record: the same placeholder the single-symbol endpoint returns.
+    assert snapshots[2].congressional_events[0]["name"] == "Doe, Jane"
+    assert repository.batches == [["AAPL", "MSFT", "NONE"], ["S0", "S1"], ["S2", "S3"], ["S4"]]
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert repository.macro_queries == 1
+
+
+def test_batch_route_streams_ndjson_above_the_threshold(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app import main
+
+    monkeypatch.setattr(main, "service", SignalsService(repository=BatchRepository()))
+    monkeypatch.setattr(main, "SNAPSHOT_BATCH_STREAM_THRESHOLD", 2)
+    client = TestClient(main.app)
+
+    small = client.post("/snapshots:batch", json={"symbols": ["AAPL", "MSFT"]})
+    large = client.post("/snapshots:batch", json={"symbols": ["AAPL", "MSFT", "SPY"]})
+
+    assert [item["symbol"] for item in small.json()["snapshots"]] == ["AAPL", "MSFT"]
+    assert large.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in large.text.splitlines()]
+    assert [line["symbol"] for line in lines] == ["AAPL", "MSFT", "SPY"]
+    assert client.post("/snapshots:batch", json={"symbols": []}).status_code == 422
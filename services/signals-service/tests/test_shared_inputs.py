@@ -0,0 +1,83 @@
+import asyncio
+import pathlib
+import sys
+
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.repository import SignalsRepository
+from app.service import SignalsService
+from app.shared_inputs import SharedInput
+
+
+class CountingRepository(SignalsRepository):
+    def __init__(self) -> None:
+        super().__init__(dsn=None)
+        self.macro_queries = 0
+
+    async def fetch_congressional_trades(self, symbol: str):
+        return []
+
+    async def fetch_macro_events(self):
+        self.macro_queries += 1
+        await asyncio.sleep(0.01)
+        return [f"FOMC on 2025-01-29 (load {self.macro_queries})"]
+
+
+@pytest.mark.asyncio
+async def test_symbol_sweep_makes_one_macro_query():
+    repository = CountingRepository()
+    service = SignalsService(repository=repository)
+
+    snapshots = await asyncio.gather(
+        *(service.get_snapshot(f"S{i:04d}") for i in range(1_000))
+    )
+
+    assert repository.macro_queries == 1
+    assert all(snapshot.macro_risk_flag for snapshot in snapshots)
+    assert service.stats()["shared_inputs"]["macro_events"]["loads"] == 1
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_stale_value_is_served_while_one_reload_runs():
+    now = [0.0]
+    loads = []
+    release = asyncio.Event()
+
+    async def loader():
+        loads.append(now[0])
+        if len(loads) > 1:
+            await release.wait()
+        return len(loads)
+
+    shared = SharedInput("calendar", loader, ttl_seconds=10, max_stale_seconds=100,
+                         clock=lambda: now[0])
+    assert await shared.get() == 1
+
+    now[0] = 11.0
+    assert [await shared.get() for _ in range(3)] == [1, 1, 1]
+    await settle()
+    assert len(loads) == 2
+
+    # Invalidated while the reload is in flight: that reload may have read the old rows,
+    # so its result is served but still counts as stale and triggers another load.
+    shared.invalidate("UPDATE")
+    release.set()
+    await settle()
+    assert await shared.get() == 2
+    await settle()
+    assert len(loads) == 3 and await shared.get() == 3
+    assert not shared.stats()["stale"]
+
+    # Past max_stale callers wait for the load instead of being served the old value.
+    now[0] = 200.0
+    assert await shared.get() == 4
+    await shared.aclose()